@@ -0,0 +1,50 @@
+"""Measures the event loop latency while a directory is loaded asynchronously.
+
+A ticker task sleeps 1ms in a loop and records how late it wakes up.
+
+Usage: python benchmarks/bench_async.py DIRECTORY
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tyd import load_directory_async
+
+
+async def _ticker(delays, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def _measure(directory, executor):
+    delays = list()
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(delays, stop))
+    start = time.perf_counter()
+    result = await load_directory_async(directory, executor=executor)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    delays.sort()
+    p99 = delays[int(len(delays) * 0.99)] if delays else 0.0
+    print(
+        f"  {len(result.files)} files in {elapsed:.2f}s, "
+        f"tick delay p99 {p99 * 1000:.1f}ms max {delays[-1] * 1000:.1f}ms"
+    )
+
+
+def main():
+    directory = sys.argv[1]
+    print("default executor (threads)")
+    asyncio.run(_measure(directory, None))
+    print("process pool")
+    with ProcessPoolExecutor() as executor:
+        asyncio.run(_measure(directory, executor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compares loading a document from text and from the binary encoding.
+
+Usage: python benchmarks/bench_binary.py [RECORDS]
+"""
+import sys
+import time
+
+from tyd import TydDocument, dump_binary, load_binary, parse
+
+RECORD = """Record{i} *handle H{i} *source Base
+{{
+    name record_{i}
+    description "A generated record, number {i}."
+    value {i}.5
+    enabled true
+    list [ a; b; c ]
+    nested {{ x 1; y 2 }}
+}}
+"""
+
+
+def _best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = "".join(RECORD.format(i=i) for i in range(count))
+    data = dump_binary(TydDocument(parse(text)))
+
+    parse_time = _best_of(lambda: TydDocument(parse(text)))
+    load_time = _best_of(lambda: load_binary(data))
+
+    print(f"{count} records")
+    print(f"  text   {len(text.encode('utf-8')):>10} bytes  {parse_time:.3f}s")
+    print(f"  binary {len(data):>10} bytes  {load_time:.3f}s")
+    print(
+        f"  {parse_time / load_time:.1f}x faster, {len(data) / len(text):.0%} of size"
+    )
+
+
+if __name__ == "__main__":
+    main()
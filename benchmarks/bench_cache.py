@@ -0,0 +1,55 @@
+"""Measures from_file with a cold and a warm parse cache.
+
+Usage: python benchmarks/bench_cache.py [RECORDS]
+"""
+import sys
+import tempfile
+import time
+from os.path import join
+
+from tyd import TydCache, from_file
+
+RECORD = """Record{i} *handle H{i}
+{{
+    name record_{i}
+    description "A generated record, number {i}."
+    value {i}.5
+    list [ a; b; c ]
+    nested {{ x 1; y 2 }}
+}}
+"""
+
+
+def _best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = join(directory, "records.tyd")
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write("".join(RECORD.format(i=i) for i in range(count)))
+
+        cache = TydCache(join(directory, "cache"))
+        parse_time = _best_of(lambda: from_file(path))
+        start = time.perf_counter()
+        from_file(path, cache=cache)
+        cold_time = time.perf_counter() - start
+        warm_time = _best_of(lambda: from_file(path, cache=cache))
+
+    print(f"{count} records")
+    print(f"  no cache   {parse_time:.3f}s")
+    print(f"  cold cache {cold_time:.3f}s")
+    print(f"  warm cache {warm_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measures dump_objects against building a node tree of the objects and
+writing it with write_to.
+
+Usage: python benchmarks/bench_dump_objects.py [OBJECTS]
+"""
+import io
+import sys
+import time
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from typing import List
+
+from tyd import TydDocument, TydList, TydString, TydTable, dump_objects, write_to
+
+
+class Kind(Enum):
+    WEAPON = 1
+    APPAREL = 2
+
+
+@dataclass
+class Stats:
+    hp: int
+    mass: float
+
+
+@dataclass
+class Thing:
+    name: str
+    kind: Kind
+    stats: Stats
+    tradeable: bool
+    tags: List[str]
+
+
+def _to_node(value, name, parent):
+    if is_dataclass(value):
+        node = TydTable(name, parent)
+        for f in fields(value):
+            node.add(_to_node(getattr(value, f.name), f.name, node))
+        return node
+    if isinstance(value, list):
+        node = TydList(name, parent)
+        for item in value:
+            node.add(_to_node(item, None, node))
+        return node
+    if isinstance(value, Enum):
+        return TydString(name, value.name, parent)
+    if isinstance(value, bool):
+        return TydString(name, "true" if value else "false", parent)
+    return TydString(name, str(value), parent)
+
+
+def _naive(objects):
+    doc = TydDocument()
+    for obj in objects:
+        doc.add(_to_node(obj, "Thing", doc))
+    fileobj = io.StringIO()
+    for node in doc:
+        write_to(node, fileobj)
+        fileobj.write("\n")
+    return fileobj
+
+
+def _fast(objects):
+    fileobj = io.StringIO()
+    dump_objects(objects, fileobj)
+    return fileobj
+
+
+def _best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    objects = [
+        Thing(f"thing{i}", Kind.WEAPON, Stats(i, 2.5), True, ["a", "b"])
+        for i in range(count)
+    ]
+
+    naive = _best_of(lambda: _naive(objects))
+    fast = _best_of(lambda: _fast(objects))
+
+    print(f"{count} objects")
+    print(f"  nodes + write_to {naive:.3f}s  {count / naive:>10.0f} objects/s")
+    print(f"  dump_objects     {fast:.3f}s  {count / fast:>10.0f} objects/s")
+    print(f"  speedup {naive / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measures inheritance resolution over many handles, spread across documents.
+
+Every record inherits from the record before it in a chain of CHAIN records,
+so the sources are resolved before their heirs whatever the order of the files.
+
+Usage: python benchmarks/bench_inheritance.py [RECORDS] [FILES] [CHAIN]
+"""
+import sys
+import time
+
+from tyd import TydDocument, parse
+from tyd.inheritance import Inheritance
+
+RECORD = "R{i} *handle H{i}{source} {{ own{i} {i}; shared {{ v{i} {i} }} }}\n"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    file_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    chain = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    texts = [list() for _ in range(file_count)]
+    for i in range(count):
+        source = f" *source H{i - 1}" if i % chain else ""
+        # Reverse order so that heirs are registered before their sources.
+        texts[file_count - 1 - i % file_count].append(RECORD.format(i=i, source=source))
+    docs = [TydDocument(parse("".join(text))) for text in texts]
+
+    start = time.perf_counter()
+    inheritance = Inheritance()
+    for doc in docs:
+        inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    elapsed = time.perf_counter() - start
+
+    print(f"{count} handles in {file_count} files resolved in {elapsed:.3f}s")
+
+    changed = list(parse(RECORD.format(i=0, source="").replace("own0", "changed")))
+    start = time.perf_counter()
+    inheritance.reregister(changed[0])
+    elapsed = time.perf_counter() - start
+    print(f"H0 and its {chain - 1} heirs re-resolved in {elapsed * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
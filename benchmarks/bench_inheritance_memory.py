@@ -0,0 +1,44 @@
+"""Measures the memory held by heirs sharing a large inherited subtree.
+
+Usage: python benchmarks/bench_inheritance_memory.py [HEIRS] [FIELDS]
+"""
+import gc
+import sys
+import tracemalloc
+
+from tyd import TydDocument, parse
+from tyd.inheritance import Inheritance
+
+
+def main():
+    heir_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    field_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    fields = "; ".join(f"f{i} {i}" for i in range(field_count))
+    base = f"Base *handle Base *abstract {{ name base; stats {{ {fields} }} }}\n"
+    heirs = "".join(
+        f"Item{i} *source Base {{ name item_{i} }}\n" for i in range(heir_count)
+    )
+    doc = TydDocument(parse(base + heirs))
+
+    gc.collect()
+    tracemalloc.start()
+    inheritance = Inheritance()
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    gc.collect()
+    resolved, _ = tracemalloc.get_traced_memory()
+
+    for item in doc.nodes[1:]:
+        len(item["stats"])
+    gc.collect()
+    accessed, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{heir_count} heirs of a base with {field_count} fields")
+    print(f"  resolved          {resolved / 2 ** 20:8.2f} MiB")
+    print(f"  all stats visited {accessed / 2 ** 20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
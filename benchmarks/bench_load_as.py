@@ -0,0 +1,90 @@
+"""Measures load_as against a converter reflecting on type hints for every node.
+
+Usage: python benchmarks/bench_load_as.py [RECORDS]
+"""
+import sys
+import time
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from typing import List, Optional, Union, get_args, get_origin, get_type_hints
+
+from tyd import TydDocument, TydString, load_all_as, parse
+
+RECORD = """Thing{i}
+{{
+    name  thing{i}
+    kind  WEAPON
+    stats {{ hp {i}; mass 2.5 }}
+    tradeable true
+    tags  [ a; b ]
+}}
+"""
+
+
+class Kind(Enum):
+    WEAPON = 1
+    APPAREL = 2
+
+
+@dataclass
+class Stats:
+    hp: int
+    mass: float
+
+
+@dataclass
+class Thing:
+    name: str
+    kind: Kind
+    stats: Stats
+    tradeable: bool
+    tags: List[str]
+    label: Optional[str] = None
+
+
+def _naive(tp, node):
+    if get_origin(tp) is Union:
+        if node is None or (isinstance(node, TydString) and node.value is None):
+            return None
+        tp = [arg for arg in get_args(tp) if arg is not type(None)][0]
+    if node is None:
+        raise ValueError("missing")
+    if get_origin(tp) is list:
+        return [_naive(get_args(tp)[0], child) for child in node]
+    if is_dataclass(tp):
+        hints = get_type_hints(tp)
+        return tp(**{f.name: _naive(hints[f.name], node[f.name]) for f in fields(tp)})
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp[node.value]
+    if tp is bool:
+        return node.value == "true"
+    return tp(node.value)
+
+
+def _best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    doc = TydDocument(parse("".join(RECORD.format(i=i) for i in range(count))))
+    roots = doc.nodes
+
+    naive, expected = _best_of(lambda: [_naive(Thing, node) for node in roots])
+    fast, result = _best_of(lambda: load_all_as(Thing, roots))
+    assert result == expected
+
+    print(f"{count} records")
+    print(f"  naive   {naive:.3f}s  {count / naive:>10.0f} records/s")
+    print(f"  load_as {fast:.3f}s  {count / fast:>10.0f} records/s")
+    print(f"  speedup {naive / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measures the memory held by a parsed leaf-heavy document and its frozen form.
+
+Usage: python benchmarks/bench_memory.py [RECORDS]
+"""
+import gc
+import sys
+import tracemalloc
+
+from tyd import ParseEngine, TydFrozenDocument, parse
+
+RECORD = """Record{i}
+{{
+    a {i}
+    b value_{i}
+    c 1.5
+    d true
+    list [ x; y; z ]
+}}
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = "".join(RECORD.format(i=i) for i in range(count))
+
+    gc.collect()
+    tracemalloc.start()
+    nodes = list(parse(text, engine=ParseEngine.REGEX))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    node_count = count * 9
+    print(f"{len(nodes)} records, {node_count} nodes")
+    _report("nodes", current, node_count)
+
+    tracemalloc.start()
+    frozen = TydFrozenDocument(nodes)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _report("frozen", current, node_count)
+
+    return frozen
+
+
+def _report(label, size, node_count):
+    mib = size / 1024 / 1024
+    print(f"  {label:8} {mib:8.2f} MiB held, {size / node_count:6.1f} B/node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compares the parser engines on a generated document or on given files.
+
+Usage: python benchmarks/bench_parse.py [FILE ...]
+"""
+import sys
+import time
+
+from tyd import ParseEngine, parse
+
+RECORD = """Record{i} *handle Handle{i}
+{{
+    name record_{i}
+    description "A generated record; number {i}."
+    value {i}.5
+    tags
+    [
+        alpha
+        beta # comment
+        gamma
+    ]
+    notes
+    |first line
+    |second line
+}}
+"""
+
+
+def _texts():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, mode="r", encoding="utf-8") as f:
+                yield path, f.read()
+    else:
+        yield "generated", "".join(RECORD.format(i=i) for i in range(20000))
+
+
+def main():
+    for label, text in _texts():
+        print(f"{label}: {len(text)} chars")
+        for engine in ParseEngine:
+            start = time.perf_counter()
+            nodes = list(parse(text, engine=engine))
+            elapsed = time.perf_counter() - start
+            print(f"  {engine.name:8} {elapsed:8.3f}s  {len(nodes)} records")
+
+
+if __name__ == "__main__":
+    main()
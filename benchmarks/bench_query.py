@@ -0,0 +1,51 @@
+"""Measures path queries over a large document, with and without an index.
+
+Usage: python benchmarks/bench_query.py [RECORDS]
+"""
+import sys
+import time
+
+from tyd import TydDocument, TydQueryIndex, compile_selector, parse
+
+RECORD = """Thing{i} *handle H{i}
+{{
+    stats {{ MaxHitPoints {i}; Mass 2 }}
+    tags [ a; b ]
+}}
+"""
+
+QUERIES = [
+    "Thing{i}/stats/MaxHitPoints",
+    "*[@handle=H{i}]/stats/Mass",
+    "**[@handle=H{i}]/tags/*[0]",
+]
+
+
+def _rate(func, count):
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = "".join(RECORD.format(i=i) for i in range(count))
+    doc = TydDocument(parse(text))
+
+    start = time.perf_counter()
+    index = TydQueryIndex(doc)
+    print(f"{count} records, index built in {time.perf_counter() - start:.3f}s")
+
+    for query in QUERIES:
+        selectors = [
+            compile_selector(query.format(i=i * 37 % count)) for i in range(500)
+        ]
+        for name, idx in (("no index", None), ("index", index)):
+            repeat = 2000 if idx is not None or "*" not in query else 20
+            rate = _rate(lambda i: selectors[i % 500].select(doc, idx), repeat)
+            print(f"  {query:<30} {name:<9} {rate:>10.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
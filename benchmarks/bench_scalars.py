@@ -0,0 +1,54 @@
+"""Measures reading numbers from string nodes repeatedly, parsing the value
+each time against the cached accessors, and converting a numeric list.
+
+Usage: python benchmarks/bench_scalars.py [VALUES] [TICKS]
+"""
+import sys
+import time
+
+from tyd import TydDocument, parse
+
+
+def _best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _ticks(func, nodes, ticks):
+    def run():
+        for _ in range(ticks):
+            for node in nodes:
+                func(node)
+
+    return run
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    items = "; ".join(f"{i * 0.25}" for i in range(count))
+    doc = TydDocument(parse(f"values [ {items} ]"))
+    values = doc["values"]
+    nodes = values.nodes
+
+    parsed = _best_of(_ticks(lambda node: float(node.value), nodes, ticks))
+    cached = _best_of(_ticks(lambda node: node.as_float(), nodes, ticks))
+    reads = count * ticks
+    print(f"{count} values read {ticks} times")
+    print(f"  float(value) {parsed:.3f}s  {reads / parsed:>12.0f} reads/s")
+    print(f"  as_float()   {cached:.3f}s  {reads / cached:>12.0f} reads/s")
+
+    loop = _best_of(lambda: [float(node.value) for node in values])
+    to_array = _best_of(lambda: values.to_array("d"))
+    print("  list of floats")
+    print(f"    comprehension {loop * 1000:.2f}ms")
+    print(f"    to_array      {to_array * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measures end-to-end write of a large document.
+
+Usage: python benchmarks/bench_write.py [RECORDS]
+"""
+import sys
+import time
+
+from tyd import ParseEngine, TydDocument, parse, write
+
+RECORD = """Record{i} *handle Handle{i}
+{{
+    name record_{i}
+    description "A generated record with a \\"quoted\\" word; number {i}."
+    value {i}.5
+    stats
+    {{
+        health {i}
+        speed 1.25
+        nested
+        {{
+            deep value
+            deeper
+            [
+                a
+                b
+                c
+            ]
+        }}
+    }}
+    tags
+    [
+        alpha
+        "beta # with comment char"
+        gamma
+    ]
+}}
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = "".join(RECORD.format(i=i) for i in range(count))
+    doc = TydDocument(parse(text, engine=ParseEngine.REGEX))
+
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        out = write(doc)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{count} records, {len(out)} chars written in {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
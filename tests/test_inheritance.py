@@ -0,0 +1,122 @@
+import pytest
+
+from tyd import TydDocument, TydString, parse
+from tyd.inheritance import Inheritance
+
+
+def _resolve(*texts):
+    docs = [TydDocument(parse(text)) for text in texts]
+    inheritance = Inheritance()
+    for doc in docs:
+        inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    return docs
+
+
+def test_inheritance():
+    (doc,) = _resolve(
+        "Child *source Parent { b 3; c { y 2 }; l [ z ]; d 4 }\n"
+        "Parent *handle Parent *source Base { b 2; l *noinherit [ w ] }\n"
+        "Base *handle Base *abstract { a 1; b 1; c { x 1 }; l [ x; y ] }\n"
+    )
+    child, parent, base = doc.nodes
+
+    assert [n.name for n in parent] == ["a", "c", "b", "l"]
+    assert [n.value for n in parent["l"]] == ["w"]
+    assert [n.name for n in child] == ["a", "b", "c", "l", "d"]
+    assert child["a"].value == "1"
+    assert child["b"].value == "3"
+    assert [n.name for n in child["c"]] == ["x", "y"]
+    assert [n.value for n in child["l"]] == ["w", "z"]
+
+    # Inherited nodes are copies, the sources are left untouched.
+    assert child["a"] is not base["a"] and child["a"].parent is child
+    assert [n.name for n in base] == ["a", "b", "c", "l"]
+
+
+def test_inheritance_across_documents_and_calls():
+    base_doc = TydDocument(parse("Base *handle Base { a 1 }"))
+    inheritance = Inheritance()
+    inheritance.register_all_roots(base_doc)
+    inheritance.resolve_all()
+
+    doc = TydDocument(parse("Child *source Base { b 2 }"))
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    assert [n.name for n in doc.nodes[0]] == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "A *handle A *source B { }\nB *handle B *source A { }",
+        "A *source Missing { }",
+        "A *handle A { }\nB *handle A { }",
+        "A *handle A { x 1; x 2 }\nB *source A { }",
+        "A *handle A [ x ]\nB *source A { }",
+    ],
+)
+def test_inheritance_errors(text):
+    with pytest.raises(Exception):
+        _resolve(text)
+
+
+def test_reregister():
+    base_doc = TydDocument(parse("Base *handle Base { a 1; b 1 }"))
+    doc = TydDocument(
+        parse(
+            "Mid *handle Mid *source Base { c 1 }\n"
+            "Leaf *handle Leaf *source Mid { d 1 }\n"
+            "Other *handle Other { e 1 }\n"
+            "Other2 *source Other { f 1 }\n"
+        )
+    )
+    inheritance = Inheritance()
+    inheritance.register_all_roots(base_doc)
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    mid, leaf, other, other2 = doc.nodes
+    other2_children = other2.nodes[:]
+
+    inheritance.reregister(list(parse("Base *handle Base { a 2; z 3 }"))[0])
+
+    assert [(n.name, n.value) for n in mid] == [("a", "2"), ("z", "3"), ("c", "1")]
+    assert [n.name for n in leaf] == ["a", "z", "c", "d"]
+    assert other2.nodes == other2_children
+    assert all(x is y for x, y in zip(other2.nodes, other2_children))
+
+    inheritance.reregister(list(parse("Mid *handle Mid *source Other { c 2 }"))[0])
+    assert [n.name for n in leaf] == ["e", "c", "d"]
+    assert leaf["c"].value == "2"
+
+
+def test_reregister_cycle():
+    doc = TydDocument(parse("A *handle A { }\nB *handle B *source A { }"))
+    inheritance = Inheritance()
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+
+    with pytest.raises(Exception):
+        inheritance.reregister(list(parse("A *handle A *source B { }"))[0])
+
+
+def test_inherited_children_are_shared_until_accessed():
+    doc = TydDocument(
+        parse(
+            "Base *handle Base { stats { hp 10; speed { walk 1 } } }\n"
+            "A *source Base { }\n"
+            "B *source Base { }\n"
+        )
+    )
+    inheritance = Inheritance()
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    base, a, b = doc.nodes
+
+    assert a["stats"]._nodes_loader is not None
+    a["stats"]["speed"].add(TydString("run", "2", None))
+
+    assert a["stats"]["hp"].parent is a["stats"]
+    assert [n.name for n in a["stats"]["speed"]] == ["walk", "run"]
+    assert [n.name for n in b["stats"]["speed"]] == ["walk"]
+    assert [n.name for n in base["stats"]["speed"]] == ["walk"]
@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from tyd import (
+    TydCache,
+    from_file,
+    from_file_async,
+    load_directory_async,
+    load_files_async,
+)
+
+
+@pytest.mark.parametrize(
+    "executor_type", [None, ThreadPoolExecutor, ProcessPoolExecutor]
+)
+def test_from_file_async(tmp_path, test_tyd_from_text_params, executor_type):
+    _, ans = test_tyd_from_text_params
+    path = tmp_path / "a.tyd"
+    path.write_text(ans, encoding="utf-8")
+
+    async def main():
+        if executor_type is None:
+            return await from_file_async(str(path))
+        with executor_type(max_workers=2) as executor:
+            return await from_file_async(str(path), executor=executor)
+
+    tyd_file = asyncio.run(main())
+    assert tyd_file.file_path == str(path)
+    assert tyd_file.document == from_file(str(path)).document
+
+
+def test_load_directory_async(tmp_path):
+    for i in range(20):
+        (tmp_path / f"{i:02}.tyd").write_text(f"a{i} {{ x {i} }}", encoding="utf-8")
+    (tmp_path / "bad.tyd").write_text("b { x", encoding="utf-8")
+    cache = TydCache(str(tmp_path / "cache"))
+
+    async def main():
+        return await load_directory_async(str(tmp_path), concurrency=3, cache=cache)
+
+    for _ in range(2):
+        result = asyncio.run(main())
+        assert [f.document.nodes[0]["x"].value for f in result.files] == [
+            str(i) for i in range(20)
+        ]
+        assert list(result.errors) == [str(tmp_path / "bad.tyd")]
+
+
+def test_load_directory_async_cache_in_processes(tmp_path, monkeypatch):
+    for i in range(4):
+        (tmp_path / f"{i}.tyd").write_text(f"a{i} {{ x {i} }}", encoding="utf-8")
+    cache = TydCache(str(tmp_path / "cache"))
+
+    async def main():
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            return await load_directory_async(
+                str(tmp_path), cache=cache, executor=executor
+            )
+
+    result = asyncio.run(main())
+    assert not result.errors
+    assert [f.document.nodes[0]["x"].value for f in result.files] == list("0123")
+
+    import tyd.tyd_async
+
+    def fail(*args):
+        raise AssertionError("parsed on a cache hit")
+
+    monkeypatch.setattr(tyd.tyd_async, "_load_in_processes", fail)
+    result = asyncio.run(main())
+    assert not result.errors
+    assert [f.document.nodes[0]["x"].value for f in result.files] == list("0123")
+
+
+def test_load_files_async_bounded(tmp_path, monkeypatch):
+    paths = list()
+    for i in range(10):
+        paths.append(str(tmp_path / f"{i}.tyd"))
+        (tmp_path / f"{i}.tyd").write_text(f"a{i} 1", encoding="utf-8")
+
+    import tyd.tyd_async
+
+    running = 0
+    max_running = 0
+    from_file_async = tyd.tyd_async.from_file_async
+
+    async def counting(*args):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            await asyncio.sleep(0.01)
+            return await from_file_async(*args)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(tyd.tyd_async, "from_file_async", counting)
+    result = asyncio.run(load_files_async(paths, concurrency=2))
+
+    assert [f.file_path for f in result.files] == paths
+    assert max_running == 2
+
+
+def test_save_async(tmp_path):
+    path = tmp_path / "a.tyd"
+    path.write_text('a { x "1" }', encoding="utf-8")
+    tyd_file = from_file(str(path))
+    tyd_file.document.nodes[0]["x"].value = "2"
+
+    asyncio.run(tyd_file.save_async())
+
+    assert from_file(str(path)).document.nodes[0]["x"].value == "2"
+
+
+def test_from_file_async_decodes_text(tmp_path):
+    path = tmp_path / "a.tyd"
+    path.write_text(f"a {{ long {'é' * 80} }}", encoding="utf-8")
+
+    tyd_file = asyncio.run(from_file_async(str(path), lazy=True))
+    # Long values aren't kept as loaders holding the whole file.
+    assert tyd_file.document["a"]["long"]._value_loader is None
+    assert tyd_file.document["a"]["long"].value == "é" * 80
+
+    tyd_file = asyncio.run(from_file_async(str(path), lazy=True, mmap=True))
+    # Nor as loaders reading a map which is closed once the file is parsed.
+    assert tyd_file.document["a"]["long"]._value_loader is None
+    assert tyd_file.document["a"]["long"].value == "é" * 80
+
+    # Error columns count characters, as from_file does.
+    path.write_text("é { x é ]", encoding="utf-8")
+    with pytest.raises(Exception) as expected:
+        from_file(str(path))
+    with pytest.raises(Exception) as error:
+        asyncio.run(from_file_async(str(path)))
+    assert str(error.value) == str(expected.value)
@@ -0,0 +1,51 @@
+import pytest
+
+from tyd import TydDocument, dump_binary, load_binary, parse
+
+
+def _doclines(nodes):
+    for node in nodes:
+        yield node.name, node.docline
+        if hasattr(node, "nodes"):
+            yield from _doclines(node)
+
+
+def test_binary_round_trip(test_tyd_from_text_params):
+    _, ans = test_tyd_from_text_params
+    doc = TydDocument(parse(ans))
+
+    loaded = load_binary(dump_binary(doc))
+
+    assert loaded == doc
+    assert list(_doclines(loaded)) == list(_doclines(doc))
+    assert [node.to_tyd() for node in loaded] == [node.to_tyd() for node in doc]
+
+
+def test_binary_attributes():
+    text = (
+        "Base *handle B *abstract\n{\n    x 1\n}\n"
+        'Item *source B *noinherit\n{\n    empty null\n    u "é"\n    l [ null; a ]\n}\n'
+    )
+    doc = TydDocument(parse(text))
+
+    loaded = load_binary(dump_binary(doc))
+
+    base, item = loaded.nodes
+    assert (base.attribute_handle, base.attribute_abstract) == ("B", True)
+    assert (item.attribute_source, item.attribute_no_inherit) == ("B", True)
+    assert item["empty"].value is None
+    assert loaded == doc
+    assert list(_doclines(loaded)) == list(_doclines(doc))
+
+
+@pytest.mark.parametrize("data", [b"", b"TYDC\x01", b"TYDB\x02\x00\x00"])
+def test_load_binary_invalid(data):
+    with pytest.raises(Exception):
+        load_binary(data)
+
+
+def test_load_binary_truncated():
+    data = dump_binary(TydDocument(parse("A { b c; d [ e ] }")))
+    for end in range(5, len(data)):
+        with pytest.raises(Exception):
+            load_binary(data[:end])
@@ -0,0 +1,130 @@
+import pytest
+
+from tyd import TydCache, TydDocument, from_file, load_directory
+from tyd.tyd_from_text import parse
+
+
+def test_from_file_mmap(tmp_path):
+    text = 'A\n{\n    long "' + "é" * 100 + '"\n    naked value # comment\n}\n'
+    path = tmp_path / "a.tyd"
+    path.write_text(text, encoding="utf-8")
+
+    tyd_file = from_file(str(path), mmap=True)
+    assert [node.to_tyd() for node in tyd_file.document] == [
+        node.to_tyd() for node in from_file(str(path)).document
+    ]
+    assert tyd_file.document.nodes[0]["long"].value == "é" * 100
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_from_file_mmap_save(tmp_path, lazy):
+    text = 'A\n{\n    long "' + "é" * 100 + '"\n    B { c ' + "d" * 100 + " }\n}"
+    path = tmp_path / "a.tyd"
+    path.write_text(text, encoding="utf-8")
+
+    # The map is closed, so saving the file doesn't truncate it under nodes
+    # which haven't read their values yet.
+    tyd_file = from_file(str(path), mmap=True, lazy=lazy)
+    tyd_file.save()
+
+    reloaded = from_file(str(path))
+    assert reloaded.document == TydDocument(parse(text))
+    assert reloaded.document["A"]["long"].value == "é" * 100
+    assert reloaded.document["A"]["B"]["c"].value == "d" * 100
+
+
+def test_from_file_mmap_empty(tmp_path):
+    path = tmp_path / "empty.tyd"
+    path.write_text("", encoding="utf-8")
+    assert len(from_file(str(path), mmap=True).document) == 0
+
+
+def test_save(tmp_path, test_tyd_from_text_params):
+    obj, ans = test_tyd_from_text_params
+    path = tmp_path / "a.tyd"
+    path.write_text(ans, encoding="utf-8")
+
+    tyd_file = from_file(str(path))
+    tyd_file.save(str(tmp_path / "b.tyd"))
+    assert (tmp_path / "b.tyd").read_text(encoding="utf-8") == ans + "\n"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_directory(tmp_path, workers):
+    (tmp_path / "a.tyd").write_text('a { x "1" }', encoding="utf-8")
+    (tmp_path / "b.tyd").write_text('b [ "1"; "2" ]', encoding="utf-8")
+    (tmp_path / "bad.tyd").write_text("c { x 1", encoding="utf-8")
+    (tmp_path / "ignored.txt").write_text("d 1", encoding="utf-8")
+
+    result = load_directory(str(tmp_path), workers=workers)
+
+    assert [f.file_name for f in result.files] == ["a", "b"]
+    if workers > 1:
+        # Documents from the workers are thawed when first read.
+        assert result.files[0].frozen_document["a"]["x"].value == "1"
+    assert result.files[0].document["a"]["x"].value == "1"
+    assert result.files[0].frozen_document is None
+    assert len(result.files[1].document["b"]) == 2
+    assert list(result.errors) == [str(tmp_path / "bad.tyd")]
+
+
+def test_from_file_cache(tmp_path, monkeypatch):
+    path = tmp_path / "a.tyd"
+    path.write_text('a *handle H { x "1"; l [ y; null ] }', encoding="utf-8")
+    cache = TydCache(str(tmp_path / "cache"))
+
+    first = from_file(str(path), cache=cache)
+
+    import tyd.tyd_file
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed on a cache hit")
+
+    with monkeypatch.context() as m:
+        m.setattr(tyd.tyd_file, "parse", fail)
+        second = from_file(str(path), cache=cache)
+    assert second.document == first.document
+    assert second.document["a"].attribute_handle == "H"
+
+    path.write_text('a { x "2" }', encoding="utf-8")
+    assert from_file(str(path), cache=cache).document["a"]["x"].value == "2"
+
+
+def test_cache_eviction(tmp_path):
+    paths = [str(tmp_path / f"{i}.tyd") for i in range(4)]
+    for i, path in enumerate(paths):
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(f'a{i} "' + "v" * 100 + '"')
+
+    cache = TydCache(str(tmp_path / "cache"))
+    for path in paths[:3]:
+        from_file(path, cache=cache)
+    entries = list((tmp_path / "cache").iterdir())
+    assert len(entries) == 3
+
+    cache = TydCache(str(tmp_path / "cache"), max_bytes=entries[0].stat().st_size * 2)
+    assert cache.get(paths[0]) is not None
+    from_file(paths[3], cache=cache)
+
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+    assert cache.get(paths[0]) is not None
+    assert cache.get(paths[3]) is not None
+
+
+def test_cache_put_does_not_scan(tmp_path, monkeypatch):
+    cache = TydCache(str(tmp_path / "cache"), max_bytes=1000)
+
+    import tyd.tyd_cache
+
+    def fail(*args):
+        raise AssertionError("scanned the cache directory")
+
+    monkeypatch.setattr(tyd.tyd_cache, "scandir", fail)
+    for i in range(20):
+        path = tmp_path / f"{i}.tyd"
+        path.write_text(f'a{i} "' + "v" * 100 + '"', encoding="utf-8")
+        from_file(str(path), cache=cache)
+
+    entries = list((tmp_path / "cache").iterdir())
+    assert 0 < sum(entry.stat().st_size for entry in entries) <= 1000
+    assert cache.get(str(path)) is not None
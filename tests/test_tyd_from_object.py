@@ -0,0 +1,128 @@
+import io
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional
+
+import pytest
+
+from tyd import TydDocument, dump_node, dump_object, dump_objects, parse
+from tyd import load_all_as, load_as
+
+
+class Kind(Enum):
+    WEAPON = 1
+    APPAREL = 2
+
+
+class Stats(NamedTuple):
+    hp: int
+    speed: float = 1.0
+
+
+class Point:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x):
+        self.x = x
+
+
+@dataclass
+class Thing:
+    name: str
+    kind: Kind
+    stats: Stats
+    tradeable: bool
+    tags: List[str] = field(default_factory=list)
+    costs: Dict[str, int] = field(default_factory=dict)
+    label: Optional[str] = None
+    parts: List["Thing"] = field(default_factory=list)
+
+
+THINGS = [
+    Thing(
+        "sword; long",
+        Kind.WEAPON,
+        Stats(100, 1.5),
+        True,
+        ["melee", ""],
+        {"Steel": 50},
+        parts=[Thing("hilt", Kind.APPAREL, Stats(10), False)],
+    ),
+    Thing("cap", Kind.APPAREL, Stats(5, 0.1), False, label="a # b"),
+]
+
+
+def test_dump_object():
+    assert dump_object(Stats(3, 2.5)) == "Stats\n{\n    hp 3\n    speed 2.5\n}\n"
+    assert dump_object(Point(1), "p") == "p\n{\n    x 1\n}\n"
+    assert dump_object([], "e") == "e[]\n"
+
+    node = dump_node(THINGS[1])
+    assert node.name == "Thing"
+    assert node["stats"]["speed"].value == "0.1"
+    assert node["label"].value == "a # b"
+
+    with pytest.raises(TypeError):
+        dump_object(object())
+
+
+def test_dump_objects_round_trip():
+    fileobj = io.StringIO()
+    dump_objects(THINGS, fileobj)
+    doc = TydDocument(parse(fileobj.getvalue()))
+    assert load_all_as(Thing, doc) == THINGS
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "C:\\games\\x",
+        "null",
+        " lead",
+        "trail ",
+        "ends with \\",
+        "x;y#z\\",
+        "a\\b;c#d]e}f",
+        "tab\tand\nnew line",
+        "|pipe",
+        '"quoted"',
+        "v" * 50 + "\\",
+    ],
+)
+def test_dump_object_round_trips_strings(value):
+    thing = Thing(value, Kind.WEAPON, Stats(1), True, tags=[value, "x"])
+    assert load_as(Thing, dump_node(thing)) == thing
+
+
+@pytest.mark.parametrize("value", ["*a\\", "{a\\", " a\\"])
+def test_dump_object_rejects_unwritable_strings(value):
+    with pytest.raises(TypeError, match="tyd string"):
+        dump_object({"a": value})
+
+
+class Name(str):
+    pass
+
+
+class Count(int):
+    pass
+
+
+class Tags(list):
+    pass
+
+
+def test_dump_object_builtin_subclasses():
+    node = dump_node({"a": Name("hello"), "b": Count(3), "c": Tags(["x"])})
+    assert node["a"].value == "hello"
+    assert node["b"].value == "3"
+    assert [n.value for n in node["c"]] == ["x"]
+
+
+def test_dump_object_checks_names():
+    with pytest.raises(TypeError, match="tyd name"):
+        dump_object({"my key": 1})
+    with pytest.raises(TypeError, match="tyd name"):
+        dump_object({2: 3})
+    with pytest.raises(TypeError, match="tyd name"):
+        dump_object(Stats(1), "")
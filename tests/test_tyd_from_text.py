@@ -0,0 +1,154 @@
+import io
+
+import pytest
+
+from tyd import ParseEngine, TydCollection, parse, parse_stream
+from tyd.tyd_from_text import _LineIndex, _ParseContext
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse(test_tyd_from_text_params, engine):
+    obj, ans = test_tyd_from_text_params
+    nodes = list(parse(ans, engine=engine))
+    assert len(nodes) == 1
+    assert nodes[0].to_tyd() == obj.to_tyd()
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+def test_parse_docline(engine):
+    text = "# comment\nA\n{\n    x 1\n\n    y\n    [\n        a\n    ]\n}\n"
+    table = list(parse(text, engine=engine))[0]
+    assert table.docline == 3
+    assert [node.docline for node in table] == [4, 7]
+    assert table.nodes[1][0].docline == 8
+
+
+def test_parse_engines_agree():
+    text = (
+        "A *handle Base\r\n{\r\n"
+        '    quoted "say \\"hi\\" # not a comment"\r\n'
+        "    naked a\\;b\\}c   # comment\r\n"
+        "    empty null; other x\r\n"
+        "    vertical\r\n    |line 1\r\n    |line 2\r\n"
+        '    list [ a; b; "c" ]\r\n'
+        "}\r\n"
+        "B { }"
+    )
+    classic = list(parse(text, engine=ParseEngine.CLASSIC))
+    regex = list(parse(text, engine=ParseEngine.REGEX))
+    assert [node.to_tyd() for node in classic] == [node.to_tyd() for node in regex]
+    assert [n.docindexend for n in classic] == [n.docindexend for n in regex]
+    assert classic[0]["naked"].value == "a;b}c"
+    assert classic[0]["vertical"].value == "line 1\nline 2"
+
+
+def test_parse_lazy():
+    text = "A\n{\n    x 1\n    t { y [ a; b ] }\n}\nB [ c ]\n"
+    nodes = list(parse(text, lazy=True))
+    assert [node.docindexend for node in nodes] == [
+        node.docindexend for node in parse(text)
+    ]
+    assert nodes[0]._nodes_loader is not None
+    assert nodes[0]["t"]["y"].nodes[1].value == "b"
+    assert nodes[0]._nodes_loader is None
+    assert [node.to_tyd() for node in nodes] == [node.to_tyd() for node in parse(text)]
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+@pytest.mark.parametrize("encode", [False, True])
+def test_parse_lazy_doclines(engine, encode):
+    text = "A\n{\n    x 1\n\n    t\n    {\n        y [\n a;\n b ]\n    }\n}\nB [ c\n]"
+    if encode:
+        text = text.encode("utf-8")
+
+    def doclines(node):
+        nodes = node.nodes if isinstance(node, TydCollection) else []
+        return [node.docline] + [line for n in nodes for line in doclines(n)]
+
+    nodes = list(parse(text, engine=engine, lazy=True))
+    # Unloaded collections don't keep the line index of the whole text.
+    loader_args = nodes[0]._nodes_loader.args
+    assert not any(isinstance(a, (_LineIndex, _ParseContext)) for a in loader_args)
+    assert [doclines(node) for node in nodes] == [
+        doclines(node) for node in parse(text, engine=engine)
+    ]
+
+
+def test_parse_lazy_raises_on_every_access():
+    (a,) = parse("A { x 1; y \\q; z 3 }", lazy=True)
+    for _ in range(2):
+        with pytest.raises(Exception, match="Cannot escape"):
+            len(a)
+    assert a._nodes_loader is not None
+    assert a._nodes == []
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+@pytest.mark.parametrize("encode", [False, True])
+def test_parse_lazy_skips_values(engine, encode):
+    text = (
+        "A\r\n{\r\n"
+        '    quoted "say \\"hi\\" ] } # not a comment"\r\n'
+        "    naked a\\;b\\}c\\]   # comment\r\n"
+        "    vertical\r\n    |line ] 1\r\n    |line } 2\r\n"
+        '    t *handle T { y [ a; "b]"; { z null } ] }\r\n'
+        "}\r\n"
+        "B [ c\\\\d; |e\n ]"
+    )
+    broken = text.replace("*handle", "*unknown")
+    if encode:
+        text, broken = text.encode("utf-8"), broken.encode("utf-8")
+    expected = list(parse(text, engine=engine))
+    nodes = list(parse(text, engine=engine, lazy=True))
+    assert [n.docindexend for n in nodes] == [n.docindexend for n in expected]
+    assert [node.to_tyd() for node in nodes] == [node.to_tyd() for node in expected]
+
+    with pytest.raises(Exception, match="Unknown attribute"):
+        list(parse(broken, engine=engine, lazy=True))
+
+
+def test_parse_bytes(test_tyd_from_text_params):
+    obj, ans = test_tyd_from_text_params
+    nodes = list(parse(ans.encode("utf-8")))
+    assert nodes[0].to_tyd() == obj.to_tyd()
+    assert [node.docline for node in nodes[0]] == [
+        node.docline for node in list(parse(ans))[0]
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 65536])
+def test_parse_stream(chunk_size):
+    text = "".join(
+        f"Record{i} *handle H{i}\n{{\n    value {i}\n    list [ a; b ]\n}}\n"
+        for i in range(20)
+    )
+    text += "Last |vertical\n    |text # comment"
+    expected = list(parse(text))
+    nodes = list(parse_stream(io.StringIO(text), chunk_size))
+    assert [node.to_tyd() for node in nodes] == [node.to_tyd() for node in expected]
+    assert [node.docline for node in nodes] == [node.docline for node in expected]
+
+
+def test_parse_stream_raises_on_malformed_record():
+    with pytest.raises(Exception):
+        list(parse_stream(io.StringIO("A {\n    x 1\n}\nB {\n    y 2\n"), 4))
+
+
+@pytest.mark.parametrize("engine", list(ParseEngine))
+@pytest.mark.parametrize("malformed", ["B { y \\q }", "B *unknown U { }", "B { y 1 ]"])
+def test_parse_stream_raises_before_reading_the_rest(engine, malformed):
+    text = "A { x 1 }\n" + malformed + "\n" + "C { z 3 }\n" * 100000
+    fileobj = io.StringIO(text)
+    nodes = parse_stream(fileobj, 64, engine)
+    assert next(nodes).name == "A"
+    with pytest.raises(Exception):
+        list(nodes)
+    assert fileobj.tell() <= 128
+
+
+def test_parse_stream_stops_at_a_closing_bracket():
+    text = "A { x 1 }\n}\n" + "C { z 3 }\n" * 100000
+    fileobj = io.StringIO(text)
+    nodes = list(parse_stream(fileobj, 64))
+    assert [node.name for node in nodes] == [node.name for node in parse(text)]
+    assert fileobj.tell() <= 128
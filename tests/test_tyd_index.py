@@ -0,0 +1,58 @@
+import pytest
+
+from tyd import TydDocument, TydIndex, TydLoader, from_document, parse
+
+
+def _file(path, text):
+    return from_document(TydDocument(parse(text)), path)
+
+
+def test_index():
+    index = TydIndex()
+    a = _file("a.tyd", "Base *handle Base { }\nItem *source Base { }\nv 1")
+    b = _file("b.tyd", "Item *handle Item2 *source Base { }")
+    index.add_file(a)
+    index.add_file(b)
+
+    base, item, v = a.document.nodes
+    (item2,) = b.document.nodes
+    assert index.find_handle("Base") is base
+    assert index.find_heirs("Base") == [item, item2]
+    assert index.find_named("Item") == [item, item2]
+    assert index.find_named("v") == [v]
+    assert index.file_of(item2) is b
+
+    with pytest.raises(Exception):
+        index.add_file(_file("c.tyd", "Other *handle Base { }"))
+    with pytest.raises(Exception):
+        index.reload_file(_file("b.tyd", "Other *handle Base { }"))
+    assert index.find_handle("Base") is base
+
+    b2 = _file("b.tyd", "Item3 *handle Item2 { }")
+    index.reload_file(b2)
+    assert index.find_heirs("Base") == [item]
+    assert index.find_named("Item3") == b2.document.nodes
+    assert index.find_handle("Item2") is b2.document.nodes[0]
+
+    assert index.remove_file("a.tyd") is a
+    assert index.find_handle("Base") is None
+    assert index.find_heirs("Base") == []
+    assert index.find_named("v") == []
+    assert index.files == [b2]
+
+
+def test_loader_index(tmp_path):
+    (tmp_path / "a.tyd").write_text("Base *handle Base { x 1 }", encoding="utf-8")
+    (tmp_path / "b.tyd").write_text("Item *source Base { y 2 }", encoding="utf-8")
+    loader = TydLoader()
+    loader.load_file(str(tmp_path / "a.tyd"))
+    loader.load_file(str(tmp_path / "b.tyd"))
+    loader.resolve()
+
+    (item,) = loader.index.find_heirs("Base")
+    assert [n.name for n in item] == ["x", "y"]
+
+    (tmp_path / "a.tyd").write_text("Base *handle Base { z 3 }", encoding="utf-8")
+    loader.reload_file(str(tmp_path / "a.tyd"))
+    assert loader.index.find_handle("Base")["z"].value == "3"
+    assert [n.name for n in item] == ["z", "y"]
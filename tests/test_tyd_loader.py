@@ -0,0 +1,164 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tyd import TydDocument, TydLoader, dump_binary, parse
+
+
+@pytest.fixture
+def inheriting_files(tmp_path):
+    paths = list()
+    for f in range(8):
+        records = list()
+        for i in range(f * 20, f * 20 + 20):
+            # Every record inherits from one in the previous file.
+            source = f" *source H{i - 20}" if i >= 20 else ""
+            records.append(
+                f"R{i} *handle H{i}{source}\n{{\n"
+                f'    own{i} {i}\n    long "{"v" * 80}{i}"\n'
+                f"    nested {{ n{i} [ {i}; x ] }}\n}}\n"
+            )
+        path = tmp_path / f"{f}.tyd"
+        path.write_text("".join(records), encoding="utf-8")
+        paths.append(str(path))
+    # Loading in reverse order makes heirs be registered before their sources.
+    return paths[::-1]
+
+
+def _load_all(paths, **kwargs):
+    loader = TydLoader(**kwargs)
+    for path in paths:
+        loader.load_file(path)
+    loader.resolve()
+    return [dump_binary(tyd_file.document) for tyd_file in loader.files]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"lazy": True}, {"mmap": True}])
+def test_parallel_loads_are_identical(inheriting_files, kwargs):
+    expected = _load_all(inheriting_files)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(_load_all, inheriting_files, **kwargs) for _ in range(16)
+        ]
+        results = [future.result() for future in futures]
+
+    assert all(result == expected for result in results)
+
+
+def test_shared_loader(inheriting_files):
+    expected = dict(zip(inheriting_files, _load_all(inheriting_files)))
+
+    loader = TydLoader(lazy=True)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(loader.load_file, inheriting_files))
+    loader.resolve()
+
+    assert len(loader.files) == len(inheriting_files)
+    for tyd_file in loader.files:
+        assert dump_binary(tyd_file.document) == expected[tyd_file.file_path]
+
+
+def test_shared_lazy_document():
+    text = "".join(f"R{i} {{ a [ {i}; {{ b {i} }} ]; c {{ d }} }}\n" for i in range(99))
+    expected = dump_binary(TydDocument(parse(text)))
+
+    # Switching threads often makes them race on loading the same nodes.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(5):
+            doc = TydDocument(parse(text, lazy=True))
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(dump_binary, [doc] * 8))
+            assert all(result == expected for result in results)
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_reload_replaces_roots(tmp_path):
+    base = tmp_path / "base.tyd"
+    base.write_text("B *handle B { a 1 }", encoding="utf-8")
+    heirs = tmp_path / "heirs.tyd"
+    heirs.write_text("H1 *source B { }\nOld *handle OLD { }", encoding="utf-8")
+
+    loader = TydLoader()
+    loader.load_file(str(base))
+    loader.load_file(str(heirs))
+    loader.resolve()
+
+    heirs.write_text("H1 *source B { b 2 }", encoding="utf-8")
+    for _ in range(5):
+        loader.reload_file(str(heirs))
+
+    inheritance = loader._inheritance
+    assert inheritance._nodes_by_handle["B"].heir_count == 1
+    assert "OLD" not in inheritance._nodes_by_handle
+
+    base.write_text("B *handle B { a 3 }", encoding="utf-8")
+    loader.reload_file(str(base))
+    (h1,) = loader.index.find_named("H1")
+    assert h1["a"].value == "3" and h1["b"].value == "2"
+
+    # A handle can't be removed while another file inherits from it.
+    base.write_text("C *handle C { }", encoding="utf-8")
+    with pytest.raises(Exception, match="Could not find source"):
+        loader.reload_file(str(base))
+
+
+def test_failed_reload_keeps_previous_file(tmp_path):
+    base = tmp_path / "base.tyd"
+    base.write_text("B *handle B { a 1 }", encoding="utf-8")
+    heirs = tmp_path / "heirs.tyd"
+    heirs.write_text("H1 *source B { }", encoding="utf-8")
+
+    loader = TydLoader()
+    loader.load_file(str(base))
+    previous = loader.load_file(str(heirs))
+    loader.resolve()
+
+    heirs.write_text("H1 *source NOPE { }", encoding="utf-8")
+    with pytest.raises(Exception, match="NOPE"):
+        loader.reload_file(str(heirs))
+
+    assert previous in loader.files
+    assert loader.index.find_named("H1") == [previous.document["H1"]]
+    assert loader.index.file_of(previous.document["H1"]) is previous
+
+    # Merges failing after the nodes are replaced leave the resolver unchanged.
+    previous_base = loader.files[0]
+    base.write_text("Base *handle B { a 1; a 2 }", encoding="utf-8")
+    with pytest.raises(Exception, match="Duplicate"):
+        loader.reload_file(str(base))
+
+    assert loader.index.find_named("Base") == []
+    inheritance = loader._inheritance
+    assert inheritance._nodes_by_handle["B"].tyd_node is previous_base.document["B"]
+    assert inheritance._unresolved_nodes == []
+    assert previous.document["H1"]["a"].value == "1"
+
+    base.write_text("B *handle B { a 3 }", encoding="utf-8")
+    loader.reload_file(str(base))
+    assert previous.document["H1"]["a"].value == "3"
+
+
+def test_failed_load_leaves_loader_unchanged(tmp_path):
+    path = tmp_path / "a.tyd"
+    path.write_text("B *handle Y { }\nC *handle X { }", encoding="utf-8")
+
+    loader = TydLoader()
+    loader.load_text("Z *handle X { }")
+    for _ in range(2):
+        with pytest.raises(Exception, match="same handle X"):
+            loader.load_file(str(path))
+
+        assert len(loader.files) == 1
+        assert str(path) not in loader.index
+        assert set(loader._inheritance._nodes_by_handle) == {"X"}
+        assert len(loader._inheritance._unresolved_nodes) == 1
+
+    path.write_text("B *handle Y { }\nC *source X { }", encoding="utf-8")
+    loader.load_file(str(path))
+    loader.resolve()
+    assert loader.index.find_handle("Y") is not None
@@ -1,3 +1,165 @@
+import pickle
+from array import array
+from enum import Enum
+
+import pytest
+
+from tyd import (
+    Inheritance,
+    TydDocument,
+    TydFrozenDocument,
+    TydString,
+    TydTable,
+    parse,
+)
+from tyd.nodes import TydCollection, TydNode
+
+
 def test_tyd_from_text(test_tyd_from_text_params):
     obj, ans = test_tyd_from_text_params
     assert obj.to_tyd() == ans
+
+
+def test_tyd_node_is_abstract():
+    with pytest.raises(TypeError):
+        TydNode("a")
+    with pytest.raises(TypeError):
+        TydCollection("a")
+
+
+def test_tyd_table_lookup():
+    table = TydTable("table", None)
+    first = TydString("a", "1", table)
+    table.add(first)
+    table.add(TydString("b", "2", table))
+    assert table["a"] is first
+    assert "b" in table and "c" not in table
+
+    table.add(TydString("a", "3", table))
+    assert table["a"] is first
+
+    second = TydString("a", "0", table)
+    table.insert(0, second)
+    assert table["a"] is second
+
+    table.nodes.remove(second)
+    assert table["a"] is first
+    assert table["missing"] is None
+
+
+def test_tyd_frozen_document(test_tyd_from_text_params):
+    obj, ans = test_tyd_from_text_params
+    frozen = TydFrozenDocument([obj])
+    assert frozen.thaw().to_tyd() == TydDocument([obj]).to_tyd()
+
+    table = frozen[obj.name]
+    assert table.name == obj.name
+    assert table["name"].value == obj["name"].value
+    assert table["missing"] is None
+    assert [node.name for node in table] == [node.name for node in obj]
+
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert restored[obj.name]["description"].value == obj["description"].value
+
+
+@pytest.mark.parametrize("count", [3, 50])
+def test_tyd_frozen_table_lookup(count):
+    text = "".join(f"r{i} {i}\n" for i in range(count)) + "r1 dup\nx { y 1 }"
+    frozen = TydFrozenDocument(parse(text))
+
+    for _ in range(2):
+        assert frozen["r1"].value == "1"
+        assert frozen[f"r{count - 1}"].value == str(count - 1)
+        assert frozen["x"]["y"].value == "1"
+        assert "missing" not in frozen and frozen["missing"] is None
+
+
+def test_tyd_node_structural_equality():
+    a = list(parse("A *handle H { x 1; y [ a; b ]; z { w null } }"))[0]
+    b = list(parse("A *handle H { z { w null }; y [ a; b ]; x 1 }"))[0]
+    c = list(parse("A *handle H { x 1; y [ b; a ]; z { w null } }"))[0]
+    assert a == b
+    assert a.structural_hash() == b.structural_hash()
+    assert a != c
+    assert a["x"] == b["x"] and a["x"] != a["z"]
+
+    def chain(depth):
+        root = node = TydTable("deep", None)
+        for i in range(depth):
+            child = TydTable("deep", node)
+            node.add(child)
+            node = child
+        return root
+
+    assert chain(5000) == chain(5000)
+    assert chain(5000) != chain(4999)
+    assert chain(5000).structural_hash() == chain(5000).structural_hash()
+
+
+class _Kind(Enum):
+    WEAPON = 1
+    APPAREL = 2
+
+
+def test_tyd_string_as_scalars():
+    node = TydString("a", "2", None)
+    assert node.as_int() == 2
+    assert node.as_float() == 2.0 and isinstance(node.as_float(), float)
+    assert node.as_int() == 2
+    assert node.as_enum(_Kind) is _Kind.APPAREL
+
+    node.value = "WEAPON"
+    assert node.as_enum(_Kind) is _Kind.WEAPON
+    node.value = "True"
+    assert node.as_bool() is True
+
+    with pytest.raises(ValueError):
+        node.as_int()
+    with pytest.raises(ValueError):
+        TydString("a", None, None).as_float()
+
+
+def test_tyd_list_to_array():
+    doc = TydDocument(parse("a [ 1; 2.5; -3 ]\nb [ 1; x ]\nc [ ]"))
+    assert doc["a"].to_array() == array("d", [1.0, 2.5, -3.0])
+    assert doc["c"].to_array("i") == array("i")
+    with pytest.raises(ValueError):
+        doc["a"].to_array("i")
+    with pytest.raises(ValueError):
+        doc["b"].to_array("f")
+
+
+def test_tyd_table_lookup_after_held_list_mutation():
+    table = TydTable("table", None)
+    a = TydString("a", "1", table)
+    table.add(a)
+    table.add(TydString("b", "2", table))
+
+    nodes = table.nodes
+    assert table["a"] is a
+    nodes.remove(a)
+    assert table["a"] is None
+
+    second = TydString("a", "3", table)
+    nodes.append(second)
+    assert table["a"] is second
+    nodes[:] = [a]
+    assert table["a"] is a and table["b"] is None
+
+    table.add(TydString("c", "4", table))
+    assert table["c"] is nodes[-1]
+
+
+def test_tyd_collection_pickle_after_nodes_access():
+    doc = TydDocument(parse("B *handle B { a 1; l [ x ] }\nH *source B { b 2 }"))
+    inheritance = Inheritance()
+    inheritance.register_all_roots(doc)
+    inheritance.resolve_all()
+    assert len(doc["H"].nodes) == 3
+
+    restored = pickle.loads(pickle.dumps(doc))
+    assert restored == doc
+    assert restored["H"]["a"].value == "1"
+
+    restored["H"].nodes.remove(restored["H"]["a"])
+    assert restored["H"]["a"] is None
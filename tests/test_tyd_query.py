@@ -0,0 +1,92 @@
+import pytest
+
+from tyd import (
+    TydDocument,
+    TydFrozenDocument,
+    TydQueryIndex,
+    compile_selector,
+    parse,
+)
+
+TEXT = """
+ThingDefs
+{
+    Wall *handle BaseWall *abstract { stats { MaxHitPoints 100 } }
+    Stone *source BaseWall { stats { MaxHitPoints 300 }; tags [ hard; grey ] }
+    Wood *source BaseWall { stats { MaxHitPoints 150; Flammable true } }
+}
+Other { nested { stats { MaxHitPoints 1 } } }
+"""
+
+
+def _values(nodes):
+    return [node.value for node in nodes]
+
+
+@pytest.fixture(params=["nodes", "frozen"])
+def doc(request):
+    doc = TydDocument(parse(TEXT))
+    return doc if request.param == "nodes" else TydFrozenDocument(doc)
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("ThingDefs/*/stats/MaxHitPoints", ["100", "300", "150"]),
+        ("/ThingDefs/Stone/stats/MaxHitPoints", ["300"]),
+        ("ThingDefs/*[@source=BaseWall]/stats/MaxHitPoints", ["300", "150"]),
+        ("ThingDefs/*[@abstract=false][-1]/stats/*", ["150", "true"]),
+        ("**/MaxHitPoints", ["100", "300", "150", "1"]),
+        ("**/tags/*[0]", ["hard"]),
+        ("**[@handle=BaseWall]/stats/MaxHitPoints", ["100"]),
+        ("**/stats/MaxHitPoints[1]", []),
+        ("ThingDefs/Missing/stats", []),
+    ],
+)
+def test_select(doc, path, expected, use_index):
+    index = TydQueryIndex(doc) if use_index else None
+    assert _values(doc.select(path, index)) == expected
+    assert _values(compile_selector(path).select(doc, index)) == expected
+
+
+def test_select_returns_nodes(doc):
+    (wood,) = doc.select("ThingDefs/Wood")
+    assert wood.attribute_source == "BaseWall"
+    assert compile_selector("ThingDefs/Wood") is compile_selector("ThingDefs/Wood")
+
+
+@pytest.mark.parametrize("path", ["", "a//b", "a/b c", "a[@name=x]", "a[x]"])
+def test_invalid_selector(path):
+    with pytest.raises(Exception):
+        compile_selector(path)
+
+
+def test_select_children_by_handle_with_index(doc):
+    (thing_defs,) = doc.select("ThingDefs")
+    index = TydQueryIndex(thing_defs)
+
+    for i in (None, index):
+        assert [n.name for n in thing_defs.select("*[@handle=BaseWall]", i)] == ["Wall"]
+        assert thing_defs.select("Stone[@handle=BaseWall]", i) == []
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize(
+    "text, path, expected",
+    [
+        ("R { a { x 1 }; x 2 }", "**/x", ["1", "2"]),
+        ("R { a { x 1 }; x 2 }", "R/**/x", ["1", "2"]),
+        ("R { a { a { b 1 }; b 2 } }", "**/a/b", ["1", "2"]),
+        ("R { a { a { b 1 }; b 2 } }", "**/a/**/b", ["1", "2"]),
+        ("R *handle H { a { x 1 }; x 2 }", "**[@handle=H]/**/x", ["1", "2"]),
+        ("R { a { x 1; x 2 }; x 3 }", "**/x[0]", ["1", "3"]),
+    ],
+)
+def test_select_descendants_in_document_order(text, path, expected, use_index, frozen):
+    doc = TydDocument(parse(text))
+    if frozen:
+        doc = TydFrozenDocument(doc)
+    index = TydQueryIndex(doc) if use_index else None
+    assert _values(doc.select(path, index)) == expected
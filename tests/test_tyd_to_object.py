@@ -0,0 +1,140 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, make_dataclass
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pytest
+
+from tyd import TydDocument, TydFrozenDocument, load_all_as, load_as, parse
+
+
+class Kind(Enum):
+    WEAPON = 1
+    APPAREL = 2
+
+
+class Stats(NamedTuple):
+    hp: int
+    speed: float = 1.0
+
+
+class Point:
+    __slots__ = ("x", "y")
+    x: int
+    y: Optional[int]
+
+
+@dataclass
+class Thing:
+    name: str
+    kind: Kind
+    stats: Stats
+    tradeable: bool
+    tags: List[str] = field(default_factory=list)
+    costs: Dict[str, int] = field(default_factory=dict)
+    label: Optional[str] = "none"
+    size: Optional[Tuple[int, int]] = None
+    parts: List["Thing"] = field(default_factory=list)
+
+
+TEXT = """
+Sword
+{
+    name    sword
+    kind    WEAPON
+    stats   { hp 100; speed 1.5 }
+    tradeable true
+    tags    [ melee; sharp ]
+    costs   { Steel 50; Wood 10 }
+    label   null
+    parts
+    [
+        { name hilt; kind 2; stats { hp 10 }; tradeable FALSE }
+    ]
+}
+Point { x 3 }
+"""
+
+
+@pytest.mark.parametrize("freeze", [False, True])
+def test_load_as(freeze):
+    doc = TydDocument(parse(TEXT))
+    if freeze:
+        doc = TydFrozenDocument(doc)
+
+    thing = load_as(Thing, doc["Sword"])
+    assert thing == Thing(
+        name="sword",
+        kind=Kind.WEAPON,
+        stats=Stats(100, 1.5),
+        tradeable=True,
+        tags=["melee", "sharp"],
+        costs={"Steel": 50, "Wood": 10},
+        label=None,
+        parts=[Thing("hilt", Kind.APPAREL, Stats(10), False)],
+    )
+
+    point = load_as(Point, doc["Point"])
+    assert (point.x, point.y) == (3, None)
+    assert load_as(Dict[str, int], doc["Sword"]["costs"]) == {"Steel": 50, "Wood": 10}
+    assert load_all_as(int, doc["Sword"]["costs"]) == [50, 10]
+
+
+def test_load_as_errors():
+    doc = TydDocument(parse("a { hp x }\nb { }\nc [ 1 ]\nd { hp 1; speed 1 }"))
+
+    with pytest.raises(Exception, match="line 1 into Stats"):
+        load_as(Stats, doc["a"])
+    with pytest.raises(Exception, match="Missing hp"):
+        load_as(Stats, doc["b"])
+    with pytest.raises(Exception, match="Expected a table"):
+        load_as(Stats, doc["c"])
+    with pytest.raises(TypeError):
+        load_as(Dict[int, int], doc["d"])
+    with pytest.raises(Exception, match="isn't a member"):
+        load_as(Kind, doc["a"]["hp"])
+
+
+def test_load_as_scalars_use_node_cache():
+    doc = TydDocument(parse("a { k WEAPON; b TRUE; v 2; f 1.5 }"))
+    frozen = TydFrozenDocument(doc)
+
+    assert load_as(Kind, doc["a"]["k"]) is Kind.WEAPON
+    assert doc["a"]["k"]._decoded == (Kind, Kind.WEAPON)
+    assert load_as(bool, doc["a"]["b"]) is True
+    assert doc["a"]["b"]._decoded == (bool, True)
+    assert load_as(int, doc["a"]["v"]) == 2
+    assert doc["a"]["v"]._decoded == (int, 2)
+    assert load_as(float, doc["a"]["f"]) == 1.5
+    assert doc["a"]["f"]._decoded == (float, 1.5)
+
+    assert load_as(Kind, frozen["a"]["v"]) is Kind.APPAREL
+    assert load_as(bool, frozen["a"]["b"]) is True
+
+
+def test_load_as_threads():
+    doc = TydDocument(parse("a { v 1; children [ { v 2; children [ ] } ] }"))
+    classes = list()
+    for i in range(100):
+        name = f"Tree{i}"
+        cls = make_dataclass(name, [("v", int), ("children", List[name])])
+        # Forward references are resolved in the namespace of the module.
+        cls.__module__ = __name__
+        globals()[name] = cls
+        classes.append(cls)
+
+    def load(cls):
+        return load_as(cls, doc["a"]).children[0].v
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(load, [c for c in classes for _ in range(8)]))
+    finally:
+        sys.setswitchinterval(switch_interval)
+        for cls in classes:
+            del globals()[cls.__name__]
+
+    assert results == [2] * 800
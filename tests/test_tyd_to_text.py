@@ -0,0 +1,13 @@
+import io
+
+from tyd import TydDocument, iter_write, write, write_to
+
+
+def test_write_to(test_tyd_from_text_params):
+    obj, ans = test_tyd_from_text_params
+    doc = TydDocument([obj])
+
+    buffer = io.StringIO()
+    write_to(doc, buffer)
+    assert buffer.getvalue() == write(doc)
+    assert "".join(iter_write(obj)) == ans
@@ -2,8 +2,25 @@
 
 __version__ = "0.1.0"
 
-from .tyd_to_text import write
-from .tyd_from_text import parse
+from .tyd_to_text import iter_write, write, write_to
+from .tyd_from_text import parse, parse_stream, ParseEngine
 from .nodes import TydCollection, TydDocument, TydList, TydNode, TydString, TydTable
+from .nodes import (
+    TydFrozenCollection,
+    TydFrozenDocument,
+    TydFrozenList,
+    TydFrozenNode,
+    TydFrozenString,
+    TydFrozenTable,
+)
 
-from .tyd_file import from_document, from_file
+from .inheritance import Inheritance
+from .tyd_binary import dump_binary, load_binary
+from .tyd_async import from_file_async, load_directory_async, load_files_async
+from .tyd_cache import TydCache
+from .tyd_from_object import dump_node, dump_object, dump_objects
+from .tyd_file import DirectoryLoadResult, from_document, from_file, load_directory
+from .tyd_index import TydIndex
+from .tyd_loader import TydLoader
+from .tyd_query import TydQueryIndex, TydSelector, compile_selector, select
+from .tyd_to_object import load_all_as, load_as
@@ -1,15 +1,48 @@
-from typing import Dict, List, Set
+from collections import deque, namedtuple
+from typing import Dict, List, Optional
 
 from .nodes import TydCollection, TydDocument, TydList, TydNode, TydString, TydTable
 
+# The state of the nodes a reregistration can change, to roll it back.
+_Checkpoint = namedtuple("_Checkpoint", ["states", "unresolved_nodes"])
+
 
 class Inheritance:
+    """This resolves the inheritance between collections.
+
+    Collections with a handle or a source attribute are registered, then
+    resolve_all merges the children of each source into its heirs.
+    Sources are resolved before their heirs, so inheritance chains work
+    regardless of the order of registration, and each collection is merged
+    exactly once.
+
+    When a table inherits, the children of the source whose name doesn't
+    exist in the heir are copied to the top of the heir, and the children
+    with a matching name are merged recursively. When a list inherits, the
+    children of the source are copied to the top of the heir. A collection
+    with the noinherit attribute keeps its own children.
+
+    Inherited children are shared clones of a snapshot taken once per source,
+    so heirs only hold copies of the inherited subtrees they access.
+
+    The heir graph and a copy of each heir as it was before merging are kept,
+    so that reregister can re-apply inheritance to only the heirs of a
+    collection which changed.
+    """
+
     class InheritanceNode:
+        __slots__ = ("tyd_node", "resolved", "heirs", "source", "original", "snapshot")
+
         def __init__(self, tyd_node: TydCollection):
             self.tyd_node = tyd_node
             self.resolved = False
             self.heirs = None
             self.source = None
+            # A copy of tyd_node before the source was merged into it.
+            self.original = None
+            # A copy of tyd_node after resolution, never mutated, which the
+            # inherited children of the heirs share.
+            self.snapshot = None
 
         @property
         def heir_count(self) -> int:
@@ -23,155 +56,510 @@ class Inheritance:
                 self.heirs = list()
             self.heirs.append(node)
 
+        def remove_heir(self, node) -> None:
+            self.heirs.remove(node)
+
         def __str__(self) -> str:
             return self.tyd_node.__str__()
 
-    initialized = False
-    unresolved_nodes: List[InheritanceNode] = list()
-    resolved_nodes: Dict[TydNode, InheritanceNode] = dict()
-    nodes_by_handle: Dict[str, InheritanceNode] = dict()
+    def __init__(self):
+        self._unresolved_nodes: List[Inheritance.InheritanceNode] = list()
+        self._nodes_by_handle: Dict[str, Inheritance.InheritanceNode] = dict()
+        # Registered nodes by id of their collection, to unregister them.
+        self._nodes_by_id: Dict[int, Inheritance.InheritanceNode] = dict()
 
-    @classmethod
-    def initialize(cls):
-        if cls.initialized:
-            # TODO: Will add an error message.
-            raise Exception()
-        cls.initialized = True
+    def register(self, node: TydCollection) -> None:
+        """A function to register a collection taking part in inheritance.
 
-    @classmethod
-    def register(cls, node: TydCollection):
-        if not cls.initialized:
-            # TODO: Will add an error message.
-            raise Exception()
+        Collections without handle and source attributes are ignored.
+
+        Parameters
+        ----------
+        node : TydCollection
+            A collection to register.
 
+        Raises
+        ------
+        Exception
+            Raise when the handle of the collection is already registered.
+        """
         node_handle = node.attribute_handle
         node_source = node.attribute_source
 
         if node_handle is None and node_source is None:
             return
 
-        if node_handle is not None and node_handle in cls.nodes_by_handle.keys():
-            # TODO: Will add an error message.
-            raise Exception()
+        if node_handle is not None and node_handle in self._nodes_by_handle:
+            raise Exception(
+                f"Tyd error: Multiple Tyd nodes with the same handle {node_handle}."
+            )
 
-        new_node = cls.InheritanceNode(node)
-        cls.unresolved_nodes.append(new_node)
+        new_node = Inheritance.InheritanceNode(node)
+        self._unresolved_nodes.append(new_node)
+        self._nodes_by_id[id(node)] = new_node
         if node_handle is not None:
-            cls.nodes_by_handle[node_handle] = new_node
-
-    @classmethod
-    def register_all_roots(cls, doc: TydDocument):
-        if not cls.initialized:
-            raise Exception()
-
-        for tyd_col in doc:
-            if tyd_col is not None:
-                cls.register(tyd_col)
-
-    @classmethod
-    def reset(cls):
-        cls.unresolved_nodes.clear()
-        cls.resolved_nodes.clear()
-        cls.nodes_by_handle.clear()
-        cls.initialized = False
-
-    @classmethod
-    def resolve_all(cls):
-        if not cls.initialized:
-            raise Exception()
-
+            self._nodes_by_handle[node_handle] = new_node
+
+    def register_all_roots(self, doc: TydDocument) -> None:
+        """A function to register every root collection of a document.
+
+        Parameters
+        ----------
+        doc : TydDocument
+            A document whose roots are registered.
+
+        Raises
+        ------
+        Exception
+            Raise when the handle of a root is already registered.
+            None of the roots of the document are registered then.
+        """
+        registered = list()
+        try:
+            for tyd_node in doc:
+                if isinstance(tyd_node, TydCollection):
+                    self.register(tyd_node)
+                    registered.append(tyd_node)
+        except BaseException:
+            for tyd_node in registered:
+                inheritance_node = self._nodes_by_id.get(id(tyd_node))
+                if inheritance_node is not None:
+                    self._unregister(inheritance_node)
+            raise
+
+    def reregister(self, node: TydCollection) -> None:
+        """A function to replace a registered collection by its new version.
+
+        Inheritance is applied to the new collection and re-applied to its
+        heirs, transitively. Other collections are left untouched, so the cost
+        is proportional to the number of heirs affected.
+
+        Parameters
+        ----------
+        node : TydCollection
+            A new version of a collection, registered by its handle.
+            A collection whose handle isn't registered yet is registered.
+
+        Raises
+        ------
+        Exception
+            Raise when the collection has no handle, when its source can't be
+            found or would make a cycle, or when the nodes to merge are
+            inconsistent. The registered collections are left unchanged then.
+        """
+        if node.attribute_handle is None:
+            raise Exception(f"Tyd error: Can't reregister {node} without handle.")
+        self._reregister_nodes([node])
+
+    def reregister_all_roots(
+        self, doc: TydDocument, replaced_roots: Optional[List[TydCollection]] = None
+    ) -> None:
+        """A function to reregister every root collection of a reloaded document.
+
+        Collections without handle are registered as new collections.
+
+        Parameters
+        ----------
+        doc : TydDocument
+            A document whose roots are reregistered.
+        replaced_roots : Optional[List[TydCollection]]
+            The collections registered from the previous version of the
+            document, by default None. Those whose handle isn't in the new
+            version, and those without handle, are unregistered.
+
+        Raises
+        ------
+        Exception
+            Raise when a source can't be found, including the handles
+            removed from the document, or would make a cycle, or when the
+            nodes to merge are inconsistent. The registered collections are
+            left unchanged then.
+        """
+        self._reregister_nodes(
+            [tyd_node for tyd_node in doc if isinstance(tyd_node, TydCollection)],
+            replaced_roots or [],
+        )
+
+    def reset(self) -> None:
+        """A function to forget every collection registered."""
+        self._unresolved_nodes.clear()
+        self._nodes_by_handle.clear()
+        self._nodes_by_id.clear()
+
+    def resolve_all(self) -> None:
+        """A function to apply inheritance to every collection registered.
+
+        Collections resolved by earlier calls stay registered, so collections
+        registered later can inherit from them.
+
+        Raises
+        ------
+        Exception
+            Raise when a source can't be found, when sources form a cycle,
+            or when the nodes to merge are inconsistent.
+        """
+        self._link_all_inheritance_nodes()
+        self._resolve_all_unresolved_inheritance_nodes()
+
+    def _reregister_nodes(
+        self, nodes: List[TydCollection], replaced_nodes: List[TydCollection] = ()
+    ) -> None:
+        changed_nodes: Dict[str, TydCollection] = dict()
+        for node in nodes:
+            if node.attribute_handle is not None:
+                changed_nodes[node.attribute_handle] = node
+
+        # Replaced collections without a new version with their handle go away.
+        removed = list()
+        for node in replaced_nodes:
+            inheritance_node = self._nodes_by_id.get(id(node))
+            if inheritance_node is not None and (
+                node.attribute_handle is None
+                or node.attribute_handle not in changed_nodes
+            ):
+                removed.append(inheritance_node)
+
+        self._check_sources(changed_nodes, removed)
+
+        # Merges can still fail on the nodes themselves, the resolver is then
+        # put back as it was before the call.
+        checkpoint = self._checkpoint(nodes, changed_nodes, removed)
         try:
-            cls._link_all_inheritance_nodes()
+            self._replace_nodes(nodes, changed_nodes, removed)
+        except BaseException:
+            self._rollback(checkpoint, nodes)
+            raise
+
+    def _replace_nodes(
+        self,
+        nodes: List[TydCollection],
+        changed_nodes: Dict[str, TydCollection],
+        removed: List[InheritanceNode],
+    ) -> None:
+        for inheritance_node in removed:
+            self._unregister(inheritance_node)
+
+        for node in nodes:
+            if node.attribute_handle is None:
+                self.register(node)
+
+        changed = list()
+        for handle, node in changed_nodes.items():
+            inheritance_node = self._nodes_by_handle.get(handle)
+            if inheritance_node is None:
+                self.register(node)
+                continue
 
-        finally:
-            cls.reset()
+            if inheritance_node.source is not None:
+                # It is linked again to its source, which may have changed.
+                inheritance_node.source.remove_heir(inheritance_node)
+                inheritance_node.source = None
+            del self._nodes_by_id[id(inheritance_node.tyd_node)]
+            self._nodes_by_id[id(node)] = inheritance_node
+            inheritance_node.tyd_node = node
+            inheritance_node.original = None
+            inheritance_node.snapshot = None
+            changed.append(inheritance_node)
+
+        # Every heir is restored to its version before merging, then
+        # resolved again along with the collections changed.
+        affected = list(changed)
+        visited = set(map(id, changed))
+        for inheritance_node in affected:
+            for heir in inheritance_node.heirs or ():
+                if id(heir) not in visited:
+                    visited.add(id(heir))
+                    affected.append(heir)
+                    self._restore(heir)
+
+        for inheritance_node in affected:
+            inheritance_node.snapshot = None
+            if inheritance_node.resolved:
+                inheritance_node.resolved = False
+                self._unresolved_nodes.append(inheritance_node)
+
+        self.resolve_all()
+
+    def _checkpoint(
+        self,
+        nodes: List[TydCollection],
+        changed_nodes: Dict[str, TydCollection],
+        removed: List[InheritanceNode],
+    ) -> _Checkpoint:
+        # The nodes a reregistration can change: those it replaces or removes,
+        # their heirs, the nodes left unresolved, and the sources of them all.
+        touched = list()
+        visited = set()
+
+        def touch(inheritance_node: Optional[Inheritance.InheritanceNode]) -> None:
+            if inheritance_node is not None and id(inheritance_node) not in visited:
+                visited.add(id(inheritance_node))
+                touched.append(inheritance_node)
+
+        for inheritance_node in removed:
+            touch(inheritance_node)
+        for handle in changed_nodes:
+            touch(self._nodes_by_handle.get(handle))
+        for inheritance_node in self._unresolved_nodes:
+            touch(inheritance_node)
+        for inheritance_node in touched:
+            for heir in inheritance_node.heirs or ():
+                touch(heir)
+
+        tyd_nodes = nodes + [inheritance_node.tyd_node for inheritance_node in touched]
+        for inheritance_node in list(touched):
+            touch(inheritance_node.source)
+        for tyd_node in tyd_nodes:
+            touch(self._nodes_by_handle.get(tyd_node.attribute_source))
+
+        states = [
+            (
+                inheritance_node,
+                inheritance_node.tyd_node,
+                inheritance_node.resolved,
+                inheritance_node.source,
+                inheritance_node.original,
+                inheritance_node.snapshot,
+                list(inheritance_node.heirs or ()),
+                # Restoring an heir replaces its children by clones, the
+                # merged ones are kept to be put back.
+                list(inheritance_node.tyd_node.nodes)
+                if inheritance_node.original is not None
+                else None,
+            )
+            for inheritance_node in touched
+        ]
+        return _Checkpoint(states, list(self._unresolved_nodes))
+
+    def _rollback(self, checkpoint: _Checkpoint, nodes: List[TydCollection]) -> None:
+        for node in nodes:
+            inheritance_node = self._nodes_by_id.pop(id(node), None)
+            handle = node.attribute_handle
+            if (
+                inheritance_node is not None
+                and self._nodes_by_handle.get(handle) is inheritance_node
+            ):
+                del self._nodes_by_handle[handle]
+
+        for (
+            inheritance_node,
+            tyd_node,
+            resolved,
+            source,
+            original,
+            snapshot,
+            heirs,
+            children,
+        ) in checkpoint.states:
+            if children is not None:
+                tyd_node.nodes[:] = children
+                for node in children:
+                    node.parent = tyd_node
+            elif inheritance_node.original is not None and (
+                inheritance_node.tyd_node is tyd_node
+            ):
+                # The node was merged for the first time, into its own children.
+                self._restore(inheritance_node)
+
+            inheritance_node.tyd_node = tyd_node
+            inheritance_node.resolved = resolved
+            inheritance_node.source = source
+            inheritance_node.original = original
+            inheritance_node.snapshot = snapshot
+            inheritance_node.heirs = heirs or None
+            self._nodes_by_id[id(tyd_node)] = inheritance_node
+            if tyd_node.attribute_handle is not None:
+                self._nodes_by_handle[tyd_node.attribute_handle] = inheritance_node
+
+        self._unresolved_nodes[:] = checkpoint.unresolved_nodes
+
+    def _unregister(self, inheritance_node: InheritanceNode) -> None:
+        if inheritance_node.source is not None:
+            inheritance_node.source.remove_heir(inheritance_node)
+            inheritance_node.source = None
+        if inheritance_node in self._unresolved_nodes:
+            self._unresolved_nodes.remove(inheritance_node)
+
+        tyd_node = inheritance_node.tyd_node
+        del self._nodes_by_id[id(tyd_node)]
+        handle = tyd_node.attribute_handle
+        if self._nodes_by_handle.get(handle) is inheritance_node:
+            del self._nodes_by_handle[handle]
+
+    def _check_sources(
+        self,
+        changed_nodes: Dict[str, TydCollection],
+        removed: List[InheritanceNode] = (),
+    ) -> None:
+        removed_ids = set(map(id, removed))
+        removed_handles = {
+            inheritance_node.tyd_node.attribute_handle
+            for inheritance_node in removed
+            if inheritance_node.tyd_node.attribute_handle is not None
+        }
+
+        # Heirs left registered can't lose their source, unless they are
+        # reregistered too, with a source checked below.
+        for inheritance_node in removed:
+            for heir in inheritance_node.heirs or ():
+                if (
+                    id(heir) not in removed_ids
+                    and heir.tyd_node.attribute_handle not in changed_nodes
+                ):
+                    raise Exception(
+                        f"Tyd error: Could not find source node with handle "
+                        f"{inheritance_node.tyd_node.attribute_handle} for "
+                        f"{heir}."
+                    )
+
+        def source_of(handle: str) -> Optional[str]:
+            node = changed_nodes.get(handle)
+            if node is None:
+                node = self._nodes_by_handle[handle].tyd_node
+            return node.attribute_source
+
+        for handle, node in changed_nodes.items():
+            visited = {handle}
+            source = node.attribute_source
+            while source is not None:
+                if source not in changed_nodes and (
+                    source not in self._nodes_by_handle or source in removed_handles
+                ):
+                    raise Exception(
+                        f"Tyd error: Could not find source node with handle "
+                        f"{source} for {node}."
+                    )
+                if source in visited:
+                    raise Exception(
+                        f"Tyd error: Cyclic inheritance from {handle} to {source}."
+                    )
+                visited.add(source)
+                source = source_of(source)
+
+    @staticmethod
+    def _restore(inheritance_node: InheritanceNode) -> None:
+        if inheritance_node.original is None:
+            return
 
-    @classmethod
-    def _link_all_inheritance_nodes(cls):
-        for node in cls.unresolved_nodes:
+        tyd_node = inheritance_node.tyd_node
+        restored_nodes = [node.deep_clone() for node in inheritance_node.original]
+        tyd_node.nodes[:] = restored_nodes
+        for node in restored_nodes:
+            node.parent = tyd_node
+
+    def _link_all_inheritance_nodes(self) -> None:
+        links = list()
+        for node in self._unresolved_nodes:
             attribute_source = node.tyd_node.attribute_source
 
-            if attribute_source is None:
+            if attribute_source is None or node.source is not None:
                 continue
 
-            node.source
-
-            if cls.nodes_by_handle.get(attribute_source, None) is None:
-                raise Exception()
-
-            if node.source is not None:
-                node.source.add_heir(node)
-
-    @classmethod
-    def _resolve_all_unresolved_inheritance_nodes(cls):
-        roots = [
+            source = self._nodes_by_handle.get(attribute_source)
+            if source is None:
+                raise Exception(
+                    f"Tyd error: Could not find source node with handle "
+                    f"{attribute_source} for {node}."
+                )
+            links.append((node, source))
+
+        # Nodes are linked only once every source is found.
+        for node, source in links:
+            node.source = source
+            source.add_heir(node)
+
+    def _resolve_all_unresolved_inheritance_nodes(self) -> None:
+        # Kahn's algorithm: a node is ready once its source is resolved.
+        # Each node has at most one source, so every node is visited once.
+        ready = deque(
             node
-            for node in cls.unresolved_nodes
+            for node in self._unresolved_nodes
             if node.source is None or node.source.resolved
-        ]
+        )
+
+        while ready:
+            node = ready.popleft()
+            if node.source is not None:
+                if node.original is None:
+                    node.original = node.tyd_node.deep_clone()
+                if node.source.snapshot is None:
+                    node.source.snapshot = node.source.tyd_node.deep_clone()
+                self._apply_inheritance(node.source.snapshot, node.tyd_node)
+            node.resolved = True
 
-        for node in roots:
-            cls._resolve_inheritance_node_add_heirs(node)
+            for heir in node.heirs or ():
+                if not heir.resolved:
+                    ready.append(heir)
 
-        for node in cls.unresolved_nodes:
-            if not node.resolved:
-                raise Exception()
-            cls.resolved_nodes[node.tyd_node] = node
+        unresolved = [node for node in self._unresolved_nodes if not node.resolved]
+        self._unresolved_nodes.clear()
 
-        cls.unresolved_nodes.clear()
+        if unresolved:
+            handles = ", ".join(
+                str(node.tyd_node.attribute_handle or node.tyd_node.name)
+                for node in unresolved
+            )
+            raise Exception(f"Tyd error: Cyclic inheritance among {handles}.")
 
     @classmethod
-    def _resolve_inheritance_node_add_heirs(cls, node: InheritanceNode):
-        if node.source is None:
-            node.resolved = True
+    def _apply_inheritance(cls, source: TydNode, heir: TydNode) -> None:
+        # Each entry is a pair of a source and its heir still to merge.
+        stack = [(source, heir)]
 
-        else:
-            if not node.source.resolved:
-                raise Exception()
+        while stack:
+            source, heir = stack.pop()
 
-    @classmethod
-    def _apply_inheritance(cls, source: TydNode, heir: TydNode):
-        try:
-            if isinstance(source, TydString):
-                return
+            # Strings of the heir override the ones of the source.
+            if isinstance(source, TydString) or isinstance(heir, TydString):
+                continue
+
+            if heir.attribute_no_inherit:
+                continue
 
-            if isinstance(heir, TydCollection):
-                if heir.attribute_no_ingerit:
-                    return
+            if isinstance(source, TydTable) and isinstance(heir, TydTable):
+                cls._check_for_duplicate_nodes(source)
+                cls._check_for_duplicate_nodes(heir)
 
-            if isinstance(source, TydTable):
+                heir_nodes_by_name = heir._get_nodes_by_name()
+                inherited_nodes = list()
                 for child in source:
-                    heir_matching_child = heir[child.name]
-
+                    heir_matching_child = heir_nodes_by_name.get(child.name)
                     if heir_matching_child is not None:
-                        cls._apply_inheritance(child, heir_matching_child)
+                        stack.append((child, heir_matching_child))
                     else:
-                        heir.insert(child, 0)
-
-                return
+                        inherited_nodes.append(child.shared_clone())
 
-            if isinstance(source, TydList):
-                count = 0
-                for s in source:
-                    heir.insert(s, count)
-                    count += 1
-        except Exception:
-            raise Exception()
+                cls._prepend(heir, inherited_nodes)
+            elif isinstance(source, TydList) and isinstance(heir, TydList):
+                cls._prepend(heir, [child.shared_clone() for child in source])
+            else:
+                raise Exception(
+                    f"Tyd error: {type(heir).__name__} {heir.name} can't inherit "
+                    f"from {type(source).__name__} {source.name}."
+                )
+
+    @staticmethod
+    def _prepend(collection: TydCollection, nodes: List[TydNode]) -> None:
+        if not nodes:
+            return
 
-    temp_used_node_names: Set[str] = set()
+        # Splicing the list at once keeps a merge linear in the number of nodes.
+        collection.nodes[0:0] = nodes
+        for node in nodes:
+            node.parent = collection
 
-    @classmethod
-    def _check_for_duplicate_nodes(cls, original: TydCollection):
-        cls.temp_used_node_names.clear()
+    @staticmethod
+    def _check_for_duplicate_nodes(original: TydCollection) -> None:
+        used_node_names = set()
 
         for node in original:
-            if node.name is None:
+            name: Optional[str] = node.name
+            if name is None:
                 continue
 
-            if node.name in cls.temp_used_node_names:
-                raise Exception()
-
-            else:
-                cls.temp_used_node_names.add(node.name)
+            if name in used_node_names:
+                raise Exception(
+                    f"Tyd error: Duplicate Tyd node name {name} in {original}."
+                )
 
-        cls.temp_used_node_names.clear()
+            used_node_names.add(name)
@@ -2,6 +2,14 @@
 
 from .tyd_collection import TydCollection
 from .tyd_document import TydDocument
+from .tyd_frozen_document import (
+    TydFrozenCollection,
+    TydFrozenDocument,
+    TydFrozenList,
+    TydFrozenNode,
+    TydFrozenString,
+    TydFrozenTable,
+)
 from .tyd_list import TydList
 from .tyd_node import TydNode
 from .tyd_string import TydString
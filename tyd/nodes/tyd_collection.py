@@ -1,11 +1,99 @@
 from __future__ import annotations
 from abc import ABCMeta
-from typing import List, Optional
+from threading import RLock
+from typing import Callable, Dict, List, Optional
 
 from .tyd_node import TydNode
 
+# Deferred nodes are loaded under a lock, so that threads reading a shared
+# collection never see it half loaded. Loaders may load other collections.
+_NODES_LOADER_LOCK = RLock()
+
+
+def _loading(collection: TydCollection) -> None:
+    """Marks a collection whose nodes are being loaded."""
+
+
+class _NodeList(list):
+    """The nodes of a collection once returned by its nodes property.
+
+    Mutating the list in place drops the name index of the collection, so
+    lookups stay correct however long the caller keeps the list.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: TydCollection, nodes: List[TydNode]):
+        super().__init__(nodes)
+        self._owner = owner
+
+    def _changed(self) -> None:
+        self._owner._nodes_by_name = None
+
+    def __reduce__(self):
+        # Pickled as a plain list, the collection wraps it again when needed.
+        return list, (list(self),)
+
+    def __setitem__(self, key, value):
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._changed()
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self._changed()
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._changed()
+        return super().__imul__(other)
+
+    def append(self, node):
+        self._changed()
+        super().append(node)
+
+    def extend(self, nodes):
+        self._changed()
+        super().extend(nodes)
+
+    def insert(self, index, node):
+        self._changed()
+        super().insert(index, node)
+
+    def pop(self, index=-1):
+        self._changed()
+        return super().pop(index)
+
+    def remove(self, node):
+        self._changed()
+        super().remove(node)
+
+    def clear(self):
+        self._changed()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._changed()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._changed()
+        super().reverse()
+
 
 class TydCollection(TydNode, metaclass=ABCMeta):
+    __slots__ = (
+        "_nodes",
+        "_att_handle",
+        "_att_source",
+        "_att_abstract",
+        "_att_no_inherit",
+        "_nodes_loader",
+        "_nodes_by_name",
+    )
+
     def __init__(
         self, name: Optional[str], parent: Optional[TydNode], docline: int = -1
     ):
@@ -15,29 +103,52 @@ class TydCollection(TydNode, metaclass=ABCMeta):
         self._att_source = None
         self._att_abstract = False
         self._att_no_inherit = False
-        self._i = 0
+        self._nodes_loader = None
+        self._nodes_by_name = None
 
     @property
     def nodes(self) -> List[TydNode]:
+        # The list can be mutated in place by the caller, so it is replaced
+        # once by a list dropping the name index whenever it is mutated.
+        nodes = self._get_nodes()
+        if type(nodes) is not _NodeList:
+            with _NODES_LOADER_LOCK:
+                nodes = self._nodes
+                if type(nodes) is not _NodeList:
+                    nodes = self._nodes = _NodeList(self, nodes)
+        return nodes
+
+    def _get_nodes(self) -> List[TydNode]:
+        if self._nodes_loader is not None:
+            self._load_nodes()
         return self._nodes
 
+    def _get_nodes_by_name(self) -> Dict[Optional[str], TydNode]:
+        nodes_by_name = self._nodes_by_name
+        if nodes_by_name is None:
+            nodes_by_name = dict()
+            for node in reversed(self._get_nodes()):
+                nodes_by_name[node.name] = node
+            self._nodes_by_name = nodes_by_name
+        return nodes_by_name
+
     @property
-    def attribute_handle(self) -> str:
+    def attribute_handle(self) -> Optional[str]:
         return self._att_handle
 
     @attribute_handle.setter
-    def attribute_handle(self, value: str) -> None:
-        if not type(value) is str:
+    def attribute_handle(self, value: Optional[str]) -> None:
+        if value is not None and not type(value) is str:
             raise TypeError("A handle attribute must be string.")
         self._att_handle = value
 
     @property
-    def attribute_source(self) -> str:
+    def attribute_source(self) -> Optional[str]:
         return self._att_source
 
     @attribute_source.setter
-    def attribute_source(self, value: str) -> None:
-        if not type(value) is str:
+    def attribute_source(self, value: Optional[str]) -> None:
+        if value is not None and not type(value) is str:
             raise TypeError("A source attribute must be string.")
         self._att_source = value
 
@@ -57,7 +168,7 @@ class TydCollection(TydNode, metaclass=ABCMeta):
 
     @attribute_no_inherit.setter
     def attribute_no_inherit(self, value: bool) -> None:
-        if type(value) is bool:
+        if not type(value) is bool:
             raise TypeError("A noinherit attribute must be bool.")
         self._att_no_inherit = value
 
@@ -86,6 +197,75 @@ class TydCollection(TydNode, metaclass=ABCMeta):
         self.attribute_abstract = abstract
         self.attribute_no_inherit = no_inherit
 
+    def defer_nodes(self, loader: Callable[[TydCollection], None]) -> None:
+        """A function to make the nodes be loaded when they are first accessed.
+
+        Parameters
+        ----------
+        loader : Callable[[TydCollection], None]
+            A function adding the nodes to the collection passed.
+        """
+        self._nodes_loader = loader
+
+    def _load_nodes(self) -> None:
+        with _NODES_LOADER_LOCK:
+            loader = self._nodes_loader
+            if loader is None or loader is _loading:
+                # Loaded by another thread, or being loaded by this one.
+                return
+
+            self._nodes_loader = _loading
+            try:
+                loader(self)
+            except BaseException:
+                # The nodes added before the error are dropped, so that every
+                # access raises again instead of reading a part of them.
+                self._nodes = list()
+                self._nodes_by_name = None
+                self._nodes_loader = loader
+                raise
+            self._nodes_loader = None
+
+    def deep_clone(self) -> TydCollection:
+        clone = type(self)(self.name, None, self.docline)
+        clone.setup_attributes(
+            self._att_handle, self._att_source, self._att_abstract, self._att_no_inherit
+        )
+        for node in self._get_nodes():
+            clone.add(node.deep_clone())
+        return clone
+
+    def shared_clone(self) -> TydCollection:
+        clone = type(self)(self.name, None, self.docline)
+        clone.setup_attributes(
+            self._att_handle, self._att_source, self._att_abstract, self._att_no_inherit
+        )
+        clone.defer_nodes(self._add_shared_clones_to)
+        return clone
+
+    def _add_shared_clones_to(self, clone: TydCollection) -> None:
+        for node in self._get_nodes():
+            clone.add(node.shared_clone())
+
+    def select(self, path: str, index=None) -> list:
+        """Returns the nodes matched by a path query from the collection.
+
+        Parameters
+        ----------
+        path : str
+            A path query, see tyd.tyd_query for the syntax.
+        index : Optional[TydQueryIndex]
+            An index of the collection, by default None.
+
+        Returns
+        -------
+        list
+            The nodes matched.
+        """
+        from ..tyd_query import compile_selector
+
+        return compile_selector(path).select(self, index)
+
     def add(self, node: TydNode):
         """A function to add a node to the collection.
 
@@ -103,9 +283,15 @@ class TydCollection(TydNode, metaclass=ABCMeta):
             raise TypeError(
                 "Only subclass of the TydNode can be added to the collection."
             )
-        self._nodes.append(node)
+        if self._nodes_loader is not None:
+            self._load_nodes()
+        # The list is mutated as a plain list to keep the name index.
+        list.append(self._nodes, node)
         node.parent = self
 
+        if self._nodes_by_name is not None:
+            self._nodes_by_name.setdefault(node.name, node)
+
     def insert(self, index: int, node: TydNode):
         """A function to insert a node at the specified index of the collection.
 
@@ -127,17 +313,23 @@ class TydCollection(TydNode, metaclass=ABCMeta):
             raise TypeError(
                 "Only subclass of the TydNode can be added to the collection."
             )
-        self._nodes.insert(index, node)
+        if self._nodes_loader is not None:
+            self._load_nodes()
+        list.insert(self._nodes, index, node)
         node.parent = self
 
+        if self._nodes_by_name is not None:
+            if node.name in self._nodes_by_name:
+                # The first of the nodes with the same name may have changed.
+                self._nodes_by_name = None
+            else:
+                self._nodes_by_name[node.name] = node
+
     def __iter__(self):
-        return self._nodes.__iter__()
+        return self._get_nodes().__iter__()
 
     def __len__(self) -> int:
-        return len(self._nodes)
+        return len(self._get_nodes())
 
     def __getitem__(self, key: int) -> TydNode:
-        return self._nodes[key]
-
-    def __eq__(self, value: TydCollection) -> bool:
-        return super().__eq__(value) and self.nodes == value.nodes
+        return self._get_nodes()[key]
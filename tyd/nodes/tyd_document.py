@@ -6,6 +6,8 @@ from .tyd_list import TydList
 
 
 class TydDocument(TydTable):
+    __slots__ = ()
+
     def __init__(self, nodes: Union[TydDocument, TydList, TydTable] = None):
         super().__init__(None, None)
         if nodes is None:
@@ -13,3 +15,9 @@ class TydDocument(TydTable):
 
         for node in nodes:
             self.add(node)
+
+    def deep_clone(self) -> TydDocument:
+        return TydDocument(node.deep_clone() for node in self)
+
+    def shared_clone(self) -> TydDocument:
+        return TydDocument(node.shared_clone() for node in self)
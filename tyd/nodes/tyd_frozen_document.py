@@ -0,0 +1,394 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .tyd_collection import TydCollection
+from .tyd_document import TydDocument
+from .tyd_list import TydList
+from .tyd_node import TydNode
+from .tyd_string import TydString
+from .tyd_table import TydTable
+
+_KIND_STRING = 0
+_KIND_TABLE = 1
+_KIND_LIST = 2
+
+_FLAG_ABSTRACT = 1
+_FLAG_NO_INHERIT = 2
+
+# Tables with more children than this are looked up through a map of names.
+_CHILD_MAP_THRESHOLD = 8
+
+
+class TydFrozenNode:
+    """A read-only view of a node stored in a TydFrozenDocument."""
+
+    __slots__ = ("_doc", "_index")
+
+    def __init__(self, doc: TydFrozenDocument, index: int):
+        self._doc = doc
+        self._index = index
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._doc._string(self._doc._names[self._index])
+
+    @property
+    def parent(self) -> Optional[TydFrozenNode]:
+        parent = self._doc._parents[self._index]
+        return self._doc._view(parent) if parent >= 0 else None
+
+    @property
+    def docline(self) -> int:
+        return self._doc._doclines[self._index]
+
+    def thaw(self) -> TydNode:
+        """Returns a mutable copy of the node, without parent.
+
+        Returns
+        -------
+        TydNode
+            A node created.
+        """
+        return self._doc._thaw(self._index)
+
+    def to_tyd(self) -> str:
+        from ..tyd_to_text import write
+
+        return write(self.thaw())
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, TydFrozenNode):
+            return NotImplemented
+        return self._doc is value._doc and self._index == value._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._doc), self._index))
+
+
+class TydFrozenString(TydFrozenNode):
+    __slots__ = ()
+
+    @property
+    def value(self) -> Optional[str]:
+        return self._doc._string(self._doc._values[self._index])
+
+    def __str__(self) -> str:
+        value = "null" if self.value is None else f'"{self.value}"'
+        return f"{self.name}={value}"
+
+
+class TydFrozenCollection(TydFrozenNode):
+    __slots__ = ()
+
+    @property
+    def nodes(self) -> List[TydFrozenNode]:
+        return list(self)
+
+    @property
+    def attribute_handle(self) -> Optional[str]:
+        return self._doc._handles.get(self._index)
+
+    @property
+    def attribute_source(self) -> Optional[str]:
+        return self._doc._sources.get(self._index)
+
+    @property
+    def attribute_abstract(self) -> bool:
+        return bool(self._doc._flags[self._index] & _FLAG_ABSTRACT)
+
+    @property
+    def attribute_no_inherit(self) -> bool:
+        return bool(self._doc._flags[self._index] & _FLAG_NO_INHERIT)
+
+    def select(self, path: str, index=None) -> list:
+        """Returns the nodes matched by a path query from the collection.
+
+        Parameters
+        ----------
+        path : str
+            A path query, see tyd.tyd_query for the syntax.
+        index : Optional[TydQueryIndex]
+            An index of the collection, by default None.
+
+        Returns
+        -------
+        list
+            The nodes matched.
+        """
+        from ..tyd_query import compile_selector
+
+        return compile_selector(path).select(self, index)
+
+    def __iter__(self) -> Iterator[TydFrozenNode]:
+        doc = self._doc
+        start = doc._values[self._index]
+        return (doc._view(i) for i in range(start, start + doc._counts[self._index]))
+
+    def __len__(self) -> int:
+        return self._doc._counts[self._index]
+
+    def __getitem__(self, key: int) -> TydFrozenNode:
+        count = self._doc._counts[self._index]
+        if key < 0:
+            key += count
+        if not 0 <= key < count:
+            raise IndexError("list index out of range")
+        return self._doc._view(self._doc._values[self._index] + key)
+
+
+class TydFrozenList(TydFrozenCollection):
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.name} (TydFrozenList, {len(self)})"
+
+
+class TydFrozenTable(TydFrozenCollection):
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Optional[TydFrozenNode]:
+        index = self._doc._find_child(self._index, key)
+        return self._doc._view(index) if index >= 0 else None
+
+    def __contains__(self, key: str) -> bool:
+        return self._doc._find_child(self._index, key) >= 0
+
+    def __str__(self):
+        parent_name = self.parent.name if self.parent else "NullName"
+        return f'<TydFrozenTable name="{self.name}" parent=<{parent_name}>>'
+
+
+class TydFrozenDocument(TydFrozenTable):
+    """A read-only document stored in flat arrays instead of node objects.
+
+    Names and values are kept once in a string table and every node is a row
+    of integer arrays, with the children of a collection stored next to each
+    other. Nodes are read through lightweight views created on access, which
+    expose the same navigation API as TydTable, TydList and TydString.
+    The document is compact and pickles quickly, so it can be shared with
+    worker processes.
+    """
+
+    __slots__ = (
+        "_strings",
+        "_string_ids",
+        "_name_ids",
+        "_child_rows",
+        "_kinds",
+        "_names",
+        "_values",
+        "_counts",
+        "_parents",
+        "_doclines",
+        "_flags",
+        "_handles",
+        "_sources",
+    )
+
+    def __init__(
+        self, nodes: Union[TydDocument, TydList, TydTable, Iterable[TydNode]] = None
+    ):
+        super().__init__(self, 0)
+        self._strings: List[str] = list()
+        self._string_ids: Optional[Dict[str, int]] = dict()
+        self._name_ids: Optional[Dict[str, int]] = None
+        # The first row of each child name id, by row of large tables.
+        self._child_rows: Dict[int, Dict[int, int]] = dict()
+        self._kinds = array("b")
+        self._names = array("i")
+        self._values = array("i")
+        self._counts = array("i")
+        self._parents = array("i")
+        self._doclines = array("i")
+        self._flags = array("b")
+        self._handles: Dict[int, str] = dict()
+        self._sources: Dict[int, str] = dict()
+
+        roots = list(nodes) if nodes is not None else list()
+        self._append_row(_KIND_TABLE, None, -1, -1, -1)
+        self._values[0] = 1
+        self._counts[0] = len(roots)
+
+        # Breadth-first order keeps the children of a collection contiguous.
+        queue = deque((node, 0) for node in roots)
+        row = 1
+        next_child = 1 + len(roots)
+
+        while queue:
+            node, parent = queue.popleft()
+
+            if isinstance(node, TydString):
+                value = self._intern(node.value)
+                self._append_row(_KIND_STRING, node.name, value, parent, node.docline)
+            elif isinstance(node, TydCollection):
+                kind = _KIND_TABLE if isinstance(node, TydTable) else _KIND_LIST
+                self._append_row(kind, node.name, next_child, parent, node.docline)
+                self._counts[row] = len(node)
+                self._flags[row] = (
+                    _FLAG_ABSTRACT if node.attribute_abstract else 0
+                ) | (_FLAG_NO_INHERIT if node.attribute_no_inherit else 0)
+                if node.attribute_handle is not None:
+                    self._handles[row] = node.attribute_handle
+                if node.attribute_source is not None:
+                    self._sources[row] = node.attribute_source
+
+                next_child += len(node)
+                queue.extend((child, row) for child in node)
+            else:
+                raise TypeError("Only subclass of the TydNode can be frozen.")
+
+            row += 1
+
+        # Only names are looked up later, values don't need to stay indexed.
+        self._string_ids = None
+
+    def thaw(self) -> TydDocument:
+        """Returns a mutable TydDocument holding the same nodes.
+
+        Returns
+        -------
+        TydDocument
+            A document created.
+        """
+        return TydDocument(self._thaw(i) for i in range(1, 1 + self._counts[0]))
+
+    def _append_row(
+        self, kind: int, name: Optional[str], value: int, parent: int, docline: int
+    ) -> None:
+        self._kinds.append(kind)
+        self._names.append(self._intern(name))
+        self._values.append(value)
+        self._counts.append(0)
+        self._parents.append(parent)
+        self._doclines.append(docline)
+        self._flags.append(0)
+
+    def _intern(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+
+        string_id = self._string_ids.get(s)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(s)
+            self._string_ids[s] = string_id
+        return string_id
+
+    def _get_name_ids(self) -> Dict[str, int]:
+        if self._name_ids is None:
+            self._name_ids = {self._strings[i]: i for i in set(self._names) if i >= 0}
+        return self._name_ids
+
+    def _string(self, string_id: int) -> Optional[str]:
+        return self._strings[string_id] if string_id >= 0 else None
+
+    def _view(self, index: int) -> TydFrozenNode:
+        if index == 0:
+            return self
+        kind = self._kinds[index]
+        if kind == _KIND_STRING:
+            return TydFrozenString(self, index)
+        elif kind == _KIND_TABLE:
+            return TydFrozenTable(self, index)
+        else:
+            return TydFrozenList(self, index)
+
+    def _find_child(self, index: int, name: Optional[str]) -> int:
+        if name is None:
+            name_id = -1
+        else:
+            name_id = self._get_name_ids().get(name)
+            if name_id is None:
+                return -1
+
+        count = self._counts[index]
+        if count > _CHILD_MAP_THRESHOLD:
+            return self._get_child_rows(index).get(name_id, -1)
+
+        names = self._names
+        start = self._values[index]
+        for row in range(start, start + count):
+            if names[row] == name_id:
+                return row
+        return -1
+
+    def _get_child_rows(self, index: int) -> Dict[int, int]:
+        child_rows = self._child_rows.get(index)
+        if child_rows is None:
+            start = self._values[index]
+            child_rows = dict()
+            # Reversed, so the first child of duplicated names is kept.
+            for row in range(start + self._counts[index] - 1, start - 1, -1):
+                child_rows[self._names[row]] = row
+            self._child_rows[index] = child_rows
+        return child_rows
+
+    def _thaw(self, index: int) -> TydNode:
+        name = self._string(self._names[index])
+        kind = self._kinds[index]
+
+        if kind == _KIND_STRING:
+            return TydString(
+                name, self._string(self._values[index]), None, self._doclines[index]
+            )
+
+        if kind == _KIND_TABLE:
+            node = TydTable(name, None, self._doclines[index])
+        else:
+            node = TydList(name, None, self._doclines[index])
+        node.setup_attributes(
+            self._handles.get(index),
+            self._sources.get(index),
+            bool(self._flags[index] & _FLAG_ABSTRACT),
+            bool(self._flags[index] & _FLAG_NO_INHERIT),
+        )
+
+        start = self._values[index]
+        for i in range(start, start + self._counts[index]):
+            node.add(self._thaw(i))
+
+        return node
+
+    def __getstate__(self):
+        return (
+            self._strings,
+            self._kinds,
+            self._names,
+            self._values,
+            self._counts,
+            self._parents,
+            self._doclines,
+            self._flags,
+            self._handles,
+            self._sources,
+        )
+
+    def __setstate__(self, state) -> None:
+        (
+            self._strings,
+            self._kinds,
+            self._names,
+            self._values,
+            self._counts,
+            self._parents,
+            self._doclines,
+            self._flags,
+            self._handles,
+            self._sources,
+        ) = state
+        self._doc = self
+        self._index = 0
+        self._string_ids = None
+        self._name_ids = None
+        self._child_rows = dict()
+
+    def __eq__(self, value: object) -> bool:
+        return self is value
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __str__(self):
+        return f"<TydFrozenDocument nodes={len(self._kinds)}>"
@@ -1,6 +1,81 @@
+from array import array
+from typing import List
+
 from .tyd_collection import TydCollection
+from .tyd_string import TydString
 
 
 class TydList(TydCollection):
+    __slots__ = ()
+
+    def to_array(self, typecode: str = "d") -> array:
+        """Returns the values of the list parsed into an array in one step.
+
+        Parameters
+        ----------
+        typecode : str
+            A typecode of the array module, by default "d". Values are parsed
+            as floats for "f" and "d", and as ints otherwise.
+
+        Returns
+        -------
+        array
+            An array of the values.
+
+        Raises
+        ------
+        ValueError
+            Raise when an item isn't a string, is null or can't be parsed.
+        """
+        parse = float if typecode in ("f", "d") else int
+        try:
+            return array(typecode, [parse(node.value) for node in self._get_nodes()])
+        except (AttributeError, TypeError):
+            # Collections have no value, and null values are None.
+            raise ValueError(f"Tyd error: Expected a value in {self.name}.") from None
+
+    def to_numpy(self, dtype: str = "float64"):
+        """Returns the values of the list parsed into a NumPy array.
+
+        The strings are parsed by NumPy in one vectorised conversion.
+
+        Parameters
+        ----------
+        dtype : str
+            A numeric NumPy dtype, by default "float64".
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of the values.
+
+        Raises
+        ------
+        ImportError
+            Raise when NumPy isn't installed.
+        ValueError
+            Raise when an item isn't a string, is null or can't be parsed.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "to_numpy requires NumPy, install it or use to_array instead."
+            ) from None
+
+        values = self._string_values()
+        if not values:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.array(values).astype(dtype)
+
+    def _string_values(self) -> List[str]:
+        values = list()
+        for node in self._get_nodes():
+            value = node.value if isinstance(node, TydString) else None
+            if value is None:
+                raise ValueError(f"Tyd error: Expected a value in {self.name}.")
+            values.append(value)
+        return values
+
     def __str__(self):
         return f"{self.name} (TydList, {len(self)})"
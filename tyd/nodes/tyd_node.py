@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from abc import ABCMeta
+from abc import ABCMeta, abstractmethod
 from typing import Optional
 
 
 class TydNode(metaclass=ABCMeta):
+    __slots__ = ("_name", "_parent", "docline", "docindexend")
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -33,10 +35,57 @@ class TydNode(metaclass=ABCMeta):
     def name(self) -> Optional[str]:
         return self._name
 
+    @abstractmethod
+    def deep_clone(self) -> TydNode:
+        """Returns a copy of the node and its descendants, without parent.
+
+        Returns
+        -------
+        TydNode
+            A node created.
+        """
+
+    @abstractmethod
+    def shared_clone(self) -> TydNode:
+        """Returns a copy of the node, without parent, which shares the
+        descendants of the node until they are accessed.
+
+        The children of a collection copied this way are copied from the node
+        when they are first accessed, one level at a time, so unvisited
+        subtrees aren't duplicated. The node must not be mutated afterwards.
+
+        Returns
+        -------
+        TydNode
+            A node created.
+        """
+
     def to_tyd(self):
         from ..tyd_to_text import write
 
         return write(self)
 
+    def structural_hash(self) -> int:
+        """Returns a hash of the names, values and attributes of the node.
+
+        Nodes are mutable and stay unhashable, this is to key them by content
+        explicitly. Nodes equal to each other have the same structural hash.
+
+        Returns
+        -------
+        int
+            A hash of the node.
+        """
+        from .tyd_structure import structural_hash
+
+        return structural_hash(self)
+
     def __eq__(self, value: TydNode) -> bool:
-        return self.name == value.name and self.parent == value.parent
+        if not isinstance(value, TydNode):
+            return NotImplemented
+
+        from .tyd_structure import structural_equals
+
+        return structural_equals(self, value)
+
+    __hash__ = None
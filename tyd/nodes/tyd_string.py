@@ -1,10 +1,16 @@
 from __future__ import annotations
-from typing import Optional
+from enum import Enum
+from typing import Callable, Optional, Type, TypeVar
 
+from ..utils import parse_bool, parse_enum
 from .tyd_node import TydNode
 
+E = TypeVar("E", bound=Enum)
+
 
 class TydString(TydNode):
+    __slots__ = ("_value", "_value_loader", "_decoded")
+
     def __init__(
         self,
         name: Optional[str],
@@ -15,18 +21,129 @@ class TydString(TydNode):
         super().__init__(name, parent, docline)
 
         self._value = value
+        self._value_loader = None
+        # The last decoded value, as a (type, value) tuple replaced at once so
+        # that threads never see the value of another type.
+        self._decoded = None
 
     @property
     def value(self) -> Optional[str]:
+        loader = self._value_loader
+        if loader is not None:
+            # Threads may load the value concurrently, which gives equal values.
+            self._value = loader()
+            self._value_loader = None
         return self._value
 
     @value.setter
     def value(self, value: Optional[str]):
         self._value = str(value)
+        self._value_loader = None
+        self._decoded = None
+
+    def defer_value(self, loader: Callable[[], Optional[str]]) -> None:
+        """A function to make the value be loaded when it is first read.
+
+        Parameters
+        ----------
+        loader : Callable[[], Optional[str]]
+            A function returning the value.
+        """
+        self._value_loader = loader
+        self._decoded = None
+
+    def as_int(self) -> int:
+        """Returns the value as an int, parsed once and cached on the node.
+
+        Returns
+        -------
+        int
+            The value parsed.
+
+        Raises
+        ------
+        ValueError
+            Raise when the value is null or isn't an int.
+        """
+        decoded = self._decoded
+        if decoded is not None and decoded[0] is int:
+            return decoded[1]
+        return self._decode(int, int)
+
+    def as_float(self) -> float:
+        """Returns the value as a float, parsed once and cached on the node.
+
+        Returns
+        -------
+        float
+            The value parsed.
+
+        Raises
+        ------
+        ValueError
+            Raise when the value is null or isn't a float.
+        """
+        decoded = self._decoded
+        if decoded is not None and decoded[0] is float:
+            return decoded[1]
+        return self._decode(float, float)
+
+    def as_bool(self) -> bool:
+        """Returns the value as a bool, parsed once and cached on the node.
+
+        Returns
+        -------
+        bool
+            True for "true" and False for "false", in any case.
+
+        Raises
+        ------
+        ValueError
+            Raise when the value is null or isn't a bool.
+        """
+        decoded = self._decoded
+        if decoded is not None and decoded[0] is bool:
+            return decoded[1]
+        return self._decode(bool, parse_bool)
+
+    def as_enum(self, enum_type: Type[E]) -> E:
+        """Returns the member of an enum named by the value, looked up once and
+        cached on the node.
+
+        Parameters
+        ----------
+        enum_type : Type[E]
+            An enum whose member is looked up by name, or else by value.
+
+        Returns
+        -------
+        E
+            The member found.
+
+        Raises
+        ------
+        ValueError
+            Raise when the value is null or isn't a member of the enum.
+        """
+        decoded = self._decoded
+        if decoded is not None and decoded[0] is enum_type:
+            return decoded[1]
+        return self._decode(enum_type, lambda value: parse_enum(enum_type, value))
+
+    def _decode(self, kind: type, parse: Callable[[str], object]):
+        value = self.value
+        if value is None:
+            raise ValueError(f"Tyd error: {self.name} is null.")
+        result = parse(value)
+        self._decoded = (kind, result)
+        return result
+
+    def deep_clone(self) -> TydString:
+        return TydString(self.name, self.value, None, self.docline)
+
+    def shared_clone(self) -> TydString:
+        return self.deep_clone()
 
     def __str__(self) -> str:
         value = "null" if self.value is None else f'"{self.value}"'
         return f"{self.name}={value}"
-
-    def __eq__(self, value: TydString) -> bool:
-        return super().__eq__(value) and self.value == value.value
@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Tuple
+
+from .tyd_collection import TydCollection
+from .tyd_list import TydList
+from .tyd_node import TydNode
+from .tyd_string import TydString
+from .tyd_table import TydTable
+
+_KIND_STRING = 0
+_KIND_TABLE = 1
+_KIND_LIST = 2
+
+
+def structural_equals(a: TydNode, b: TydNode) -> bool:
+    """Returns whether two nodes hold the same names, values and attributes.
+
+    Tables are compared as maps keyed by name and lists by order.
+    Parents, doclines and positions in the text are ignored.
+    The trees are walked once with an explicit stack.
+
+    Parameters
+    ----------
+    a : TydNode
+        A node to compare.
+    b : TydNode
+        A node to compare.
+
+    Returns
+    -------
+    bool
+        Whether the nodes are structurally equal.
+    """
+    stack = [(a, b)]
+
+    while stack:
+        x, y = stack.pop()
+
+        if x is y:
+            continue
+
+        kind = _kind_of(x)
+        if kind != _kind_of(y) or x.name != y.name:
+            return False
+
+        if kind == _KIND_STRING:
+            if x.value != y.value:
+                return False
+            continue
+
+        if (
+            len(x) != len(y)
+            or x.attribute_handle != y.attribute_handle
+            or x.attribute_source != y.attribute_source
+            or x.attribute_abstract != y.attribute_abstract
+            or x.attribute_no_inherit != y.attribute_no_inherit
+        ):
+            return False
+
+        if kind == _KIND_LIST:
+            stack.extend(zip(x, y))
+            continue
+
+        x_nodes_by_name = x._get_nodes_by_name()
+        y_nodes_by_name = y._get_nodes_by_name()
+
+        if len(x_nodes_by_name) == len(x) and len(y_nodes_by_name) == len(y):
+            # No duplicated names, the name indexes hold every child.
+            for name, x_node in x_nodes_by_name.items():
+                y_node = y_nodes_by_name.get(name)
+                if y_node is None:
+                    return False
+                stack.append((x_node, y_node))
+            continue
+
+        x_groups = _groups_by_name(x)
+        y_groups = _groups_by_name(y)
+        if x_groups.keys() != y_groups.keys():
+            return False
+
+        for name, x_nodes in x_groups.items():
+            y_nodes = y_groups[name]
+            if len(x_nodes) != len(y_nodes):
+                return False
+            stack.extend(zip(x_nodes, y_nodes))
+
+    return True
+
+
+def structural_hash(node: TydNode) -> int:
+    """Returns a hash consistent with structural_equals.
+
+    Parameters
+    ----------
+    node : TydNode
+        A node to hash.
+
+    Returns
+    -------
+    int
+        A hash of the node.
+    """
+    hashes: List[int] = list()
+    stack: List[Tuple[TydNode, bool]] = [(node, False)]
+
+    while stack:
+        current, children_hashed = stack.pop()
+        kind = _kind_of(current)
+
+        if kind == _KIND_STRING:
+            hashes.append(hash((kind, current.name, current.value)))
+            continue
+
+        if not children_hashed:
+            stack.append((current, True))
+            children = current._get_nodes()
+            stack.extend((child, False) for child in reversed(children))
+            continue
+
+        count = len(current)
+        child_hashes = hashes[len(hashes) - count :]
+        del hashes[len(hashes) - count :]
+
+        if kind == _KIND_LIST:
+            children = tuple(child_hashes)
+        else:
+            groups: Dict[Optional[str], List[int]] = dict()
+            for child, child_hash in zip(current, child_hashes):
+                groups.setdefault(child.name, list()).append(child_hash)
+            children = frozenset((name, tuple(h)) for name, h in groups.items())
+
+        hashes.append(
+            hash(
+                (
+                    kind,
+                    current.name,
+                    current.attribute_handle,
+                    current.attribute_source,
+                    current.attribute_abstract,
+                    current.attribute_no_inherit,
+                    children,
+                )
+            )
+        )
+
+    return hashes[0]
+
+
+def _kind_of(node: TydNode) -> int:
+    if isinstance(node, TydString):
+        return _KIND_STRING
+    elif isinstance(node, TydTable):
+        return _KIND_TABLE
+    elif isinstance(node, TydList):
+        return _KIND_LIST
+    else:
+        raise TypeError(f"Unknown node type: {type(node).__name__}")
+
+
+def _groups_by_name(table: TydCollection) -> Dict[Optional[str], List[TydNode]]:
+    groups: Dict[Optional[str], List[TydNode]] = dict()
+    for node in table:
+        groups.setdefault(node.name, list()).append(node)
+    return groups
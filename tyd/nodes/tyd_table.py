@@ -1,26 +1,20 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Union
 
 from .tyd_collection import TydCollection
 from .tyd_node import TydNode
 
 
 class TydTable(TydCollection):
+    __slots__ = ()
+
     def __getitem__(self, key: str) -> Optional[TydNode]:
-        for node in self:
-            if node.name == key:
-                return node
-        return None
+        return self._get_nodes_by_name().get(key)
+
+    def __contains__(self, key: Union[str, TydNode]) -> bool:
+        if isinstance(key, TydNode):
+            return key in self._get_nodes()
+        return key in self._get_nodes_by_name()
 
     def __str__(self):
         return f'<TydTable name="{self.name}" parent=<{self.parent.name if self.parent else "NullName"}>>'
-
-    def __eq__(self, value: TydTable):
-        flag = True
-
-        for node in value:
-            if node not in self.nodes:
-                flag = False
-                break
-
-        return super().__eq__(value) and flag
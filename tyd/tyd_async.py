@@ -0,0 +1,215 @@
+from __future__ import annotations
+from asyncio import Semaphore, gather, get_running_loop
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .nodes import TydDocument, TydFrozenDocument
+from .tyd_cache import TydCache
+from .tyd_file import (
+    DirectoryLoadResult,
+    TydFile,
+    _from_file_cached,
+    _parse_contents,
+    _read_bytes,
+    _read_contents,
+    from_document,
+)
+
+
+async def from_file_async(
+    file_path: str,
+    lazy: bool = False,
+    cache: Optional[TydCache] = None,
+    executor: Optional[Executor] = None,
+    mmap: bool = False,
+) -> TydFile:
+    """Returns TydFile object created from a file, without blocking the event loop.
+
+    The file is read and decoded in the default executor of the event loop
+    and parsed in the executor passed. With a ProcessPoolExecutor, parsing
+    doesn't hold the GIL of the event loop's process, which keeps the
+    latency of other tasks low while large files are loaded.
+
+    Parameters
+    ----------
+    file_path : str
+        A string representing filepath.
+    lazy : bool
+        Whether to parse the children of collections when they are first
+        accessed, by default False. Ignored when parsing in other processes.
+    cache : Optional[TydCache]
+        A cache used as from_file does, by default None.
+    executor : Optional[Executor]
+        An executor to parse the file in, by default the default executor of
+        the event loop.
+    mmap : bool
+        Whether to memory-map the file and parse its bytes as from_file does,
+        by default False. Ignored when parsing in other processes.
+
+    Returns
+    -------
+    TydFile
+        A TydFile created.
+    """
+    loop = get_running_loop()
+    in_processes = isinstance(executor, ProcessPoolExecutor)
+    # Maps can't be sent to other processes.
+    mmap = mmap and not in_processes
+
+    try:
+        if cache is not None and in_processes:
+            # Nor can the cache, it is read and written here and only the
+            # file is parsed in the pool.
+            tyd_doc = await loop.run_in_executor(None, cache.get, file_path)
+            if tyd_doc is None:
+                read_contents, file_stat = await loop.run_in_executor(
+                    None, _read_bytes, file_path
+                )
+                tyd_doc = await _load_in_processes(
+                    executor, partial(_parse_contents, read_contents, False)
+                )
+                await loop.run_in_executor(
+                    None,
+                    partial(
+                        cache.put,
+                        file_path,
+                        tyd_doc,
+                        read_contents,
+                        file_stat.st_size,
+                        file_stat.st_mtime_ns,
+                    ),
+                )
+        else:
+            if cache is not None:
+                load = partial(_load_cached_document, file_path, cache)
+            else:
+                read_contents = await loop.run_in_executor(
+                    None, _read_contents, file_path, mmap
+                )
+                load = partial(_parse_contents, read_contents, lazy)
+
+            if in_processes:
+                tyd_doc = await _load_in_processes(executor, load)
+            else:
+                tyd_doc = await loop.run_in_executor(executor, load)
+    except Exception as e:
+        raise Exception(f"Exception loading {file_path}: {e}")
+
+    return from_document(tyd_doc, file_path)
+
+
+async def load_files_async(
+    file_paths: Iterable[str],
+    concurrency: int = 8,
+    lazy: bool = False,
+    cache: Optional[TydCache] = None,
+    executor: Optional[Executor] = None,
+    mmap: bool = False,
+) -> DirectoryLoadResult:
+    """Returns TydFile objects created from files, without blocking the event loop.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str]
+        Strings representing the paths of the files.
+    concurrency : int
+        A maximum number of files being loaded at the same time, by default 8.
+    lazy : bool
+        Passed to from_file_async, by default False.
+    cache : Optional[TydCache]
+        Passed to from_file_async, by default None.
+    executor : Optional[Executor]
+        Passed to from_file_async, by default None.
+    mmap : bool
+        Passed to from_file_async, by default False.
+
+    Returns
+    -------
+    DirectoryLoadResult
+        A named tuple of the files loaded, in the order of the paths, and a
+        dict mapping the path of each file which couldn't be loaded to its
+        exception.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be 1 or more.")
+
+    file_paths = list(file_paths)
+    semaphore = Semaphore(concurrency)
+
+    async def load(file_path: str) -> TydFile:
+        async with semaphore:
+            return await from_file_async(file_path, lazy, cache, executor, mmap)
+
+    results = await gather(*map(load, file_paths), return_exceptions=True)
+
+    files = list()
+    errors = dict()
+    for file_path, result in zip(file_paths, results):
+        if isinstance(result, Exception):
+            errors[file_path] = result
+        else:
+            files.append(result)
+
+    return DirectoryLoadResult(files, errors)
+
+
+async def load_directory_async(
+    path: str,
+    pattern: str = "*.tyd",
+    concurrency: int = 8,
+    lazy: bool = False,
+    cache: Optional[TydCache] = None,
+    executor: Optional[Executor] = None,
+    mmap: bool = False,
+) -> DirectoryLoadResult:
+    """Returns TydFile objects created from the files matching a pattern,
+    without blocking the event loop.
+
+    Parameters
+    ----------
+    path : str
+        A string representing the directory path.
+    pattern : str
+        A glob pattern of the files to load, relative to the directory,
+        by default "*.tyd".
+    concurrency : int
+        Passed to load_files_async, by default 8.
+    lazy : bool
+        Passed to from_file_async, by default False.
+    cache : Optional[TydCache]
+        Passed to from_file_async, by default None.
+    executor : Optional[Executor]
+        Passed to from_file_async, by default None.
+    mmap : bool
+        Passed to from_file_async, by default False.
+
+    Returns
+    -------
+    DirectoryLoadResult
+        A named tuple of the files loaded, sorted by path, and a dict mapping
+        the path of each file which couldn't be loaded to its exception.
+    """
+    loop = get_running_loop()
+    file_paths = await loop.run_in_executor(None, _glob_files, path, pattern)
+    return await load_files_async(file_paths, concurrency, lazy, cache, executor, mmap)
+
+
+def _glob_files(path: str, pattern: str):
+    return sorted(str(p) for p in Path(path).glob(pattern) if p.is_file())
+
+
+def _load_cached_document(file_path: str, cache: TydCache) -> TydDocument:
+    return _from_file_cached(file_path, cache).document
+
+
+async def _load_in_processes(executor: ProcessPoolExecutor, load) -> TydDocument:
+    # Documents are sent back frozen and thawed off the event loop.
+    loop = get_running_loop()
+    frozen_doc = await loop.run_in_executor(executor, partial(_freeze_document, load))
+    return await loop.run_in_executor(None, frozen_doc.thaw)
+
+
+def _freeze_document(load) -> TydFrozenDocument:
+    return TydFrozenDocument(load())
@@ -0,0 +1,283 @@
+"""A compact binary encoding of tyd documents.
+
+The encoding is laid out as follows, where varint is an unsigned LEB128
+integer and all strings are encoded in UTF-8.
+
+    magic       4 bytes, b"TYDB"
+    version     1 byte, currently 1
+    strings     varint count, then each string as varint length and bytes
+    roots       varint count, then each root node
+
+Names, values, handles and sources are stored once in the string table and
+referred to by their index in it. A node is stored in pre-order as
+
+    tag         1 byte
+    name        varint string index, if the tag has TAG_NAME
+    docline     varint, zigzag encoded difference from the docline of the
+                previous node, or from 0 for the first node
+
+followed for a string by
+
+    value       varint string index, if the tag has TAG_VALUE
+
+and for a table or a list by
+
+    handle      varint string index, if the tag has TAG_HANDLE
+    source      varint string index, if the tag has TAG_SOURCE
+    children    varint count, then each child node
+
+The low two bits of the tag hold the kind of the node (0 string, 1 table,
+2 list), bit 2 is TAG_NAME, and the upper bits are flags whose meaning depends
+on the kind: bit 3 is TAG_VALUE for strings and TAG_ABSTRACT for collections,
+bit 4 TAG_NO_INHERIT, bit 5 TAG_HANDLE and bit 6 TAG_SOURCE.
+"""
+from typing import Dict, Iterable, List, Optional, Union
+
+from .nodes import TydCollection, TydDocument, TydList, TydNode, TydString, TydTable
+
+BINARY_MAGIC = b"TYDB"
+BINARY_VERSION = 1
+
+_KIND_MASK = 0x03
+_KIND_STRING = 0
+_KIND_TABLE = 1
+_KIND_LIST = 2
+
+_TAG_NAME = 0x04
+_TAG_VALUE = 0x08
+_TAG_ABSTRACT = 0x08
+_TAG_NO_INHERIT = 0x10
+_TAG_HANDLE = 0x20
+_TAG_SOURCE = 0x40
+
+
+def dump_binary(nodes: Union[TydDocument, Iterable[TydNode]]) -> bytes:
+    """Returns the binary encoding of nodes.
+
+    Parameters
+    ----------
+    nodes : Union[TydDocument, Iterable[TydNode]]
+        A document or nodes to encode as the roots.
+
+    Returns
+    -------
+    bytes
+        The encoded nodes, which load_binary reads back.
+
+    Raises
+    ------
+    TypeError
+        Raise when other than TydNode passed.
+    """
+    string_ids: Dict[str, int] = dict()
+    body = bytearray()
+    roots = list(nodes)
+    _write_varint(body, len(roots))
+
+    # Each entry is a node still to write, children are pushed in reverse
+    # so that they are popped in order.
+    stack: List[TydNode] = roots[::-1]
+    last_docline = 0
+
+    while stack:
+        node = stack.pop()
+        name = node.name
+        tag = _TAG_NAME if name is not None else 0
+
+        if isinstance(node, TydString):
+            value = node.value
+            if value is not None:
+                tag |= _TAG_VALUE
+            body.append(tag | _KIND_STRING)
+            if name is not None:
+                _write_varint(body, _string_id(string_ids, name))
+            _write_varint(body, _zigzag(node.docline - last_docline))
+            last_docline = node.docline
+            if value is not None:
+                _write_varint(body, _string_id(string_ids, value))
+        elif isinstance(node, TydCollection):
+            handle = node.attribute_handle
+            source = node.attribute_source
+            if node.attribute_abstract:
+                tag |= _TAG_ABSTRACT
+            if node.attribute_no_inherit:
+                tag |= _TAG_NO_INHERIT
+            if handle is not None:
+                tag |= _TAG_HANDLE
+            if source is not None:
+                tag |= _TAG_SOURCE
+            tag |= _KIND_TABLE if isinstance(node, TydTable) else _KIND_LIST
+            body.append(tag)
+            if name is not None:
+                _write_varint(body, _string_id(string_ids, name))
+            _write_varint(body, _zigzag(node.docline - last_docline))
+            last_docline = node.docline
+            if handle is not None:
+                _write_varint(body, _string_id(string_ids, handle))
+            if source is not None:
+                _write_varint(body, _string_id(string_ids, source))
+
+            children = node._get_nodes()
+            _write_varint(body, len(children))
+            stack.extend(reversed(children))
+        else:
+            raise TypeError("Only subclass of the TydNode can be encoded.")
+
+    out = bytearray(BINARY_MAGIC)
+    out.append(BINARY_VERSION)
+    _write_varint(out, len(string_ids))
+    for s in string_ids:
+        encoded = s.encode("utf-8")
+        _write_varint(out, len(encoded))
+        out += encoded
+    out += body
+    return bytes(out)
+
+
+def load_binary(data: Union[bytes, bytearray, memoryview]) -> TydDocument:
+    """Returns a TydDocument decoded from the binary encoding.
+
+    Parameters
+    ----------
+    data : Union[bytes, bytearray, memoryview]
+        The bytes written by dump_binary.
+
+    Returns
+    -------
+    TydDocument
+        A document holding the decoded nodes.
+
+    Raises
+    ------
+    Exception
+        Raise when the data isn't a valid binary encoding of this version.
+    """
+    data = bytes(data)
+    if data[: len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise Exception("The data isn't a binary tyd encoding.")
+    if len(data) <= len(BINARY_MAGIC) or data[len(BINARY_MAGIC)] != BINARY_VERSION:
+        raise Exception("Unsupported binary tyd encoding version.")
+
+    try:
+        return _load_nodes(data, len(BINARY_MAGIC) + 1)
+    except (IndexError, UnicodeDecodeError) as e:
+        raise Exception(f"Truncated or corrupt binary tyd encoding: {e}")
+
+
+def _load_nodes(data: bytes, p: int) -> TydDocument:
+    strings: List[Optional[str]] = list()
+    count, p = _read_varint(data, p)
+    for _ in range(count):
+        length, p = _read_varint(data, p)
+        end = p + length
+        if end > len(data):
+            raise IndexError("string out of range")
+        strings.append(data[p:end].decode("utf-8"))
+        p = end
+
+    doc = TydDocument()
+    remaining, p = _read_varint(data, p)
+    docline = 0
+    # Each entry is a collection and the number of its children still to read.
+    stack = [[doc, remaining]]
+
+    # The varint reads of the loop are inlined for the common single byte case.
+    while stack:
+        top = stack[-1]
+        if top[1] == 0:
+            stack.pop()
+            continue
+        top[1] -= 1
+        parent = top[0]
+
+        tag = data[p]
+        p += 1
+
+        name = None
+        if tag & _TAG_NAME:
+            i = data[p]
+            p += 1
+            if i >= 0x80:
+                i, p = _read_varint(data, p - 1)
+            name = strings[i]
+
+        z = data[p]
+        p += 1
+        if z >= 0x80:
+            z, p = _read_varint(data, p - 1)
+        docline += z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+        kind = tag & _KIND_MASK
+
+        if kind == _KIND_STRING:
+            value = None
+            if tag & _TAG_VALUE:
+                i = data[p]
+                p += 1
+                if i >= 0x80:
+                    i, p = _read_varint(data, p - 1)
+                value = strings[i]
+            parent.add(TydString(name, value, parent, docline))
+            continue
+
+        if kind == _KIND_TABLE:
+            node = TydTable(name, parent, docline)
+        elif kind == _KIND_LIST:
+            node = TydList(name, parent, docline)
+        else:
+            raise Exception(f"Unknown node kind {kind} in binary tyd encoding.")
+
+        handle = None
+        source = None
+        if tag & _TAG_HANDLE:
+            i, p = _read_varint(data, p)
+            handle = strings[i]
+        if tag & _TAG_SOURCE:
+            i, p = _read_varint(data, p)
+            source = strings[i]
+        node.setup_attributes(
+            handle, source, bool(tag & _TAG_ABSTRACT), bool(tag & _TAG_NO_INHERIT)
+        )
+        parent.add(node)
+
+        count = data[p]
+        p += 1
+        if count >= 0x80:
+            count, p = _read_varint(data, p - 1)
+        stack.append([node, count])
+
+    if p != len(data):
+        raise Exception("Unexpected trailing data in binary tyd encoding.")
+
+    return doc
+
+
+def _string_id(string_ids: Dict[str, int], s: str) -> int:
+    string_id = string_ids.get(s)
+    if string_id is None:
+        string_id = len(string_ids)
+        string_ids[s] = string_id
+    return string_id
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data: bytes, p: int):
+    result = 0
+    shift = 0
+    while True:
+        b = data[p]
+        p += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, p
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else (-n << 1) - 1
@@ -0,0 +1,255 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from os import replace, scandir, stat, unlink, utime
+from os.path import abspath, join
+from pathlib import Path
+from struct import Struct
+from tempfile import mkstemp
+from threading import Lock
+from time import time_ns
+from typing import Optional
+
+from .nodes import TydDocument
+from .tyd_binary import dump_binary, load_binary
+
+_CACHE_FILE_EXTENSION = ".tydc"
+_CACHE_MAGIC = b"TYDC"
+# Bump when the entry layout changes.
+_CACHE_FORMAT_VERSION = 2
+
+# magic, format version, package version, size, mtime_ns, content digest
+_HEADER = Struct("<4sH16sqq32s")
+
+
+def _package_version() -> bytes:
+    from . import __version__
+
+    return __version__.encode("ascii")[:16].ljust(16, b"\0")
+
+
+def _content_digest(contents: bytes) -> bytes:
+    return blake2b(contents, digest_size=32).digest()
+
+
+class TydCache:
+    """An on-disk cache of parsed documents used by from_file.
+
+    Each file is stored as the binary encoding of its document, keyed by
+    the absolute path of the file. An entry is used while the size and the
+    modification time of the file are unchanged, or when the hash of the
+    contents still matches. Entries written by other versions of the package
+    are ignored and removed. The least recently used entries are evicted when
+    the cache grows over max_bytes.
+
+    The sizes of the entries are read from the directory once, when the
+    cache is created, and then kept up to date in memory, so storing an
+    entry doesn't scan the directory. Entries written by other processes
+    are taken into account once they are read, or when the cache is created
+    again.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Parameters
+        ----------
+        directory : str
+            A string representing the directory to store entries in.
+            It is created if it doesn't exist.
+        max_bytes : int
+            A total size of the entries to keep, by default 256 MiB.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes mustn't be negative.")
+
+        self._directory = str(directory)
+        self._max_bytes = max_bytes
+        Path(self._directory).mkdir(parents=True, exist_ok=True)
+
+        # Sizes of the entries by path, from the least recently used.
+        self._lock = Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._load_sizes()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def get(self, file_path: str) -> Optional[TydDocument]:
+        """Returns the document cached for a file, or None on a miss.
+
+        Parameters
+        ----------
+        file_path : str
+            A string representing the path of the tyd file.
+
+        Returns
+        -------
+        Optional[TydDocument]
+            A document loaded from the cache, or None if there is no valid entry.
+        """
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, mode="rb") as f:
+                data = f.read()
+            file_stat = stat(file_path)
+        except OSError:
+            return None
+
+        if len(data) < _HEADER.size:
+            self._discard(entry_path)
+            return None
+
+        magic, version, package_version, size, mtime_ns, digest = _HEADER.unpack(
+            data[: _HEADER.size]
+        )
+        if (
+            magic != _CACHE_MAGIC
+            or version != _CACHE_FORMAT_VERSION
+            or package_version != _package_version()
+        ):
+            self._discard(entry_path)
+            return None
+
+        if file_stat.st_size != size:
+            return None
+
+        if file_stat.st_mtime_ns != mtime_ns:
+            # The file was touched, the entry is still valid if its contents are.
+            try:
+                with open(file_path, mode="rb") as f:
+                    contents = f.read()
+            except OSError:
+                return None
+            if _content_digest(contents) != digest:
+                return None
+
+        try:
+            doc = load_binary(memoryview(data)[_HEADER.size :])
+        except Exception:
+            self._discard(entry_path)
+            return None
+
+        self._touch(entry_path)
+        self._record(entry_path, len(data))
+        return doc
+
+    def put(
+        self,
+        file_path: str,
+        doc: TydDocument,
+        contents: bytes,
+        size: int,
+        mtime_ns: int,
+    ) -> None:
+        """A function to store the document parsed from a file.
+
+        Parameters
+        ----------
+        file_path : str
+            A string representing the path of the tyd file.
+        doc : TydDocument
+            A document parsed from the contents.
+        contents : bytes
+            The contents of the file that were parsed.
+        size : int
+            The size of the file when it was read.
+        mtime_ns : int
+            The modification time of the file in nanoseconds when it was read.
+        """
+        header = _HEADER.pack(
+            _CACHE_MAGIC,
+            _CACHE_FORMAT_VERSION,
+            _package_version(),
+            size,
+            mtime_ns,
+            _content_digest(contents),
+        )
+        payload = dump_binary(doc)
+
+        if len(header) + len(payload) > self._max_bytes:
+            return
+
+        # Write to a temporary file first so readers never see a partial entry.
+        entry_path = self._entry_path(file_path)
+        fd, temp_path = mkstemp(suffix=".tmp", dir=self._directory)
+        try:
+            with open(fd, mode="wb") as f:
+                f.write(header)
+                f.write(payload)
+            self._touch(temp_path)
+            replace(temp_path, entry_path)
+        except BaseException:
+            self._discard(temp_path)
+            raise
+
+        self._record(entry_path, len(header) + len(payload))
+        self._evict()
+
+    def clear(self) -> None:
+        """A function to remove every entry of the cache."""
+        for entry in scandir(self._directory):
+            if entry.name.endswith(_CACHE_FILE_EXTENSION):
+                self._discard(entry.path)
+        with self._lock:
+            self._sizes.clear()
+            self._total = 0
+
+    def _entry_path(self, file_path: str) -> str:
+        key = blake2b(abspath(file_path).encode("utf-8"), digest_size=16).hexdigest()
+        return join(self._directory, key + _CACHE_FILE_EXTENSION)
+
+    def _load_sizes(self) -> None:
+        entries = list()
+        for entry in scandir(self._directory):
+            if not entry.name.endswith(_CACHE_FILE_EXTENSION):
+                continue
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+
+        entries.sort()
+        for _, size, path in entries:
+            self._sizes[path] = size
+            self._total += size
+
+    def _record(self, entry_path: str, size: int) -> None:
+        """Records an entry as the most recently used one."""
+        with self._lock:
+            self._total += size - self._sizes.pop(entry_path, 0)
+            self._sizes[entry_path] = size
+
+    def _evict(self) -> None:
+        evicted = list()
+        with self._lock:
+            while self._total > self._max_bytes and self._sizes:
+                path, size = self._sizes.popitem(last=False)
+                self._total -= size
+                evicted.append(path)
+
+        for path in evicted:
+            self._discard(path)
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        # The modification time of an entry records its last use. It is set
+        # explicitly since file systems may store coarse timestamps.
+        try:
+            now = time_ns()
+            utime(path, ns=(now, now))
+        except OSError:
+            pass
+
+    def _discard(self, path: str) -> None:
+        with self._lock:
+            self._total -= self._sizes.pop(path, 0)
+        try:
+            unlink(path)
+        except OSError:
+            pass
@@ -1,10 +1,21 @@
 from __future__ import annotations
+from asyncio import get_running_loop
+from collections import namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from mmap import ACCESS_READ, mmap as memory_map
+from os import cpu_count, fstat, stat_result
 from os.path import basename, splitext
-from typing import Optional
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Tuple, Union
 
-from .nodes import TydDocument
+from .nodes import TydDocument, TydFrozenDocument
+from .tyd_cache import TydCache
 from .tyd_from_text import parse
-from .tyd_to_text import write
+from .tyd_to_text import write_to
+
+# Documents loaded frozen are thawed once, even when read by several threads.
+_THAW_LOCK = Lock()
 
 
 def from_document(doc: TydDocument, file_path: Optional[str] = None) -> TydFile:
@@ -26,13 +37,30 @@ def from_document(doc: TydDocument, file_path: Optional[str] = None) -> TydFile:
     return tyd_file
 
 
-def from_file(file_path: str) -> TydFile:
+def from_file(
+    file_path: str,
+    mmap: bool = False,
+    lazy: bool = False,
+    cache: Optional[TydCache] = None,
+) -> TydFile:
     """Returns TydFile object created from a file of path passed.
 
     Parameters
     ----------
     file_path : str
         A string representing filepath.
+    mmap : bool
+        Whether to memory-map the file and parse its UTF-8 bytes directly
+        instead of reading it into a string, by default False.
+        The map is closed before returning, so the file can be saved or
+        changed while the nodes are alive.
+    lazy : bool
+        Whether to parse the children of collections when they are first
+        accessed, by default False. Ignored with mmap.
+    cache : Optional[TydCache]
+        A cache to load the document from without parsing when the file is
+        unchanged, and to store it in otherwise, by default None.
+        With a cache, mmap and lazy are ignored.
 
     Returns
     -------
@@ -40,16 +68,135 @@ def from_file(file_path: str) -> TydFile:
         A TydFile created.
     """
     try:
-        with open(file_path, mode="r", encoding="utf-8") as f:
-            read_contents = f.read()
+        if cache is not None:
+            return _from_file_cached(file_path, cache)
 
-        tyd_node_list = list(parse(read_contents))
-        tyd_doc = TydDocument(tyd_node_list)
+        read_contents = _read_contents(file_path, mmap)
+        tyd_doc = _parse_contents(read_contents, lazy)
         return from_document(tyd_doc, file_path)
     except Exception as e:
         raise Exception(f"Exception loading {file_path}: {e}")
 
 
+def _parse_contents(
+    read_contents: Union[str, bytes, memory_map], lazy: bool
+) -> TydDocument:
+    try:
+        return TydDocument(list(parse(read_contents, lazy=lazy)))
+    finally:
+        # Nodes parsed from a map don't read it later, it isn't left open to
+        # be truncated under them when the file is saved or edited.
+        if isinstance(read_contents, memory_map):
+            read_contents.close()
+
+
+def _read_contents(file_path: str, mmap: bool) -> Union[str, bytes, memory_map]:
+    if not mmap:
+        with open(file_path, mode="r", encoding="utf-8") as f:
+            return f.read()
+
+    with open(file_path, mode="rb") as f:
+        if fstat(f.fileno()).st_size == 0:
+            return b""
+        return memory_map(f.fileno(), 0, access=ACCESS_READ)
+
+
+def _read_bytes(file_path: str) -> Tuple[bytes, stat_result]:
+    with open(file_path, mode="rb") as f:
+        return f.read(), fstat(f.fileno())
+
+
+def _from_file_cached(file_path: str, cache: TydCache) -> TydFile:
+    tyd_doc = cache.get(file_path)
+
+    if tyd_doc is None:
+        read_contents, file_stat = _read_bytes(file_path)
+        tyd_doc = TydDocument(parse(read_contents))
+        cache.put(
+            file_path, tyd_doc, read_contents, file_stat.st_size, file_stat.st_mtime_ns
+        )
+
+    return from_document(tyd_doc, file_path)
+
+
+DirectoryLoadResult = namedtuple("DirectoryLoadResult", ["files", "errors"])
+
+
+def load_directory(
+    path: str, pattern: str = "*.tyd", workers: Optional[int] = None
+) -> DirectoryLoadResult:
+    """Returns TydFile objects created from the files matching a pattern.
+
+    The files are parsed in parallel by a pool of worker processes, which
+    send the documents back frozen. A document is thawed into nodes in this
+    process when TydFile.document is first read, so the load itself scales
+    with the number of workers. Thawing isn't parallel and costs about a
+    quarter of parsing, which caps the speedup of loading and reading every
+    document near 4x. TydFile.frozen_document reads a document without
+    thawing it.
+
+    Parameters
+    ----------
+    path : str
+        A string representing the directory path.
+    pattern : str
+        A glob pattern of the files to load, relative to the directory,
+        by default "*.tyd". Use "**/*.tyd" to include subdirectories.
+    workers : Optional[int]
+        A number of worker processes, by default the number of CPUs.
+        With 1, the files are loaded in the current process.
+
+    Returns
+    -------
+    DirectoryLoadResult
+        A named tuple of the files loaded, sorted by path, and a dict mapping
+        the path of each file which couldn't be loaded to its exception.
+    """
+    file_paths = sorted(str(p) for p in Path(path).glob(pattern) if p.is_file())
+    files = list()
+    errors = dict()
+
+    if workers == 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            try:
+                files.append(from_file(file_path))
+            except Exception as e:
+                errors[file_path] = e
+
+        return DirectoryLoadResult(files, errors)
+
+    workers = workers or cpu_count() or 1
+    chunksize = max(1, len(file_paths) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_load_frozen_document, file_paths, chunksize=chunksize)
+
+        for file_path, (frozen_doc, error) in zip(file_paths, results):
+            if error is None:
+                files.append(_from_frozen_document(frozen_doc, file_path))
+            else:
+                errors[file_path] = error
+
+    return DirectoryLoadResult(files, errors)
+
+
+def _from_frozen_document(frozen_doc: TydFrozenDocument, file_path: str) -> TydFile:
+    tyd_file = TydFile(None, file_path)
+    tyd_file._frozen_doc = frozen_doc
+    return tyd_file
+
+
+def _load_frozen_document(
+    file_path: str,
+) -> Tuple[Optional[TydFrozenDocument], Optional[Exception]]:
+    # Documents are sent back frozen, which pickles much faster than nodes
+    # and keeps the unpickling cheap for the garbage collector.
+    try:
+        return TydFrozenDocument(from_file(file_path).document), None
+    except Exception as e:
+        return None, e
+
+
 class TydFile:
     """This represents tyd file objects.
 
@@ -61,11 +208,25 @@ class TydFile:
     def __init__(self, doc: TydDocument, file_path: Optional[str] = None):
         self._doc: TydDocument = doc
         self._file_path: str = file_path
+        # A document loaded frozen, until it is thawed by reading document.
+        self._frozen_doc: Optional[TydFrozenDocument] = None
 
     @property
     def document(self) -> TydDocument:
+        if self._frozen_doc is not None:
+            with _THAW_LOCK:
+                frozen_doc = self._frozen_doc
+                if frozen_doc is not None:
+                    self._doc = frozen_doc.thaw()
+                    self._frozen_doc = None
         return self._doc
 
+    @property
+    def frozen_document(self) -> Optional[TydFrozenDocument]:
+        """The read-only document the file was loaded as by load_directory,
+        or None once document has been read."""
+        return self._frozen_doc
+
     @document.setter
     def document(self, value: TydDocument) -> None:
         if not isinstance(value, TydDocument):
@@ -73,6 +234,7 @@ class TydFile:
             raise TypeError()
 
         self._doc = value
+        self._frozen_doc = None
 
     @property
     def file_path(self) -> str:
@@ -85,15 +247,26 @@ class TydFile:
     def save(self, file_path=None):
         if file_path is not None:
             self._file_path = file_path
-        elif file_path is None:
+        elif self._file_path is None:
             raise AttributeError(
                 "When didn't set filepath to TydFile, filepath parameter mustn't be None."
             )
 
-        builder = list()
+        with open(self._file_path, mode="w", encoding="utf-8") as f:
+            for node in self.document:
+                write_to(node, f)
+                f.write("\n")
 
-        for node in self._doc:
-            builder.append(write(node) + "\n")
+    async def save_async(self, file_path=None, executor: Optional[Executor] = None):
+        """A coroutine to save the file without blocking the event loop.
 
-        with open(file_path, mode="w", encoding="utf-8") as f:
-            f.write("".join(builder))
+        Parameters
+        ----------
+        file_path : Optional[str]
+            A string representing filepath, by default the path of the file.
+        executor : Optional[Executor]
+            A thread pool to write the file in, by default the default executor
+            of the event loop.
+        """
+        loop = get_running_loop()
+        await loop.run_in_executor(executor, self.save, file_path)
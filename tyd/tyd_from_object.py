@@ -0,0 +1,332 @@
+"""Serialisation of Python objects into TyD text.
+
+Dataclasses, NamedTuples, classes with __slots__, dicts and other objects
+with attributes are written as tables, lists and tuples as lists, and str,
+int, float, bool, enums and None as strings. The fields of each class are
+looked up once, into a writer cached per type, and text is written directly
+from the objects without creating nodes.
+"""
+import re
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from .constants import Constants
+from .nodes import TydNode
+from .utils import CHUNK_PIECES, indent_string, should_write_with_quotes
+
+# A writer appends the text of a value with a name at an indent level.
+Writer = Callable[[Any, Optional[str], int, List[str]], None]
+
+_writers: Dict[type, Writer] = dict()
+
+_SYMBOL_PATTERN = re.compile("[" + re.escape(Constants.SYMBOL_CHARS) + "]+")
+_WHITE_SPACE_CHARS = " \t\r\n"
+# Chars escaped in quoted strings, and in naked strings where they end values.
+_QUOTED_ESCAPE_PATTERN = re.compile(r'[\\"#]')
+_NAKED_ESCAPE_PATTERN = re.compile(r'[\\"#;\]}\n\t]')
+_NAKED_ESCAPES = {"\n": "\\n", "\t": "\\t"}
+_NAKED_UNWRITABLE_START_CHARS = (
+    _WHITE_SPACE_CHARS
+    + Constants.TABLE_START_CHAR
+    + Constants.LIST_START_CHAR
+    + Constants.ATTRIBUTE_START_CHAR
+    + "|"
+)
+
+
+def dump_object(obj: Any, name: Optional[str] = None, indent: int = 0) -> str:
+    """Returns TyD text of an object.
+
+    Parameters
+    ----------
+    obj : Any
+        An object to write.
+    name : Optional[str]
+        A name of the record, by default the name of the class of the object.
+    indent : int
+        A indent level of the record, by default 0.
+
+    Returns
+    -------
+    str
+        A string representing TyD text.
+
+    Raises
+    ------
+    TypeError
+        Raise when the object or one of its fields can't be written.
+    """
+    sb = []
+    _write_value(obj, _checked_name(obj, name), indent, sb)
+    return "".join(sb)
+
+
+def dump_objects(
+    objects: Iterable[Any], fileobj: TextIO, name: Optional[str] = None
+) -> None:
+    """A function to write TyD text of objects into a text stream, as the
+    root records of a document.
+
+    The text is written in chunks while the objects are iterated, so neither
+    the objects nor the whole text have to be held in memory.
+
+    Parameters
+    ----------
+    objects : Iterable[Any]
+        Objects to write.
+    fileobj : TextIO
+        A text stream to write into.
+    name : Optional[str]
+        A name of the records, by default the name of the class of each
+        object.
+
+    Raises
+    ------
+    TypeError
+        Raise when an object or one of its fields can't be written.
+    """
+    sb = []
+    for obj in objects:
+        _write_value(obj, _checked_name(obj, name), 0, sb)
+        if len(sb) >= CHUNK_PIECES:
+            fileobj.write("".join(sb))
+            sb.clear()
+
+    if sb:
+        fileobj.write("".join(sb))
+
+
+def dump_node(obj: Any, name: Optional[str] = None) -> TydNode:
+    """Returns a node created from an object.
+
+    Parameters
+    ----------
+    obj : Any
+        An object to convert.
+    name : Optional[str]
+        A name of the node, by default the name of the class of the object.
+
+    Returns
+    -------
+    TydNode
+        A node created.
+    """
+    from .tyd_from_text import parse
+
+    return next(parse(dump_object(obj, name)))
+
+
+def _write_value(value: Any, name: Optional[str], indent: int, sb: List[str]):
+    writer = _writers.get(type(value))
+    if writer is None:
+        writer = _writer_of(type(value))
+    writer(value, name, indent, sb)
+
+
+def _writer_of(cls: type) -> Writer:
+    if issubclass(cls, Enum):
+        writer = _write_enum
+    elif is_dataclass(cls):
+        names = [_checked_key(f.name) for f in fields(cls)]
+        getter = attrgetter(*names) if names else lambda value: ()
+        writer = _fields_writer(names, getter)
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        writer = _fields_writer([_checked_key(name) for name in cls._fields])
+    elif issubclass(cls, _BUILTIN_TYPES):
+        # Subclasses of str, int, list, dict and the like are written as them.
+        writer = next(_writers[c] for c in cls.__mro__ if c in _BUILTIN_TYPES)
+    elif any("__slots__" in vars(c) for c in cls.__mro__[:-1]):
+        writer = _slots_writer([_checked_key(name) for name in _slots_of(cls)])
+    elif hasattr(cls, "__dict__") and not issubclass(cls, (TydNode, type)):
+        writer = _write_attributes
+    else:
+        raise TypeError(f"Can't write {cls.__name__} objects as tyd.")
+
+    _writers[cls] = writer
+    return writer
+
+
+def _checked_name(obj: Any, name: Optional[str]) -> str:
+    return _checked_key(type(obj).__name__ if name is None else name)
+
+
+def _checked_key(key: Any) -> str:
+    if type(key) is not str or _SYMBOL_PATTERN.fullmatch(key) is None:
+        raise TypeError(
+            f"Can't write {key!r} as a tyd name, names are made of "
+            f"{Constants.SYMBOL_CHARS}."
+        )
+    return key
+
+
+def _string_writable(value: str) -> str:
+    """Returns a string written so that it is parsed back unchanged."""
+    if value == "":
+        return '""'
+
+    if not (
+        should_write_with_quotes(value)
+        or value == Constants.NULL_VALUE_STRING
+        or value[0] in _WHITE_SPACE_CHARS
+        or value[-1] in _WHITE_SPACE_CHARS
+        or value[0] == "|"
+    ):
+        return value.replace("\\", "\\\\")
+
+    if value[-1] != "\\":
+        return '"' + _QUOTED_ESCAPE_PATTERN.sub(r"\\\g<0>", value) + '"'
+
+    # A quote after an escaped backslash is taken as escaped, so values ending
+    # with a backslash are written naked, escaping the chars ending them.
+    # The chars starting a collection or an attribute can't be escaped.
+    if value[0] in _NAKED_UNWRITABLE_START_CHARS:
+        raise TypeError(f"Can't write {value!r} as a tyd string.")
+    return _NAKED_ESCAPE_PATTERN.sub(
+        lambda m: _NAKED_ESCAPES.get(m.group(), "\\" + m.group()), value
+    )
+
+
+def _intro(name: Optional[str], indent: int) -> str:
+    return indent_string(indent) + (name + " " if name is not None else "")
+
+
+def _write_null(value: None, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + Constants.NULL_VALUE_STRING + "\n")
+
+
+def _write_str(value: str, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + _string_writable(value) + "\n")
+
+
+def _write_int(value: int, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + str(value) + "\n")
+
+
+def _write_float(value: float, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + repr(value) + "\n")
+
+
+def _write_bool(value: bool, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + ("true" if value else "false") + "\n")
+
+
+def _write_enum(value: Enum, name: Optional[str], indent: int, sb: List[str]):
+    sb.append(_intro(name, indent) + _string_writable(value.name) + "\n")
+
+
+def _write_collection(
+    items: Iterable,
+    name: Optional[str],
+    indent: int,
+    sb: List[str],
+    table: bool,
+    check_names: bool = False,
+):
+    """Appends a table of (name, value) items, or a list of values.
+
+    The names of the items are checked unless they were checked with the
+    plan of their class.
+    """
+    if table:
+        start_char = Constants.TABLE_START_CHAR
+        end_char = Constants.TABLE_END_CHAR
+    else:
+        start_char = Constants.LIST_START_CHAR
+        end_char = Constants.LIST_END_CHAR
+
+    indentation = indent_string(indent)
+    start = len(sb)
+    sb.append(None)
+
+    if check_names:
+        for item_name, item in items:
+            _write_value(item, _checked_key(item_name), indent + 1, sb)
+    elif table:
+        for item_name, item in items:
+            _write_value(item, item_name, indent + 1, sb)
+    else:
+        for item in items:
+            _write_value(item, None, indent + 1, sb)
+
+    head = indentation + name if name is not None else indentation
+    if len(sb) == start + 1:
+        sb[start] = head + start_char + end_char + "\n"
+    else:
+        if name is not None:
+            head += "\n" + indentation
+        sb[start] = head + start_char + "\n"
+        sb.append(indentation + end_char + "\n")
+
+
+def _write_list(value: Iterable, name: Optional[str], indent: int, sb: List[str]):
+    _write_collection(value, name, indent, sb, False)
+
+
+def _write_dict(value: dict, name: Optional[str], indent: int, sb: List[str]):
+    _write_collection(value.items(), name, indent, sb, True, True)
+
+
+def _write_attributes(value: Any, name: Optional[str], indent: int, sb: List[str]):
+    items = ((k, v) for k, v in vars(value).items() if not k.startswith("_"))
+    _write_collection(items, name, indent, sb, True, True)
+
+
+def _fields_writer(names: Iterable[str], getter: Optional[Callable] = None) -> Writer:
+    names = tuple(names)
+    # attrgetter of one name returns the value rather than a tuple of one.
+    single = len(names) == 1
+
+    def write_record(value: Any, name: Optional[str], indent: int, sb: List[str]):
+        if getter is None:
+            values = value
+        else:
+            values = (getter(value),) if single else getter(value)
+        _write_collection(zip(names, values), name, indent, sb, True)
+
+    return write_record
+
+
+_UNSET = object()
+
+
+def _slots_of(cls: type) -> List[str]:
+    slots = list()
+    for c in reversed(cls.__mro__[:-1]):
+        c_slots = vars(c).get("__slots__", ())
+        slots.extend([c_slots] if isinstance(c_slots, str) else c_slots)
+    return [
+        name
+        for name in slots
+        if name not in ("__dict__", "__weakref__") and not name.startswith("_")
+    ]
+
+
+def _slots_writer(names: List[str]) -> Writer:
+    def write_slots(value: Any, name: Optional[str], indent: int, sb: List[str]):
+        # Slots which were never assigned are left out.
+        items = (
+            (n, v)
+            for n, v in ((n, getattr(value, n, _UNSET)) for n in names)
+            if v is not _UNSET
+        )
+        _write_collection(items, name, indent, sb, True)
+
+    return write_slots
+
+
+_writers.update(
+    {
+        type(None): _write_null,
+        str: _write_str,
+        int: _write_int,
+        float: _write_float,
+        bool: _write_bool,
+        list: _write_list,
+        tuple: _write_list,
+        dict: _write_dict,
+    }
+)
+
+_BUILTIN_TYPES = tuple(_writers)
@@ -1,15 +1,23 @@
+import re
+from array import array
+from bisect import bisect_right
 from collections import namedtuple
 from enum import Enum
-from typing import Iterator
+from functools import partial
+from sys import intern
+from typing import Iterator, Optional, TextIO, Union
 
 from .constants import Constants
-from .nodes import TydNode, TydTable, TydList, TydString
-from .utils import is_white_space
+from .nodes import TydCollection, TydNode, TydTable, TydList, TydString
+from .utils import is_white_space, WHITE_SPACE_CHARS
 
 
 LineColumn = namedtuple("LineColumn", ["line", "column"])
 SymbolAndPointer = namedtuple("SymbolAndPointer", ["pointer", "symbol"])
 StringAndPointer = namedtuple("StringAndPointer", ["pointer", "value"])
+RecordHeader = namedtuple(
+    "RecordHeader", ["pointer", "name", "handle", "source", "abstract", "no_inherit"],
+)
 
 
 class SymbolType(Enum):
@@ -24,162 +32,459 @@ class StringFormat(Enum):
     VERTICAL = 3
 
 
-def parse(
-    text: str, startIndex: int = 0, parent: TydNode = None, expect_names: bool = True
-) -> Iterator[TydNode]:
-    p = startIndex
+class ParseEngine(Enum):
+    """Tokenizer backends of the parser.
 
-    while True:
-        record_name = None
-        record_attribute_handle = None
-        record_attribute_source = None
-        record_attribute_abstract = False
-        record_attribute_no_inherit = False
+    ``CLASSIC`` advances through the text one character at a time and
+    ``REGEX`` skips whole runs of whitespace, comments, symbols and strings
+    with compiled patterns. Both build exactly the same node trees.
+    """
 
-        try:
-            p = _next_substance_index(text, p)
+    CLASSIC = 1
+    REGEX = 2
 
-            if p == len(text):
-                if parent is not None:
-                    raise Exception("Missing closing brackets")
-                break
 
-            if (
-                text[p] == Constants.TABLE_END_CHAR
-                or text[p] == Constants.LIST_END_CHAR
-            ):
-                break
+class _ParseError(Exception):
+    """An error in a text, with the index of the text it was found at."""
 
-            if expect_names:
-                result = _read_symbol(text, SymbolType.RECORD_NAME, p)
-                record_name = result.symbol
-                p = result.pointer
+    def __init__(self, message: str, index: int):
+        super().__init__(message)
+        self.index = index
 
-            p = _next_substance_index(text, p)
 
-            while text[p] == Constants.ATTRIBUTE_START_CHAR:
-                p += 1
+class _LineIndex:
+    """Offsets of the first character of every line in a text.
 
-                result = _read_symbol(text, SymbolType.ATTRIBUTE_NAME, p)
-                attribute_name = result.symbol
-                p = result.pointer
+    The table is built once per parse, so finding the line of an index is a
+    bisection instead of a rescan of the text from its beginning. The offsets
+    are stored in a compact array rather than a list of int objects.
+    """
 
-                if attribute_name == Constants.ABSTRACT_ATTRIBUTE_NAME:
-                    record_attribute_abstract = True
-                elif attribute_name == Constants.NO_INHERIT_ATTRIBUTE_NAME:
-                    record_attribute_no_inherit = True
-                else:
-                    p = _next_substance_index(text, p)
-
-                    result = _read_symbol(text, SymbolType.ATTRIBUTE_VALUE, p)
-                    attribute_value = result.symbol
-                    p = result.pointer
-
-                    if attribute_name == Constants.HANDLE_ATTRIBUTE_NAME:
-                        record_attribute_handle = attribute_value
-                    elif attribute_name == Constants.SOURCE_ATTRIBUTE_NAME:
-                        record_attribute_source = attribute_value
-                    else:
-                        raise Exception(
-                            "Unknown attribute name"
-                            + attribute_name
-                            + " at "
-                            + _line_column_string(text, p)
-                            + "\n"
-                            + _error_section_string(text, p)
-                        )
+    _NEW_LINE_PATTERN = re.compile("\n")
+    _NEW_LINE_BYTES_PATTERN = re.compile(b"\n")
 
-                p = _next_substance_index(text, p)
-        except Exception as e:
-            raise Exception(
-                "Exception parsing Tyd headers at "
-                + _line_column_string(text, p)
-                + ": "
-                + e
-                + "\n"
-                + _error_section_string(text, p)
-            )
+    def __init__(
+        self,
+        text: Union[str, bytes],
+        first_line: int = 1,
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        """Only the lines between start, the beginning of the line numbered
+        first_line, and end are indexed.
+        """
+        pattern = (
+            self._NEW_LINE_PATTERN
+            if isinstance(text, str)
+            else self._NEW_LINE_BYTES_PATTERN
+        )
+        end = len(text) if end is None else end
+        self._first_line = first_line
+        self._starts = array("q", [start])
+        self._starts.extend(m.end() for m in pattern.finditer(text, start, end))
+
+    def line(self, index: int) -> int:
+        return bisect_right(self._starts, index) - 1 + self._first_line
+
+    def line_column(self, index: int) -> LineColumn:
+        i = bisect_right(self._starts, index) - 1
+        return LineColumn(i + self._first_line, index - self._starts[i] + 1)
+
+
+_StructureChars = namedtuple(
+    "_StructureChars",
+    ["table_start", "table_end", "list_start", "list_end", "attribute_start"],
+)
+# skip_symbol and skip_string_value return the end of a symbol and of a value
+# without building them, for the records lazy parsing skips.
+_Scanner = namedtuple(
+    "_Scanner",
+    [
+        "next_substance_index",
+        "read_symbol",
+        "parse_string_value",
+        "chars",
+        "skip_symbol",
+        "skip_string_value",
+    ],
+)
+_ParseContext = namedtuple("_ParseContext", ["lines", "scanner", "lazy"])
 
-        if text[p] == Constants.TABLE_START_CHAR:
-            new_table = TydTable(record_name, parent, _index_to_line(text, p))
 
-            p += 1
+def parse(
+    text: Union[str, bytes],
+    startIndex: int = 0,
+    parent: TydNode = None,
+    expect_names: bool = True,
+    engine: ParseEngine = ParseEngine.CLASSIC,
+    lazy: bool = False,
+) -> Iterator[TydNode]:
+    """Returns an iterator over the nodes parsed from a text.
+
+    Parameters
+    ----------
+    text : Union[str, bytes]
+        A string representing TyD text, or a bytes-like object such as a
+        memory map holding UTF-8 encoded TyD text.
+        Bytes are always scanned with the regex engine, only names and values
+        are decoded, and line columns in error messages count bytes.
+        Long values of bytes are decoded when they are first read, but those
+        of a mutable buffer such as a memory map are decoded while parsing.
+    startIndex : int
+        A index of the text to start parsing from, by default 0.
+    parent : TydNode
+        A node to set as parent of the parsed nodes, by default None.
+    expect_names : bool
+        Whether the records have names, by default True.
+    engine : ParseEngine
+        A tokenizer backend to use, by default ParseEngine.CLASSIC.
+    lazy : bool
+        Whether to only find the span of each collection and parse its
+        children when they are first accessed, by default False.
+        The text is then kept alive by the unparsed collections.
+        Ignored for a mutable buffer, which could change before they are.
+
+    Returns
+    -------
+    Iterator[TydNode]
+        An iterator over the parsed nodes.
+    """
+    if isinstance(text, str):
+        scanner = _SCANNERS[engine]
+    elif isinstance(text, bytes):
+        scanner = _SCANNER_BYTES
+    else:
+        # Nothing is read from a mutable buffer once the parse returns, so it
+        # can be closed or changed while the nodes are alive.
+        scanner = _SCANNER_BUFFER
+        lazy = False
+    ctx = _ParseContext(_LineIndex(text), scanner, lazy)
+    return _parse(text, startIndex, parent, expect_names, ctx)
 
-            p = _next_substance_index(text, p)
 
-            for node in parse(text, p, new_table, True):
-                new_table.add(node)
-                p = node.docindexend + 1
+def parse_stream(
+    fileobj: TextIO, chunk_size: int = 65536, engine: ParseEngine = ParseEngine.CLASSIC
+) -> Iterator[TydNode]:
+    """Returns an iterator over the root records parsed from a text stream.
+
+    The stream is read incrementally and each root record is yielded as soon
+    as the text following it has been read, so only a window of text about
+    the size of the largest record is kept in memory. A malformed record
+    raises as soon as the text following the error has been read.
+    The ``docindexend`` of the yielded nodes is relative to that window.
+
+    Parameters
+    ----------
+    fileobj : TextIO
+        A text stream to read TyD text from.
+    chunk_size : int
+        A number of characters to read at once, by default 65536.
+    engine : ParseEngine
+        A tokenizer backend to use, by default ParseEngine.CLASSIC.
+
+    Returns
+    -------
+    Iterator[TydNode]
+        An iterator over the parsed root records.
+    """
+    scanner = _SCANNERS[engine]
+    text = ""
+    first_line = 1
+    eof = False
 
-            p = _next_substance_index(text, p)
+    while True:
+        # Grow the window geometrically, so a record spanning many chunks is
+        # reparsed only a logarithmic number of times.
+        wanted = max(len(text) * 2, chunk_size)
+        chunks = [text]
+        size = len(text)
+        while not eof and size < wanted:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                eof = True
+            chunks.append(chunk)
+            size += len(chunk)
+        text = "".join(chunks)
+
+        ctx = _ParseContext(_LineIndex(text, first_line), scanner, False)
+
+        if eof:
+            yield from _parse(text, 0, None, True, ctx)
+            return
+
+        consumed = 0
+        try:
+            for node in _parse(text, 0, None, True, ctx):
+                end = node.docindexend + 1
+                # A record is complete only when the text after it has been
+                # read, the last one may still be cut by the window.
+                if scanner.next_substance_index(text, end) >= len(text):
+                    break
+                yield node
+                consumed = end
+            else:
+                if scanner.next_substance_index(text, consumed) < len(text):
+                    # The records end at a closing bracket, as parse does.
+                    return
+        except _ParseError as e:
+            # An error at the end of the window may be a record cut by it,
+            # which is parsed again with more text. Errors before the end
+            # raise at once, without reading the rest of the stream.
+            if e.index < len(text):
+                raise
+
+        first_line += text.count("\n", 0, consumed)
+        text = text[consumed:]
+
+
+def _parse(
+    text: str, p: int, parent: TydNode, expect_names: bool, ctx: _ParseContext
+) -> Iterator[TydNode]:
+    lines = ctx.lines
+    _next_substance_index = ctx.scanner.next_substance_index
+    _parse_string_value = ctx.scanner.parse_string_value
+    chars = ctx.scanner.chars
 
-            if text[p] != Constants.TABLE_END_CHAR:
-                raise Exception(
-                    "Expanded '"
-                    + Constants.TABLE_END_CHAR
-                    + "' at "
-                    + _line_column_string(text, p)
-                    + "\n"
-                    + _error_section_string(text, p)
-                )
+    while True:
+        p = _next_substance_index(text, p)
 
-            new_table.docindexend = p
-            new_table.setup_attributes(
-                record_attribute_handle,
-                record_attribute_source,
-                record_attribute_abstract,
-                record_attribute_no_inherit,
-            )
-            yield new_table
+        if p == len(text):
+            if parent is not None:
+                raise _ParseError("Missing closing brackets", p)
+            break
 
-            p += 1
+        if text[p] == chars.table_end or text[p] == chars.list_end:
+            break
+
+        header = _parse_header(text, p, expect_names, ctx)
+        p = header.pointer
 
-        elif text[p] == Constants.LIST_START_CHAR:
-            new_list = TydList(record_name, parent, _index_to_line(text, p))
+        if text[p] == chars.table_start or text[p] == chars.list_start:
+            if text[p] == chars.table_start:
+                new_collection = TydTable(header.name, parent, lines.line(p))
+                children_expect_names = True
+            else:
+                new_collection = TydList(header.name, parent, lines.line(p))
+                children_expect_names = False
 
             p += 1
 
             p = _next_substance_index(text, p)
 
-            for node in parse(text, p, new_list, False):
-                new_list.add(node)
-                p = node.docindexend + 1
+            if ctx.lazy:
+                start = p
+                p = _skip_records(text, p, children_expect_names, ctx)
+                # The loader indexes the lines of the collection only, so the
+                # index of the whole text isn't kept alive by unloaded nodes.
+                new_collection.defer_nodes(
+                    partial(
+                        _load_nodes,
+                        text,
+                        start,
+                        p,
+                        lines.line(start),
+                        children_expect_names,
+                        ctx.scanner,
+                    )
+                )
+            else:
+                for node in _parse(text, p, new_collection, children_expect_names, ctx):
+                    new_collection.add(node)
+                    p = node.docindexend + 1
 
             p = _next_substance_index(text, p)
 
-            if text[p] != Constants.LIST_END_CHAR:
-                raise Exception(
-                    "Expanded '"
-                    + Constants.LIST_END_CHAR
-                    + "' at "
-                    + _line_column_string(text, p)
-                    + "\n"
-                    + _error_section_string(text, p)
-                )
+            _expect_closing_bracket(text, p, children_expect_names, ctx)
 
-            new_list.docindexend = p
-            new_list.setup_attributes(
-                record_attribute_handle,
-                record_attribute_source,
-                record_attribute_abstract,
-                record_attribute_no_inherit,
+            new_collection.docindexend = p
+            new_collection.setup_attributes(
+                header.handle, header.source, header.abstract, header.no_inherit
             )
-
-            yield new_list
+            yield new_collection
 
             p += 1
         else:
             pstart = p
 
-            result = _parse_string_value(text, pstart)
+            try:
+                result = _parse_string_value(text, pstart)
+            except Exception as e:
+                # Errors are at the end of the value, as a single backslash
+                # of a value cut by the end of the text.
+                raise _ParseError(str(e), ctx.scanner.skip_string_value(text, pstart))
             p = result.pointer
             val = result.value
 
-            node = TydString(record_name, val, parent, _index_to_line(text, pstart))
+            if type(val) is partial:
+                node = TydString(header.name, None, parent, lines.line(pstart))
+                node.defer_value(val)
+            else:
+                node = TydString(header.name, val, parent, lines.line(pstart))
             node.docindexend = p - 1
             yield node
 
 
+def _load_nodes(
+    text: str,
+    p: int,
+    end: int,
+    line: int,
+    expect_names: bool,
+    scanner: _Scanner,
+    parent: TydCollection,
+) -> None:
+    new_line = "\n" if isinstance(text, str) else b"\n"
+    line_start = text.rfind(new_line, 0, p) + 1
+    ctx = _ParseContext(_LineIndex(text, line, line_start, end + 1), scanner, True)
+    for node in _parse(text, p, parent, expect_names, ctx):
+        parent.add(node)
+
+
+def _skip_records(text: str, p: int, expect_names: bool, ctx: _ParseContext) -> int:
+    """Returns the index of the bracket closing the records starting at p.
+
+    The records are scanned the same way as by _parse, but neither nodes nor
+    values are built.
+    """
+    _next_substance_index = ctx.scanner.next_substance_index
+    _skip_string_value = ctx.scanner.skip_string_value
+    chars = ctx.scanner.chars
+
+    while True:
+        p = _next_substance_index(text, p)
+
+        if p == len(text):
+            raise _ParseError("Missing closing brackets", p)
+
+        if text[p] == chars.table_end or text[p] == chars.list_end:
+            return p
+
+        p = _skip_header(text, p, expect_names, ctx)
+
+        if text[p] == chars.table_start:
+            p = _skip_records(text, p + 1, True, ctx)
+            _expect_closing_bracket(text, p, True, ctx)
+            p += 1
+        elif text[p] == chars.list_start:
+            p = _skip_records(text, p + 1, False, ctx)
+            _expect_closing_bracket(text, p, False, ctx)
+            p += 1
+        else:
+            p = _skip_string_value(text, p)
+
+
+def _skip_header(text: str, p: int, expect_names: bool, ctx: _ParseContext) -> int:
+    """Returns the index following the header of a record starting at p."""
+    start = p
+
+    if expect_names:
+        end = ctx.scanner.skip_symbol(text, p)
+        if end == p:
+            # Raises the error of a missing name.
+            return _parse_header(text, start, expect_names, ctx).pointer
+        p = ctx.scanner.next_substance_index(text, end)
+
+    if p >= len(text) or text[p] == ctx.scanner.chars.attribute_start:
+        # Attributes are rare below the roots, they are read to be checked.
+        return _parse_header(text, start, expect_names, ctx).pointer
+    return p
+
+
+def _parse_header(
+    text: str, p: int, expect_names: bool, ctx: _ParseContext
+) -> RecordHeader:
+    lines = ctx.lines
+    _next_substance_index = ctx.scanner.next_substance_index
+    _read_symbol = ctx.scanner.read_symbol
+    chars = ctx.scanner.chars
+
+    record_name = None
+    record_attribute_handle = None
+    record_attribute_source = None
+    record_attribute_abstract = False
+    record_attribute_no_inherit = False
+
+    try:
+        if expect_names:
+            result = _read_symbol(text, SymbolType.RECORD_NAME, p, lines)
+            record_name = result.symbol
+            p = result.pointer
+
+        p = _next_substance_index(text, p)
+
+        while text[p] == chars.attribute_start:
+            p += 1
+
+            result = _read_symbol(text, SymbolType.ATTRIBUTE_NAME, p, lines)
+            attribute_name = result.symbol
+            p = result.pointer
+
+            if attribute_name == Constants.ABSTRACT_ATTRIBUTE_NAME:
+                record_attribute_abstract = True
+            elif attribute_name == Constants.NO_INHERIT_ATTRIBUTE_NAME:
+                record_attribute_no_inherit = True
+            else:
+                p = _next_substance_index(text, p)
+
+                result = _read_symbol(text, SymbolType.ATTRIBUTE_VALUE, p, lines)
+                attribute_value = result.symbol
+                p = result.pointer
+
+                if attribute_name == Constants.HANDLE_ATTRIBUTE_NAME:
+                    record_attribute_handle = attribute_value
+                elif attribute_name == Constants.SOURCE_ATTRIBUTE_NAME:
+                    record_attribute_source = attribute_value
+                else:
+                    raise Exception(
+                        "Unknown attribute name"
+                        + attribute_name
+                        + " at "
+                        + _line_column_string(lines, p)
+                        + "\n"
+                        + _error_section_string(text, p)
+                    )
+
+            p = _next_substance_index(text, p)
+    except Exception as e:
+        # Symbols are read up to the end of the text when it is cut in them.
+        raise _ParseError(
+            "Exception parsing Tyd headers at "
+            + _line_column_string(lines, p)
+            + ": "
+            + str(e)
+            + "\n"
+            + _error_section_string(text, p),
+            len(text) if isinstance(e, IndexError) else p,
+        )
+
+    return RecordHeader(
+        p,
+        record_name,
+        record_attribute_handle,
+        record_attribute_source,
+        record_attribute_abstract,
+        record_attribute_no_inherit,
+    )
+
+
+def _expect_closing_bracket(
+    text: str, p: int, is_table: bool, ctx: _ParseContext
+) -> None:
+    chars = ctx.scanner.chars
+    expected = chars.table_end if is_table else chars.list_end
+
+    if p >= len(text) or text[p] != expected:
+        raise _ParseError(
+            "Expanded '"
+            + (Constants.TABLE_END_CHAR if is_table else Constants.LIST_END_CHAR)
+            + "' at "
+            + _line_column_string(ctx.lines, p)
+            + "\n"
+            + _error_section_string(text, p),
+            p,
+        )
+
+
 def _parse_string_value(text: str, p: int) -> StringAndPointer:
     if text[p] == '"':
         fmt = StringFormat.QUOTED
@@ -260,18 +565,30 @@ def _parse_string_value(text: str, p: int) -> StringAndPointer:
 
 
 def _resolve_escape_chars(input_value: str):
-    i = 0
-    while i < len(input_value):
-        if input_value[i] == "\\":
-            if len(input_value) <= i + 1:
-                raise Exception(
-                    "Tyd string value ends with single backslash: " + input_value
-                )
+    i = input_value.find("\\")
+    if i == -1:
+        return input_value
 
-            resolved_char = _escaped_char_of(input_value[i + 1])
-            input_value = input_value[:i] + resolved_char + input_value[i + 2 :]
-        i += 1
-    return input_value
+    builder = list()
+    start = 0
+    length = len(input_value)
+
+    while i != -1:
+        if i + 1 >= length:
+            raise Exception(
+                "Tyd string value ends with single backslash: " + input_value
+            )
+
+        char = input_value[i + 1]
+        builder.append(input_value[start:i])
+        builder.append(
+            _ESCAPED_CHARS[char] if char in _ESCAPED_CHARS else _escaped_char_of(char)
+        )
+        start = i + 2
+        i = input_value.find("\\", start)
+
+    builder.append(input_value[start:])
+    return "".join(builder)
 
 
 def _escaped_char_of(char: str):
@@ -297,7 +614,13 @@ def _escaped_char_of(char: str):
         raise Exception("Cannot escape char: \\" + char)
 
 
-def _read_symbol(text: str, st: SymbolType, p: int) -> SymbolAndPointer:
+# The results of _escaped_char_of for every char it can escape.
+_ESCAPED_CHARS = {char: _escaped_char_of(char) for char in '\\"#;]}\rnt'}
+
+
+def _read_symbol(
+    text: str, st: SymbolType, p: int, lines: _LineIndex
+) -> SymbolAndPointer:
     pstart = p
     while True:
         c = text[p]
@@ -315,12 +638,12 @@ def _read_symbol(text: str, st: SymbolType, p: int) -> SymbolAndPointer:
             "Expected "
             + _symbol_type_name(st)
             + " at "
-            + _line_column_string(text, p)
+            + _line_column_string(lines, p)
             + "\n"
             + _error_section_string(text, p)
         )
 
-    return SymbolAndPointer(p, text[pstart:p])
+    return SymbolAndPointer(p, intern(text[pstart:p]))
 
 
 def _symbol_type_name(st: SymbolType):
@@ -350,8 +673,8 @@ def _is_new_line_crlf(text: str, p: int) -> bool:
     return text[p] == "\r" and p < len(text) - 1 and text[p + 1] == "\n"
 
 
-def _line_column_string(text: str, index: int):
-    result = _index_to_line_column(text, index)
+def _line_column_string(lines: _LineIndex, index: int):
+    result = lines.line_column(index)
     return f"line {result.line}, col {result.column}"
 
 
@@ -361,42 +684,21 @@ def _insert_string(index: int, base: str, insert: str) -> str:
     return f"{head}{insert}{tail}"
 
 
-def _error_section_string(text: str, index: int):
+def _error_section_string(text: Union[str, bytes], index: int):
     CHAR_RANGE_WIDTH = 500
 
-    modtext = text
-    modtext = _insert_string(min(index, len(text) - 1), modtext, "[ERROR]")
-
-    if index > CHAR_RANGE_WIDTH or len(text) > index + CHAR_RANGE_WIDTH:
-        start = min(index - CHAR_RANGE_WIDTH, 0)
-        length = min(CHAR_RANGE_WIDTH * 2, len(text) - index)
-        text = text[start : start + length]
-
-    return modtext
-
-
-def _index_to_line(text: str, index: int) -> int:
-    result = _index_to_line_column(text, index)
-    return result.line
-
-
-def _index_to_line_column(text: str, index: int) -> LineColumn:
-    line = 1
-    column = 1
+    index = min(index, len(text) - 1)
+    start = max(index - CHAR_RANGE_WIDTH, 0)
+    end = min(index + CHAR_RANGE_WIDTH, len(text))
+    section = text[start:end]
 
-    p = 0
-    while p < index:
-        if _is_new_line_lf(text, p):
-            line += 1
-            column = 0
-        elif _is_new_line_crlf(text, p):
-            line += 1
-            column = 0
-            p += 1
-        column += 1
-        p += 1
+    if not isinstance(section, str):
+        index = len(section[: index - start].decode("utf-8", "replace"))
+        section = section.decode("utf-8", "replace")
+    else:
+        index -= start
 
-    return LineColumn(line, column)
+    return _insert_string(index, section, "[ERROR]")
 
 
 def _next_substance_index(text: str, p: int) -> int:
@@ -413,16 +715,305 @@ def _next_substance_index(text: str, p: int) -> int:
             continue
 
         if text[p] == Constants.COMMENT_CHAR:
-            while p < len(text) and _is_new_line(text, p):
+            while p < len(text) and not _is_new_line(text, p):
                 p += 1
 
-            if _is_new_line_lf(text, p):
+            if p >= len(text):
+                return len(text)
+            elif _is_new_line_lf(text, p):
                 p += 1
             elif _is_new_line_crlf(text, p):
                 p += 2
-            else:
-                raise Exception()
 
             continue
 
         return p
+
+
+_TEXT_STRUCTURE_CHARS = _StructureChars(
+    Constants.TABLE_START_CHAR,
+    Constants.TABLE_END_CHAR,
+    Constants.LIST_START_CHAR,
+    Constants.LIST_END_CHAR,
+    Constants.ATTRIBUTE_START_CHAR,
+)
+
+
+_WHITE_SPACE_CLASS = "[" + re.escape(WHITE_SPACE_CHARS) + "]"
+_SUBSTANCE_SKIP_PATTERN = re.compile(
+    "(?:"
+    + _WHITE_SPACE_CLASS
+    + "|"
+    + re.escape(Constants.RECORD_END_CHAR)
+    + "|"
+    + re.escape(Constants.COMMENT_CHAR)
+    + "[^\n]*\n?)*"
+)
+_SYMBOL_PATTERN = re.compile("[" + re.escape(Constants.SYMBOL_CHARS) + "]*")
+_NAKED_END_CHARS = re.escape(
+    Constants.RECORD_END_CHAR
+    + Constants.COMMENT_CHAR
+    + Constants.TABLE_END_CHAR
+    + Constants.LIST_END_CHAR
+)
+_NAKED_STRING_PATTERN = re.compile(
+    "(?:[^\n\r" + _NAKED_END_CHARS + "]|\r(?!\n)|(?<=\\\\)[" + _NAKED_END_CHARS + "])*"
+)
+
+
+def _regex_next_substance_index(text: str, p: int) -> int:
+    return _SUBSTANCE_SKIP_PATTERN.match(text, p).end()
+
+
+def _regex_read_symbol(
+    text: str, st: SymbolType, p: int, lines: _LineIndex
+) -> SymbolAndPointer:
+    end = _SYMBOL_PATTERN.match(text, p).end()
+
+    if end == p:
+        raise Exception(
+            "Expected "
+            + _symbol_type_name(st)
+            + " at "
+            + _line_column_string(lines, p)
+            + "\n"
+            + _error_section_string(text, p)
+        )
+
+    return SymbolAndPointer(end, intern(text[p:end]))
+
+
+def _regex_parse_string_value(text: str, p: int) -> StringAndPointer:
+    c = text[p]
+
+    if c == '"':
+        pstart = p + 1
+        p = text.find('"', pstart)
+        while p != -1 and text[p - 1] == "\\":
+            p = text.find('"', p + 1)
+        if p == -1:
+            p = len(text)
+
+        return StringAndPointer(p + 1, _resolve_escape_chars(text[pstart:p]))
+
+    elif c == "|":
+        builder = list()
+
+        while True:
+            line_content_start = p + 1
+            p = text.find("\n", line_content_start)
+            if p == -1:
+                p = len(text)
+            elif p > line_content_start and text[p - 1] == "\r":
+                p -= 1
+
+            builder.append(text[line_content_start:p])
+            p = _SUBSTANCE_SKIP_PATTERN.match(text, p).end()
+
+            if p < len(text) and text[p] == "|":
+                builder.append("\n")
+                continue
+
+            return StringAndPointer(p, "".join(builder))
+
+    else:
+        end = _NAKED_STRING_PATTERN.match(text, p).end()
+        val = text[p:end].rstrip(WHITE_SPACE_CHARS)
+
+        if val == Constants.NULL_VALUE_STRING:
+            val = None
+        else:
+            val = _resolve_escape_chars(val)
+
+        return StringAndPointer(end, val)
+
+
+def _regex_skip_symbol(text: str, p: int) -> int:
+    return _SYMBOL_PATTERN.match(text, p).end()
+
+
+def _regex_skip_string_value(text: str, p: int) -> int:
+    c = text[p]
+
+    if c == '"':
+        p = text.find('"', p + 1)
+        while p != -1 and text[p - 1] == "\\":
+            p = text.find('"', p + 1)
+        return len(text) + 1 if p == -1 else p + 1
+
+    elif c == "|":
+        while True:
+            p = text.find("\n", p + 1)
+            if p == -1:
+                return len(text)
+            p = _SUBSTANCE_SKIP_PATTERN.match(text, p).end()
+            if p >= len(text) or text[p] != "|":
+                return p
+
+    else:
+        return _NAKED_STRING_PATTERN.match(text, p).end()
+
+
+_SCANNER_CLASSIC = _Scanner(
+    _next_substance_index,
+    _read_symbol,
+    _parse_string_value,
+    _TEXT_STRUCTURE_CHARS,
+    _regex_skip_symbol,
+    _regex_skip_string_value,
+)
+
+_SCANNER_REGEX = _Scanner(
+    _regex_next_substance_index,
+    _regex_read_symbol,
+    _regex_parse_string_value,
+    _TEXT_STRUCTURE_CHARS,
+    _regex_skip_symbol,
+    _regex_skip_string_value,
+)
+
+
+# Values at least this long are decoded from a bytes-like text only when
+# they are first read, shorter ones are cheaper to decode than to defer.
+_LAZY_VALUE_MIN_SIZE = 64
+
+_SUBSTANCE_SKIP_BYTES_PATTERN = re.compile(
+    _SUBSTANCE_SKIP_PATTERN.pattern.encode("ascii")
+)
+_SYMBOL_BYTES_PATTERN = re.compile(_SYMBOL_PATTERN.pattern.encode("ascii"))
+_NAKED_STRING_BYTES_PATTERN = re.compile(_NAKED_STRING_PATTERN.pattern.encode("ascii"))
+_WHITE_SPACE_BYTES = WHITE_SPACE_CHARS.encode("ascii")
+_NULL_VALUE_BYTES = Constants.NULL_VALUE_STRING.encode("ascii")
+
+
+def _bytes_next_substance_index(text: bytes, p: int) -> int:
+    return _SUBSTANCE_SKIP_BYTES_PATTERN.match(text, p).end()
+
+
+def _bytes_read_symbol(
+    text: bytes, st: SymbolType, p: int, lines: _LineIndex
+) -> SymbolAndPointer:
+    end = _SYMBOL_BYTES_PATTERN.match(text, p).end()
+
+    if end == p:
+        raise Exception(
+            "Expected "
+            + _symbol_type_name(st)
+            + " at "
+            + _line_column_string(lines, p)
+            + "\n"
+            + _error_section_string(text, p)
+        )
+
+    return SymbolAndPointer(end, intern(text[p:end].decode("ascii")))
+
+
+def _decode_escaped_value(text: bytes, start: int, end: int) -> str:
+    return _resolve_escape_chars(text[start:end].decode("utf-8"))
+
+
+def _bytes_parse_string_value(text: bytes, p: int) -> StringAndPointer:
+    return _bytes_read_string_value(text, p, _LAZY_VALUE_MIN_SIZE)
+
+
+def _buffer_parse_string_value(text: bytes, p: int) -> StringAndPointer:
+    return _bytes_read_string_value(text, p, None)
+
+
+def _bytes_read_string_value(
+    text: bytes, p: int, lazy_min_size: Optional[int]
+) -> StringAndPointer:
+    c = text[p]
+
+    if c == 0x22:  # '"'
+        pstart = p + 1
+        p = text.find(b'"', pstart)
+        while p != -1 and text[p - 1] == 0x5C:  # '\\'
+            p = text.find(b'"', p + 1)
+        if p == -1:
+            p = len(text)
+
+        if lazy_min_size is not None and p - pstart >= lazy_min_size:
+            val = partial(_decode_escaped_value, text, pstart, p)
+        else:
+            val = _decode_escaped_value(text, pstart, p)
+
+        return StringAndPointer(p + 1, val)
+
+    elif c == 0x7C:  # '|'
+        builder = list()
+
+        while True:
+            line_content_start = p + 1
+            p = text.find(b"\n", line_content_start)
+            if p == -1:
+                p = len(text)
+            elif p > line_content_start and text[p - 1] == 0x0D:  # '\r'
+                p -= 1
+
+            builder.append(text[line_content_start:p])
+            p = _SUBSTANCE_SKIP_BYTES_PATTERN.match(text, p).end()
+
+            if p < len(text) and text[p] == 0x7C:
+                builder.append(b"\n")
+                continue
+
+            return StringAndPointer(p, b"".join(builder).decode("utf-8"))
+
+    else:
+        end = _NAKED_STRING_BYTES_PATTERN.match(text, p).end()
+        val_end = end
+        while val_end > p and text[val_end - 1] in _WHITE_SPACE_BYTES:
+            val_end -= 1
+
+        if lazy_min_size is not None and val_end - p >= lazy_min_size:
+            val = partial(_decode_escaped_value, text, p, val_end)
+        elif text[p:val_end] == _NULL_VALUE_BYTES:
+            val = None
+        else:
+            val = _decode_escaped_value(text, p, val_end)
+
+        return StringAndPointer(end, val)
+
+
+def _bytes_skip_symbol(text: bytes, p: int) -> int:
+    return _SYMBOL_BYTES_PATTERN.match(text, p).end()
+
+
+def _bytes_skip_string_value(text: bytes, p: int) -> int:
+    c = text[p]
+
+    if c == 0x22:  # '"'
+        p = text.find(b'"', p + 1)
+        while p != -1 and text[p - 1] == 0x5C:  # '\\'
+            p = text.find(b'"', p + 1)
+        return len(text) + 1 if p == -1 else p + 1
+
+    elif c == 0x7C:  # '|'
+        while True:
+            p = text.find(b"\n", p + 1)
+            if p == -1:
+                return len(text)
+            p = _SUBSTANCE_SKIP_BYTES_PATTERN.match(text, p).end()
+            if p >= len(text) or text[p] != 0x7C:
+                return p
+
+    else:
+        return _NAKED_STRING_BYTES_PATTERN.match(text, p).end()
+
+
+_SCANNER_BYTES = _Scanner(
+    _bytes_next_substance_index,
+    _bytes_read_symbol,
+    _bytes_parse_string_value,
+    _StructureChars(*(ord(c) for c in _TEXT_STRUCTURE_CHARS)),
+    _bytes_skip_symbol,
+    _bytes_skip_string_value,
+)
+
+_SCANNER_BUFFER = _SCANNER_BYTES._replace(parse_string_value=_buffer_parse_string_value)
+
+_SCANNERS = {
+    ParseEngine.CLASSIC: _SCANNER_CLASSIC,
+    ParseEngine.REGEX: _SCANNER_REGEX,
+}
@@ -0,0 +1,221 @@
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from .nodes import TydCollection, TydNode
+from .tyd_file import TydFile
+
+# The keys a root was indexed with, as its attributes may change afterwards.
+_IndexedRoot = namedtuple("_IndexedRoot", ["node", "name", "handle", "source"])
+
+
+class TydIndex:
+    """An index of the root nodes of a set of files by handle, by source and
+    by name.
+
+    Files are added, removed and reloaded incrementally, at a cost
+    proportional to the number of roots of the file. Lookups don't depend on
+    the number of files indexed.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, TydFile] = dict()
+        self._roots_by_file: Dict[str, List[_IndexedRoot]] = dict()
+        self._file_path_by_root: Dict[int, str] = dict()
+        self._nodes_by_handle: Dict[str, TydCollection] = dict()
+        # Nodes are kept in dicts keyed by id so that they are removed in O(1).
+        self._nodes_by_source: Dict[str, Dict[int, TydCollection]] = dict()
+        self._nodes_by_name: Dict[str, Dict[int, TydNode]] = dict()
+
+    @property
+    def files(self) -> List[TydFile]:
+        return list(self._files.values())
+
+    def add_file(self, tyd_file: TydFile) -> None:
+        """A function to index the root nodes of a file.
+
+        Parameters
+        ----------
+        tyd_file : TydFile
+            A file to index, with a file path.
+
+        Raises
+        ------
+        Exception
+            Raise when the file has no path, when a file with the same path is
+            already indexed, or when a handle is already indexed.
+        """
+        file_path = self._file_path_of(tyd_file)
+        if file_path in self._files:
+            raise Exception(f"Tyd error: {file_path} is already indexed.")
+
+        self._check_handles(tyd_file, None)
+        self._add(file_path, tyd_file)
+
+    def remove_file(self, file_path: str) -> Optional[TydFile]:
+        """A function to remove the nodes of a file from the index.
+
+        Parameters
+        ----------
+        file_path : str
+            A string representing the path of the file.
+
+        Returns
+        -------
+        Optional[TydFile]
+            The file removed, or None if no file with the path is indexed.
+        """
+        tyd_file = self._files.pop(file_path, None)
+        if tyd_file is None:
+            return None
+
+        for root in self._roots_by_file.pop(file_path):
+            del self._file_path_by_root[id(root.node)]
+            if root.name is not None:
+                self._discard(self._nodes_by_name, root.name, root.node)
+            if root.handle is not None:
+                del self._nodes_by_handle[root.handle]
+            if root.source is not None:
+                self._discard(self._nodes_by_source, root.source, root.node)
+
+        return tyd_file
+
+    def reload_file(self, tyd_file: TydFile) -> None:
+        """A function to replace the indexed file with the same path.
+
+        The index is left unchanged when the new file can't be indexed.
+
+        Parameters
+        ----------
+        tyd_file : TydFile
+            A new version of a file, which is added if it isn't indexed yet.
+
+        Raises
+        ------
+        Exception
+            Raise when the file has no path, or when a handle of the file is
+            indexed for another file.
+        """
+        file_path = self._file_path_of(tyd_file)
+        self._check_handles(tyd_file, file_path)
+        self.remove_file(file_path)
+        self._add(file_path, tyd_file)
+
+    def find_handle(self, handle: str) -> Optional[TydCollection]:
+        """Returns the collection with a handle, or None.
+
+        Parameters
+        ----------
+        handle : str
+            A handle to look up.
+
+        Returns
+        -------
+        Optional[TydCollection]
+            The collection found.
+        """
+        return self._nodes_by_handle.get(handle)
+
+    def find_heirs(self, source: str) -> List[TydCollection]:
+        """Returns the collections inheriting directly from a handle.
+
+        Parameters
+        ----------
+        source : str
+            A handle of the source.
+
+        Returns
+        -------
+        List[TydCollection]
+            The collections found, in the order they were indexed.
+        """
+        return list(self._nodes_by_source.get(source, {}).values())
+
+    def find_named(self, name: str) -> List[TydNode]:
+        """Returns the root nodes with a name.
+
+        Parameters
+        ----------
+        name : str
+            A name to look up.
+
+        Returns
+        -------
+        List[TydNode]
+            The nodes found, in the order they were indexed.
+        """
+        return list(self._nodes_by_name.get(name, {}).values())
+
+    def file_of(self, node: TydNode) -> Optional[TydFile]:
+        """Returns the file holding an indexed root node, or None.
+
+        Parameters
+        ----------
+        node : TydNode
+            A root node of an indexed file.
+
+        Returns
+        -------
+        Optional[TydFile]
+            The file found.
+        """
+        file_path = self._file_path_by_root.get(id(node))
+        return self._files.get(file_path) if file_path is not None else None
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _add(self, file_path: str, tyd_file: TydFile) -> None:
+        roots = list()
+
+        for node in tyd_file.document:
+            if isinstance(node, TydCollection):
+                root = _IndexedRoot(
+                    node, node.name, node.attribute_handle, node.attribute_source
+                )
+            else:
+                root = _IndexedRoot(node, node.name, None, None)
+            roots.append(root)
+
+            self._file_path_by_root[id(node)] = file_path
+            if root.name is not None:
+                self._nodes_by_name.setdefault(root.name, dict())[id(node)] = node
+            if root.handle is not None:
+                self._nodes_by_handle[root.handle] = node
+            if root.source is not None:
+                self._nodes_by_source.setdefault(root.source, dict())[id(node)] = node
+
+        self._files[file_path] = tyd_file
+        self._roots_by_file[file_path] = roots
+
+    def _check_handles(self, tyd_file: TydFile, replaced_path: Optional[str]) -> None:
+        handles = set()
+        for node in tyd_file.document:
+            if not isinstance(node, TydCollection) or node.attribute_handle is None:
+                continue
+
+            handle = node.attribute_handle
+            indexed_node = self._nodes_by_handle.get(handle)
+            if handle in handles or (
+                indexed_node is not None
+                and self._file_path_by_root[id(indexed_node)] != replaced_path
+            ):
+                raise Exception(
+                    f"Tyd error: Multiple Tyd nodes with the same handle {handle}."
+                )
+            handles.add(handle)
+
+    @staticmethod
+    def _file_path_of(tyd_file: TydFile) -> str:
+        if tyd_file.file_path is None:
+            raise Exception("Tyd error: Only files with a path can be indexed.")
+        return tyd_file.file_path
+
+    @staticmethod
+    def _discard(nodes_by_key: Dict[str, Dict[int, TydNode]], key: str, node: TydNode):
+        nodes = nodes_by_key[key]
+        del nodes[id(node)]
+        if not nodes:
+            del nodes_by_key[key]
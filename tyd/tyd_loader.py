@@ -0,0 +1,178 @@
+from threading import Lock
+from typing import Dict, List, Optional
+
+from .inheritance import Inheritance
+from .nodes import TydCollection, TydDocument
+from .tyd_cache import TydCache
+from .tyd_file import TydFile, from_document, from_file
+from .tyd_from_text import parse
+from .tyd_index import TydIndex
+
+
+class TydLoader:
+    """This loads tyd files and resolves the inheritance between them.
+
+    A loader owns all the state of one load, so separate loaders can be used
+    from different threads at the same time. A loader can also be shared by
+    threads loading files concurrently: files are parsed in parallel and only
+    their registration is serialised.
+    """
+
+    def __init__(
+        self, cache: Optional[TydCache] = None, mmap: bool = False, lazy: bool = False
+    ):
+        """
+        Parameters
+        ----------
+        cache : Optional[TydCache]
+            A cache passed to from_file, by default None.
+        mmap : bool
+            Whether from_file memory-maps the files, by default False.
+        lazy : bool
+            Whether from_file parses the children of collections when they are
+            first accessed, by default False.
+        """
+        self._cache = cache
+        self._mmap = mmap
+        self._lazy = lazy
+        self._lock = Lock()
+        self._inheritance = Inheritance()
+        self._files: List[TydFile] = list()
+        self._index = TydIndex()
+        # The roots registered for inheritance from each file with a path.
+        self._roots_by_file: Dict[str, List[TydCollection]] = dict()
+
+    @property
+    def index(self) -> TydIndex:
+        """An index of the root nodes of the files loaded with a path."""
+        return self._index
+
+    @property
+    def files(self) -> List[TydFile]:
+        with self._lock:
+            return list(self._files)
+
+    def load_file(self, file_path: str) -> TydFile:
+        """Returns TydFile object created from a file of path passed, and
+        registers its roots for inheritance.
+
+        Parameters
+        ----------
+        file_path : str
+            A string representing filepath.
+
+        Returns
+        -------
+        TydFile
+            A TydFile created.
+
+        Raises
+        ------
+        Exception
+            Raise when a handle of the file is already loaded.
+            The loader is left unchanged then.
+        """
+        tyd_file = from_file(
+            file_path, mmap=self._mmap, lazy=self._lazy, cache=self._cache
+        )
+        self._add(tyd_file)
+        return tyd_file
+
+    def load_text(self, text: str, file_path: Optional[str] = None) -> TydFile:
+        """Returns TydFile object created from a string, and registers its roots
+        for inheritance.
+
+        Parameters
+        ----------
+        text : str
+            A string to parse.
+        file_path : Optional[str]
+            A string representing file path, by default None.
+
+        Returns
+        -------
+        TydFile
+            A TydFile created.
+
+        Raises
+        ------
+        Exception
+            Raise when a handle of the file is already loaded.
+            The loader is left unchanged then.
+        """
+        tyd_file = from_document(TydDocument(parse(text, lazy=self._lazy)), file_path)
+        self._add(tyd_file)
+        return tyd_file
+
+    def reload_file(self, file_path: str) -> TydFile:
+        """Returns TydFile object created from a file loaded before, and
+        re-applies inheritance to the heirs of the collections it holds.
+
+        The collections of the previous version are replaced, and those
+        removed from the file are unregistered.
+
+        Parameters
+        ----------
+        file_path : str
+            A string representing filepath.
+
+        Returns
+        -------
+        TydFile
+            A TydFile created.
+
+        Raises
+        ------
+        Exception
+            Raise when a handle of the file is already loaded from another
+            file, when a source can't be found or would make a cycle, or when
+            the nodes to merge are inconsistent.
+            The loader keeps the previous version of the file then.
+        """
+        tyd_file = from_file(
+            file_path, mmap=self._mmap, lazy=self._lazy, cache=self._cache
+        )
+        with self._lock:
+            previous_file = self._index.remove_file(file_path)
+            try:
+                self._index.add_file(tyd_file)
+                self._inheritance.reregister_all_roots(
+                    tyd_file.document, self._roots_by_file.get(file_path)
+                )
+            except BaseException:
+                self._index.remove_file(file_path)
+                if previous_file is not None:
+                    self._index.add_file(previous_file)
+                raise
+
+            self._roots_by_file[file_path] = _roots_of(tyd_file)
+            for i, loaded_file in enumerate(self._files):
+                if loaded_file.file_path == file_path:
+                    self._files[i] = tyd_file
+                    break
+            else:
+                self._files.append(tyd_file)
+        return tyd_file
+
+    def resolve(self) -> None:
+        """A function to apply inheritance to every file loaded."""
+        with self._lock:
+            self._inheritance.resolve_all()
+
+    def _add(self, tyd_file: TydFile) -> None:
+        with self._lock:
+            if tyd_file.file_path is not None:
+                self._index.add_file(tyd_file)
+            try:
+                self._inheritance.register_all_roots(tyd_file.document)
+            except BaseException:
+                if tyd_file.file_path is not None:
+                    self._index.remove_file(tyd_file.file_path)
+                raise
+            if tyd_file.file_path is not None:
+                self._roots_by_file[tyd_file.file_path] = _roots_of(tyd_file)
+            self._files.append(tyd_file)
+
+
+def _roots_of(tyd_file: TydFile) -> List[TydCollection]:
+    return [node for node in tyd_file.document if isinstance(node, TydCollection)]
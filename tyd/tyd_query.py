@@ -0,0 +1,378 @@
+"""Path queries over tyd nodes.
+
+A path is made of steps separated by slashes, each optionally followed by
+predicates in square brackets.
+
+    name        the children with the name
+    *           every child
+    **          the node and every descendant of it
+    [2]         the third node matched by the step in each collection,
+                negative indices count from the end
+    [@handle=X] the collections with the handle X, and likewise for source
+    [@abstract] the abstract collections, and likewise for noinherit
+
+For example ``ThingDefs/*[@source=BaseThing]/stats/MaxHitPoints`` or
+``**/tags/*[0]``. Nodes are returned in document order.
+"""
+from __future__ import annotations
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .constants import Constants
+from .nodes import TydCollection, TydFrozenCollection, TydFrozenNode, TydNode, TydTable
+
+Node = Union[TydNode, TydFrozenNode]
+
+_AXIS_CHILD = 0
+_AXIS_DESCENDANT = 1
+
+_Step = namedtuple("_Step", ["axis", "name", "predicates"])
+# A predicate is positional with an index, or filters by an attribute value.
+_Predicate = namedtuple("_Predicate", ["index", "attribute", "value"])
+
+_STEP_PATTERN = re.compile(
+    r"(\*\*|\*|[" + re.escape(Constants.SYMBOL_CHARS) + r"]+)((?:\[[^\]]*\])*)"
+)
+_PREDICATE_PATTERN = re.compile(
+    r"\[(?:(-?\d+)"
+    r"|@(handle|source)=([^\]]+)"
+    r"|@(abstract|noinherit)(?:=(true|false))?)\]"
+)
+
+
+class TydQueryIndex:
+    """An index of the descendants of a node by name and by handle.
+
+    Selectors starting with ``**`` use it instead of walking the tree when
+    it is passed to select. The index isn't updated when the nodes change,
+    so create it again after mutating them.
+    """
+
+    def __init__(self, root: Node):
+        """
+        Parameters
+        ----------
+        root : Union[TydNode, TydFrozenNode]
+            A node whose descendants are indexed, usually a document.
+        """
+        self._root = root
+        self._nodes_by_name: Dict[str, List[Node]] = dict()
+        self._nodes_by_handle: Dict[str, List[Node]] = dict()
+        # The position of every node in document order, by _node_key.
+        self._ranks: Dict[Any, int] = {_node_key(root): 0}
+
+        if _is_collection(root) and root.attribute_handle is not None:
+            self._nodes_by_handle[root.attribute_handle] = [root]
+
+        stack = list(reversed(_children(root)))
+        while stack:
+            node = stack.pop()
+            self._ranks[_node_key(node)] = len(self._ranks)
+            if node.name is not None:
+                self._nodes_by_name.setdefault(node.name, list()).append(node)
+            if _is_collection(node):
+                if node.attribute_handle is not None:
+                    self._nodes_by_handle.setdefault(
+                        node.attribute_handle, list()
+                    ).append(node)
+                stack.extend(reversed(_children(node)))
+
+    @property
+    def root(self) -> Node:
+        return self._root
+
+    def nodes_named(self, name: str) -> List[Node]:
+        return self._nodes_by_name.get(name, [])
+
+    def nodes_with_handle(self, handle: str) -> List[Node]:
+        return self._nodes_by_handle.get(handle, [])
+
+
+class TydSelector:
+    """A compiled path query, which can be evaluated on many nodes."""
+
+    __slots__ = ("_path", "_steps")
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            A path query, see the module documentation for the syntax.
+
+        Raises
+        ------
+        Exception
+            Raise when the path isn't a valid query.
+        """
+        self._path = path
+        self._steps = _compile_steps(path)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def select(self, node: Node, index: Optional[TydQueryIndex] = None) -> List[Node]:
+        """Returns the nodes matched by the query from a node.
+
+        Parameters
+        ----------
+        node : Union[TydNode, TydFrozenNode]
+            A node to evaluate the query from.
+        index : Optional[TydQueryIndex]
+            An index of the node, by default None.
+
+        Returns
+        -------
+        List[Union[TydNode, TydFrozenNode]]
+            The nodes matched.
+        """
+        steps = self._steps
+        contexts: Sequence[Node] = (node,)
+        start = 0
+        # Positions in document order of the nodes under a descendant step,
+        # whose contexts can be nested, so their children must be sorted.
+        ranks: Optional[Dict[Any, int]] = None
+
+        if index is not None and index.root is node:
+            contexts, start = _select_from_index(steps, index)
+            if start > 0 and steps[0].axis == _AXIS_DESCENDANT:
+                ranks = index._ranks
+
+        for step in steps[start:]:
+            matched: List[Node] = list()
+
+            if step.axis == _AXIS_DESCENDANT:
+                if ranks is None:
+                    ranks = dict()
+                seen = set()
+                for context in contexts:
+                    descendants = _descendants_or_self(context)
+                    for n in descendants:
+                        ranks.setdefault(_node_key(n), len(ranks))
+                    for n in _apply(step.predicates, descendants):
+                        key = _node_key(n)
+                        if key not in seen:
+                            seen.add(key)
+                            matched.append(n)
+            else:
+                for context in contexts:
+                    if not _is_collection(context):
+                        continue
+                    matched.extend(
+                        _apply(step.predicates, _children_named(context, step.name))
+                    )
+                if ranks is not None:
+                    matched.sort(key=lambda n: ranks[_node_key(n)])
+
+            contexts = matched
+            if not contexts:
+                break
+
+        return list(contexts)
+
+    def select_first(
+        self, node: Node, index: Optional[TydQueryIndex] = None
+    ) -> Optional[Node]:
+        """Returns the first node matched by the query from a node, or None.
+
+        Parameters
+        ----------
+        node : Union[TydNode, TydFrozenNode]
+            A node to evaluate the query from.
+        index : Optional[TydQueryIndex]
+            An index of the node, by default None.
+
+        Returns
+        -------
+        Optional[Union[TydNode, TydFrozenNode]]
+            The first node matched.
+        """
+        nodes = self.select(node, index)
+        return nodes[0] if nodes else None
+
+    def __repr__(self) -> str:
+        return f"TydSelector({self._path!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(path: str) -> TydSelector:
+    """Returns a selector of a path query, compiled once per path.
+
+    Parameters
+    ----------
+    path : str
+        A path query, see the module documentation for the syntax.
+
+    Returns
+    -------
+    TydSelector
+        A selector compiled.
+    """
+    return TydSelector(path)
+
+
+def select(node: Node, path: str, index: Optional[TydQueryIndex] = None) -> List[Node]:
+    """Returns the nodes matched by a path query from a node.
+
+    Parameters
+    ----------
+    node : Union[TydNode, TydFrozenNode]
+        A node to evaluate the query from.
+    path : str
+        A path query, see the module documentation for the syntax.
+    index : Optional[TydQueryIndex]
+        An index of the node, by default None.
+
+    Returns
+    -------
+    List[Union[TydNode, TydFrozenNode]]
+        The nodes matched.
+    """
+    return compile_selector(path).select(node, index)
+
+
+def _compile_steps(path: str) -> tuple:
+    parts = path[1:].split("/") if path.startswith("/") else path.split("/")
+    if not path or not all(parts):
+        raise Exception(f"Invalid path query {path!r}: empty step.")
+
+    steps = list()
+    for part in parts:
+        match = _STEP_PATTERN.fullmatch(part)
+        if match is None:
+            raise Exception(f"Invalid path query {path!r}: invalid step {part!r}.")
+        selector, predicates_text = match.groups()
+
+        predicates = list()
+        for predicate_text in re.findall(r"\[[^\]]*\]", predicates_text):
+            predicate = _PREDICATE_PATTERN.fullmatch(predicate_text)
+            if predicate is None:
+                raise Exception(
+                    f"Invalid path query {path!r}: invalid predicate "
+                    f"{predicate_text!r}."
+                )
+            index, attribute, value, flag, flag_value = predicate.groups()
+            if index is not None:
+                predicates.append(_Predicate(int(index), None, None))
+            elif attribute is not None:
+                predicates.append(_Predicate(None, attribute, value))
+            else:
+                predicates.append(_Predicate(None, flag, flag_value != "false"))
+
+        if selector == "**":
+            steps.append(_Step(_AXIS_DESCENDANT, None, tuple(predicates)))
+        else:
+            name = None if selector == "*" else selector
+            steps.append(_Step(_AXIS_CHILD, name, tuple(predicates)))
+
+    return tuple(steps)
+
+
+def _select_from_index(steps: tuple, index: TydQueryIndex):
+    first = steps[0]
+    handle_first = (
+        first.predicates
+        and first.predicates[0].attribute == "handle"
+        and all(p.index is None for p in first.predicates)
+    )
+
+    if first.axis != _AXIS_DESCENDANT:
+        if not handle_first:
+            return (index.root,), 0
+        # "name[@handle=X]" is a child of the root with the handle.
+        root = index.root
+        nodes = [
+            node
+            for node in index.nodes_with_handle(first.predicates[0].value)
+            if _is_same_node(node.parent, root) and first.name in (None, node.name)
+        ]
+        return _apply(first.predicates[1:], nodes), 1
+
+    if not first.predicates and len(steps) > 1:
+        # "**/name" is every descendant with the name.
+        second = steps[1]
+        if (
+            second.axis == _AXIS_CHILD
+            and second.name is not None
+            and all(p.index is None for p in second.predicates)
+        ):
+            return _apply(second.predicates, index.nodes_named(second.name)), 2
+
+    if handle_first:
+        nodes = index.nodes_with_handle(first.predicates[0].value)
+        return _apply(first.predicates[1:], nodes), 1
+
+    return (index.root,), 0
+
+
+def _apply(predicates: tuple, nodes: Sequence[Node]) -> Sequence[Node]:
+    for predicate in predicates:
+        if predicate.index is not None:
+            i = predicate.index
+            nodes = [nodes[i]] if -len(nodes) <= i < len(nodes) else []
+        else:
+            nodes = [n for n in nodes if _attribute_matches(n, predicate)]
+    return nodes
+
+
+def _attribute_matches(node: Node, predicate: _Predicate) -> bool:
+    if not _is_collection(node):
+        return False
+    if predicate.attribute == "handle":
+        return node.attribute_handle == predicate.value
+    elif predicate.attribute == "source":
+        return node.attribute_source == predicate.value
+    elif predicate.attribute == "abstract":
+        return node.attribute_abstract == predicate.value
+    else:
+        return node.attribute_no_inherit == predicate.value
+
+
+def _is_same_node(a: Optional[Node], b: Node) -> bool:
+    # Frozen nodes are views created on access, equal when they show the same row.
+    return a is b or (isinstance(a, TydFrozenNode) and a == b)
+
+
+def _node_key(node: Node) -> Any:
+    # Frozen nodes are views created on access, hashed by the row they show.
+    return node if isinstance(node, TydFrozenNode) else id(node)
+
+
+def _is_collection(node: Node) -> bool:
+    return isinstance(node, (TydCollection, TydFrozenCollection))
+
+
+def _children(node: Node) -> Sequence[Node]:
+    if isinstance(node, TydCollection):
+        return node._get_nodes()
+    elif isinstance(node, TydFrozenCollection):
+        return node.nodes
+    return ()
+
+
+def _children_named(node: Node, name: Optional[str]) -> Sequence[Node]:
+    children = _children(node)
+    if name is None:
+        return children
+
+    if isinstance(node, TydTable):
+        nodes_by_name = node._get_nodes_by_name()
+        if len(nodes_by_name) == len(children):
+            # No duplicated names, the name index holds every child.
+            child = nodes_by_name.get(name)
+            return (child,) if child is not None else ()
+
+    return [child for child in children if child.name == name]
+
+
+def _descendants_or_self(node: Node) -> List[Node]:
+    nodes = list()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        nodes.append(current)
+        stack.extend(reversed(_children(current)))
+    return nodes
@@ -0,0 +1,363 @@
+"""Conversion of tyd nodes into typed Python objects.
+
+The type hints of a class are read once, when it is first converted, to
+generate a converter function which is then cached and reused for every
+node converted to that class.
+"""
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from typing import TypeVar, Union, get_args, get_origin, get_type_hints
+
+from .nodes import (
+    TydCollection,
+    TydFrozenCollection,
+    TydFrozenNode,
+    TydFrozenString,
+    TydFrozenTable,
+    TydNode,
+    TydString,
+    TydTable,
+)
+from .utils import parse_bool, parse_enum
+
+T = TypeVar("T")
+Node = Union[TydNode, TydFrozenNode]
+
+_NONE_TYPE = type(None)
+
+_converters: Dict[Any, Callable[[Node], Any]] = dict()
+
+
+def load_as(cls: Type[T], node: Node) -> T:
+    """Returns an instance of a class created from a node.
+
+    Tables are converted into dataclasses, NamedTuples, classes with
+    __slots__ and dicts, lists into lists and tuples, and strings into str,
+    int, float, bool and enums, following the type hints of the class.
+    Fields missing in a table take their default value, or None when they
+    are Optional.
+
+    Parameters
+    ----------
+    cls : Type[T]
+        A class or a type hint to convert the node into.
+    node : Union[TydNode, TydFrozenNode]
+        A node to convert.
+
+    Returns
+    -------
+    T
+        An object created.
+
+    Raises
+    ------
+    Exception
+        Raise when the node doesn't match the type hints.
+    """
+    return _converter_of(cls)(node)
+
+
+def load_all_as(cls: Type[T], nodes: Iterable[Node]) -> List[T]:
+    """Returns instances of a class created from nodes.
+
+    Parameters
+    ----------
+    cls : Type[T]
+        A class or a type hint to convert the nodes into.
+    nodes : Iterable[Union[TydNode, TydFrozenNode]]
+        Nodes to convert, for example the roots of a document.
+
+    Returns
+    -------
+    List[T]
+        Objects created.
+    """
+    convert = _converter_of(cls)
+    return [convert(node) for node in nodes]
+
+
+def _converter_of(
+    tp: Any, building: Optional[Dict[Any, Callable[[Node], Any]]] = None
+) -> Callable[[Node], Any]:
+    converter = _converters.get(tp)
+    if converter is not None:
+        return converter
+
+    # Converters are built in a local map, where recursive classes get a stub,
+    # and are published once complete, so other threads never see a stub.
+    if building is None:
+        building = dict()
+        converter = _build_converter(tp, building)
+        building[tp] = converter
+        _converters.update(building)
+        return converter
+
+    converter = building.get(tp)
+    if converter is None:
+        converter = _build_converter(tp, building)
+        building[tp] = converter
+    return converter
+
+
+def _build_converter(tp: Any, building: Dict) -> Callable[[Node], Any]:
+    if tp is Any or tp is object:
+        return _convert_any
+    if tp is str:
+        return _convert_str
+    if tp is int:
+        return _convert_int
+    if tp is float:
+        return _convert_float
+    if tp is bool:
+        return _convert_bool
+
+    origin = get_origin(tp)
+    args = get_args(tp)
+
+    if origin is Union:
+        types = [arg for arg in args if arg is not _NONE_TYPE]
+        if len(types) != 1 or len(args) != 2:
+            raise TypeError(f"Only Optional unions are supported, not {tp!r}.")
+        return _optional_converter(_converter_of(types[0], building))
+    if tp is list or origin is list:
+        item_type = args[0] if args else Any
+        return _list_converter(_converter_of(item_type, building), list)
+    if tp is tuple or origin is tuple:
+        return _tuple_converter(args, building)
+    if tp is dict or origin is dict:
+        if args and args[0] is not str:
+            raise TypeError(f"Only dicts with str keys are supported, not {tp!r}.")
+        return _dict_converter(_converter_of(args[1] if args else Any, building))
+
+    if isinstance(tp, type):
+        if issubclass(tp, Enum):
+            return _enum_converter(tp)
+        if issubclass(tp, (TydNode, TydFrozenNode)):
+            return _convert_node
+        if is_dataclass(tp) or (issubclass(tp, tuple) and hasattr(tp, "_fields")):
+            return _record_converter(tp, building)
+        if any("__slots__" in vars(c) for c in tp.__mro__[:-1]):
+            return _record_converter(tp, building)
+
+    raise TypeError(f"Can't convert tyd nodes into {tp!r}.")
+
+
+def _value_of(node: Node) -> Any:
+    if isinstance(node, (TydString, TydFrozenString)):
+        return node.value
+    raise TypeError(f"Expected a string node, got {node}.")
+
+
+def _not_null(node: Node) -> str:
+    value = _value_of(node)
+    if value is None:
+        raise ValueError(f"Unexpected null of {node.name}.")
+    return value
+
+
+def _convert_any(node: Node) -> Any:
+    if isinstance(node, (TydString, TydFrozenString)):
+        return node.value
+    if isinstance(node, (TydTable, TydFrozenTable)):
+        return {child.name: _convert_any(child) for child in node}
+    return [_convert_any(child) for child in node]
+
+
+def _convert_node(node: Node) -> Node:
+    return node
+
+
+def _convert_str(node: Node) -> str:
+    return _not_null(node)
+
+
+# Strings cache their decoded values, frozen strings are parsed every time.
+def _convert_int(node: Node) -> int:
+    if isinstance(node, TydString):
+        return node.as_int()
+    return int(_not_null(node))
+
+
+def _convert_float(node: Node) -> float:
+    if isinstance(node, TydString):
+        return node.as_float()
+    return float(_not_null(node))
+
+
+def _convert_bool(node: Node) -> bool:
+    if isinstance(node, TydString):
+        return node.as_bool()
+    return parse_bool(_not_null(node))
+
+
+def _optional_converter(convert: Callable[[Node], Any]) -> Callable[[Node], Any]:
+    def convert_optional(node: Node) -> Any:
+        if isinstance(node, (TydString, TydFrozenString)) and node.value is None:
+            return None
+        return convert(node)
+
+    return convert_optional
+
+
+def _enum_converter(cls: Type[Enum]) -> Callable[[Node], Enum]:
+    def convert_enum(node: Node) -> Enum:
+        if isinstance(node, TydString):
+            return node.as_enum(cls)
+        return parse_enum(cls, _not_null(node))
+
+    return convert_enum
+
+
+def _children_of(node: Node) -> Iterable[Node]:
+    if isinstance(node, TydCollection):
+        return node._get_nodes()
+    if isinstance(node, TydFrozenCollection):
+        return node
+    raise TypeError(f"Expected a collection node, got {node}.")
+
+
+def _list_converter(convert: Callable[[Node], Any], container: type):
+    def convert_list(node: Node) -> Any:
+        return container([convert(child) for child in _children_of(node)])
+
+    return convert_list
+
+
+def _tuple_converter(args: Tuple, building: Dict) -> Callable[[Node], tuple]:
+    if not args or (len(args) == 2 and args[1] is Ellipsis):
+        item_type = args[0] if args else Any
+        return _list_converter(_converter_of(item_type, building), tuple)
+
+    converters = [_converter_of(arg, building) for arg in args]
+
+    def convert_tuple(node: Node) -> tuple:
+        children = list(_children_of(node))
+        if len(children) != len(converters):
+            raise ValueError(
+                f"Expected {len(converters)} items in {node.name}, "
+                f"got {len(children)}."
+            )
+        return tuple(c(child) for c, child in zip(converters, children))
+
+    return convert_tuple
+
+
+def _dict_converter(convert: Callable[[Node], Any]) -> Callable[[Node], dict]:
+    def convert_dict(node: Node) -> dict:
+        return {child.name: convert(child) for child in _children_of(node)}
+
+    return convert_dict
+
+
+def _lookup_of(node: Node) -> Callable[[str], Node]:
+    if isinstance(node, TydTable):
+        return node._get_nodes_by_name().get
+    if isinstance(node, TydFrozenTable):
+        return node.__getitem__
+    raise TypeError(f"Expected a table node, got {node}.")
+
+
+class _Required:
+    """Marks fields without default value."""
+
+
+def _record_fields(cls: type) -> List[Tuple[str, Any, Any, Any]]:
+    """Returns the name, type hint, default and default factory of fields."""
+    hints = get_type_hints(cls)
+
+    if is_dataclass(cls):
+        return [
+            (
+                f.name,
+                hints.get(f.name, Any),
+                _Required if f.default is MISSING else f.default,
+                None if f.default_factory is MISSING else f.default_factory,
+            )
+            for f in fields(cls)
+            if f.init
+        ]
+
+    if issubclass(cls, tuple):
+        defaults = getattr(cls, "_field_defaults", {})
+        return [
+            (name, hints.get(name, Any), defaults.get(name, _Required), None)
+            for name in cls._fields
+        ]
+
+    slots = list()
+    for c in reversed(cls.__mro__[:-1]):
+        c_slots = vars(c).get("__slots__", ())
+        slots.extend([c_slots] if isinstance(c_slots, str) else c_slots)
+    return [
+        (name, hints.get(name, Any), _Required, None)
+        for name in slots
+        if name not in ("__dict__", "__weakref__")
+    ]
+
+
+def _record_converter(cls: type, building: Dict) -> Callable[[Node], Any]:
+    # Recursive classes get a stub until their converter is generated.
+    generated = list()
+    building[cls] = lambda node: generated[0](node)
+
+    record_fields = _record_fields(cls)
+    namespace = {
+        "cls": cls,
+        "new": object.__new__,
+        "lookup_of": _lookup_of,
+        "missing": _missing,
+        "wrap": _wrap_error,
+    }
+    lines = ["def convert_record(node):", "    try:"]
+    lines.append("        lookup = lookup_of(node)")
+
+    for i, (name, hint, default, factory) in enumerate(record_fields):
+        namespace[f"convert_{i}"] = _converter_of(hint, building)
+        if factory is not None:
+            namespace[f"factory_{i}"] = factory
+            default_expr = f"factory_{i}()"
+        elif default is not _Required:
+            namespace[f"default_{i}"] = default
+            default_expr = f"default_{i}"
+        elif get_origin(hint) is Union and _NONE_TYPE in get_args(hint):
+            default_expr = "None"
+        else:
+            default_expr = f"missing(node, {name!r})"
+
+        lines.append(f"        n = lookup({name!r})")
+        lines.append(
+            f"        v_{i} = convert_{i}(n) if n is not None else {default_expr}"
+        )
+
+    if is_dataclass(cls) or issubclass(cls, tuple):
+        arguments = ", ".join(
+            f"{name}=v_{i}" for i, (name, _, _, _) in enumerate(record_fields)
+        )
+        lines.append(f"        return cls({arguments})")
+    else:
+        lines.append("        obj = new(cls)")
+        for i, (name, _, _, _) in enumerate(record_fields):
+            lines.append(f"        obj.{name} = v_{i}")
+        lines.append("        return obj")
+
+    lines.append("    except Exception as e:")
+    lines.append("        raise wrap(node, cls, e)")
+
+    exec("\n".join(lines), namespace)
+    converter = namespace["convert_record"]
+
+    generated.append(converter)
+    return converter
+
+
+def _missing(node: Node, name: str):
+    raise ValueError(f"Missing {name} in {node.name}.")
+
+
+def _wrap_error(node: Node, cls: type, e: Exception) -> Exception:
+    error = Exception(
+        f"Can't convert {node.name} at line {node.docline} into {cls.__name__}: {e}"
+    )
+    error.__cause__ = e
+    return error
@@ -1,51 +1,128 @@
-from typing import List
+import re
+from typing import Iterator, List, Optional, TextIO, Tuple
 
 from .nodes import TydNode, TydString, TydTable, TydCollection, TydList, TydDocument
 from .constants import Constants
+from .utils import CHUNK_PIECES, indent_string, should_write_with_quotes
 
 
 def write(node: TydNode, indent: int = 0) -> str:
+    """Returns TyD text of a node.
+
+    Parameters
+    ----------
+    node : TydNode
+        A node to write.
+    indent : int
+        A indent level of the node, by default 0.
+
+    Returns
+    -------
+    str
+        A string representing TyD text.
+    """
+    return "".join(iter_write(node, indent))
+
+
+def write_to(node: TydNode, fileobj: TextIO, indent: int = 0) -> None:
+    """A function to write TyD text of a node into a text stream.
+
+    The text is written in chunks while the node is traversed,
+    so the whole text is never held in memory.
+
+    Parameters
+    ----------
+    node : TydNode
+        A node to write.
+    fileobj : TextIO
+        A text stream to write into.
+    indent : int
+        A indent level of the node, by default 0.
+    """
+    for chunk in iter_write(node, indent):
+        fileobj.write(chunk)
+
+
+def iter_write(node: TydNode, indent: int = 0) -> Iterator[str]:
+    """Returns an iterator over chunks of TyD text of a node.
+
+    Parameters
+    ----------
+    node : TydNode
+        A node to write.
+    indent : int
+        A indent level of the node, by default 0.
+
+    Returns
+    -------
+    Iterator[str]
+        An iterator over chunks which concatenate to the TyD text.
+    """
+    sb = []
+    stack = []
+
+    opened = _open_node(node, sb, indent)
+    if opened is not None:
+        stack.append(opened)
+
+    while stack:
+        children, child_indent, closing = stack[-1]
+        child = next(children, None)
+
+        if child is None:
+            stack.pop()
+            sb.append(closing)
+            if stack:
+                sb.append("\n")
+        else:
+            opened = _open_node(child, sb, child_indent)
+            if opened is None:
+                sb.append("\n")
+            else:
+                stack.append(opened)
+
+        if len(sb) >= CHUNK_PIECES:
+            yield "".join(sb)
+            sb.clear()
+
+    if sb:
+        yield "".join(sb)
+
+
+def _open_node(
+    node: TydNode, sb: List[str], indent: int
+) -> Optional[Tuple[Iterator[TydNode], int, str]]:
+    """Appends the text of a node up to its first child.
 
+    Returns the children of the node with their indent and the closing text
+    of the node, or None when the node has been written completely.
+    """
     if isinstance(node, TydString):
-        return (
-            _indent_string(indent)
+        sb.append(
+            indent_string(indent)
             + ((node.name + " ") if node.name is not None else "")
             + _string_content_writable(node.value)
         )
+        return None
 
     if isinstance(node, (TydTable, TydDocument)):
-        sb = []
-
-        if _append_node_intro(node, sb, indent) and len(node) > 0:
-            sb.append("\n")
-
-        if len(node) == 0:
-            sb.append(Constants.TABLE_START_CHAR + Constants.TABLE_END_CHAR + "\n")
-        else:
-            sb.append(_indent_string(indent) + Constants.TABLE_START_CHAR + "\n")
-            for i in node:
-                sb.append(write(i, indent + 1) + "\n")
-            sb.append(_indent_string(indent) + Constants.TABLE_END_CHAR + "\n")
-
-        return "".join(sb)
-
-    if isinstance(node, TydList):
-        sb = []
+        start_char = Constants.TABLE_START_CHAR
+        end_char = Constants.TABLE_END_CHAR
+    elif isinstance(node, TydList):
+        start_char = Constants.LIST_START_CHAR
+        end_char = Constants.LIST_END_CHAR
+    else:
+        raise Exception()
 
-        if _append_node_intro(node, sb, indent) and len(node) > 0:
-            sb.append("\n")
+    if _append_node_intro(node, sb, indent) and len(node) > 0:
+        sb.append("\n")
 
-        if len(node) == 0:
-            sb.append(Constants.LIST_START_CHAR + Constants.LIST_END_CHAR + "\n")
-        else:
-            sb.append(_indent_string(indent) + Constants.LIST_START_CHAR + "\n")
-            for i in node:
-                sb.append(write(i, indent + 1) + "\n")
-            sb.append(_indent_string(indent) + Constants.LIST_END_CHAR + "\n")
-
-        return "".join(sb)
+    if len(node) == 0:
+        sb.append(start_char + end_char + "\n")
+        return None
 
-    raise Exception()
+    sb.append(indent_string(indent) + start_char + "\n")
+    return iter(node), indent + 1, indent_string(indent) + end_char + "\n"
 
 
 def _string_content_writable(value: str) -> str:
@@ -57,41 +134,18 @@ def _string_content_writable(value: str) -> str:
 
     return (
         '"' + _escape_chars_escaped_for_quoted_string(value) + '"'
-        if _should_write_with_quotes(value)
+        if should_write_with_quotes(value)
         else value
     )
 
 
-def _should_write_with_quotes(value: str) -> bool:
-    if len(value) > 40:
-        return True
-
-    if value[len(value) - 1] == ".":
-        return True
-
-    for char in value:
-        if (
-            char == ""
-            or char == "\n"
-            or char == "\t"
-            or char == '"'
-            or char == Constants.COMMENT_CHAR
-            or char == Constants.RECORD_END_CHAR
-            or char == Constants.ATTRIBUTE_START_CHAR
-            or char == Constants.TABLE_START_CHAR
-            or char == Constants.TABLE_END_CHAR
-            or char == Constants.LIST_START_CHAR
-            or char == Constants.LIST_END_CHAR
-        ):
-            return True
-
-    return False
+_QUOTED_STRING_ESCAPED_CHARS_PATTERN = re.compile(
+    "[" + re.escape('"' + Constants.COMMENT_CHAR) + "]"
+)
 
 
 def _escape_chars_escaped_for_quoted_string(value: str) -> str:
-    return value.replace('"', '\\"').replace(
-        Constants.COMMENT_CHAR, "\\" + Constants.COMMENT_CHAR
-    )
+    return _QUOTED_STRING_ESCAPED_CHARS_PATTERN.sub(r"\\\g<0>", value)
 
 
 def _append_node_intro(node: TydCollection, sb: List[str], indent: int) -> bool:
@@ -148,13 +202,4 @@ def _append_node_intro(node: TydCollection, sb: List[str], indent: int) -> bool:
 def _append_with_whitespace(
     s: str, sb: List[str], indent: int, appended_something: bool
 ) -> None:
-    sb.append((" " if appended_something else _indent_string(indent)) + s)
-
-
-def _indent_string(indent: int):
-    s = ""
-
-    for i in range(indent):
-        s += "    "
-
-    return s
+    sb.append((" " if appended_something else indent_string(indent)) + s)
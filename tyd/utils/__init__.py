@@ -1,3 +1,5 @@
 # flake8: noqa
 
-from .utils import is_white_space
+from .utils import is_white_space, WHITE_SPACE_CHARS
+from .utils import CHUNK_PIECES, indent_string, should_write_with_quotes
+from .utils import parse_bool, parse_enum
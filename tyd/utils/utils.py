@@ -1,2 +1,81 @@
+import re
+from enum import Enum
+from typing import Dict, Type, TypeVar
+
+from ..constants import Constants
+
+E = TypeVar("E", bound=Enum)
+
+WHITE_SPACE_CHARS = "\u0009\u0020\u000A\u000D"
+
+_WHITE_SPACE_CHAR_SET = frozenset(WHITE_SPACE_CHARS)
+
+
 def is_white_space(char: str) -> bool:
-    return char in ["\u0009", "\u0020", "\u000A", "\u0D0A"]
+    return char in _WHITE_SPACE_CHAR_SET
+
+
+# A number of text pieces joined into each chunk written to a stream.
+CHUNK_PIECES = 1024
+
+_INDENT_STRINGS = tuple("    " * indent for indent in range(32))
+
+
+def indent_string(indent: int) -> str:
+    if indent < len(_INDENT_STRINGS):
+        return _INDENT_STRINGS[indent]
+    return "    " * indent
+
+
+_QUOTE_REQUIRING_CHARS_PATTERN = re.compile(
+    "["
+    + re.escape(
+        "\n"
+        + "\t"
+        + '"'
+        + Constants.COMMENT_CHAR
+        + Constants.RECORD_END_CHAR
+        + Constants.ATTRIBUTE_START_CHAR
+        + Constants.TABLE_START_CHAR
+        + Constants.TABLE_END_CHAR
+        + Constants.LIST_START_CHAR
+        + Constants.LIST_END_CHAR
+    )
+    + "]"
+)
+
+
+def should_write_with_quotes(value: str) -> bool:
+    return (
+        len(value) > 40
+        or value[-1] == "."
+        or _QUOTE_REQUIRING_CHARS_PATTERN.search(value) is not None
+    )
+
+
+_BOOL_VALUES = {"true": True, "false": False}
+# The members of each enum by name, and else by value.
+_ENUM_MEMBERS: Dict[type, Dict[str, Enum]] = dict()
+
+
+def parse_bool(value: str) -> bool:
+    try:
+        return _BOOL_VALUES[value.lower()]
+    except KeyError:
+        raise ValueError(f"Tyd error: Expected true or false, got {value!r}.")
+
+
+def parse_enum(enum_type: Type[E], value: str) -> E:
+    members = _ENUM_MEMBERS.get(enum_type)
+    if members is None:
+        members = dict(enum_type.__members__)
+        for member in enum_type:
+            members.setdefault(str(member.value), member)
+        _ENUM_MEMBERS[enum_type] = members
+
+    try:
+        return members[value]
+    except KeyError:
+        raise ValueError(
+            f"Tyd error: {value!r} isn't a member of {enum_type.__name__}."
+        )